@@ -1,20 +1,41 @@
 from geopy.geocoders import *
+from geopy.exc import GeopyError
 import pandas as pd
 from mpl_toolkits.basemap import Basemap
 import numpy as np
+import mpl_toolkits.basemap
+import pyproj
 import matplotlib
 import matplotlib.pyplot as plt
+import matplotlib.image
+import shapefile
 from matplotlib import cm
 import sys
 import os
-import shutil
-
-matplotlib.use('QtAgg')
-from matplotlib.patches import Polygon
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from PySide6.QtWidgets import *
-from PySide6.QtGui import QIcon
-from PySide6.QtCore import *
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+import hashlib
+import pickle
+import io
+import argparse
+import multiprocessing
+import difflib
+import zipfile
+import xml.etree.ElementTree as ElementTree
+import openpyxl
+from openpyxl.utils.exceptions import InvalidFileException
+from collections import OrderedDict, Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, as_completed
+
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.path import Path
+from matplotlib.lines import Line2D
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
 
 
 class AddressError(Exception):
@@ -24,1837 +45,3592 @@ class AddressError(Exception):
     pass
 
 
-class LectureMapApp(QMainWindow):
-    """
-    A GUI application for visualizing and managing lecture and event data on a map.
+class GeocodeCache:
+    '''
+    Persistent on-disk cache for Nominatim lookups, backed by SQLite.
 
-    The `LectureMapApp` class provides a user interface built with Pyside6 that allows users to interact with
-    event and view data stored in Excel files. Users can add, edit, remove, and plot lecture or event locations
-    on a map. The application supports custom views, allows for the import of event data, and provides the ability
-    to save and manage these views for future use.
+    Entries are keyed by the lookup kind ('address' for get_address, 'coordinates' for get_coordinates) and
+    a normalized query string. Entries older than the TTL are treated as misses, and once more than
+    max_entries are stored the least recently used entries are evicted.
 
     Attributes:
-        excelFilePath (str): The file path to the main ClimatePlotter Excel document where event data is stored.
-        viewsFilePath (str): The file path to the Views Excel document where map view configurations are stored.
-        plotPath (str): The directory path where plot output files are saved.
-        df_views (pd.DataFrame): A DataFrame containing view data loaded from the Views Excel file.
-        stateList (list of str): A list of German states used for state selection and validation within the application.
-        canvas (QWidget): The canvas where map plots are rendered.
-        plotListWidget (QListWidget): A widget displaying the list of available views for selection.
-        nameEdit (QLineEdit): A text field for entering the name of the event or institution.
-        addressEdit (QLineEdit): A text field for entering the address of the event or institution.
-        cityEdit (QLineEdit): A text field for entering the city of the event or institution.
-        plzEdit (QLineEdit): A text field for entering the postal code (PLZ) of the event or institution.
-        stateCombo (QComboBox): A dropdown for selecting the state of the event or institution.
-        tableEdit (QLineEdit): A text field for entering the number of tables at the event.
-        participantEdit (QLineEdit): A text field for entering the number of participants at the event.
-        viewLat (QLineEdit): A text field for entering the latitude of the map view.
-        viewLon (QLineEdit): A text field for entering the longitude of the map view.
-        viewLLCLat (QLineEdit): A text field for entering the lower-left corner latitude of the map view.
-        viewLLCLon (QLineEdit): A text field for entering the lower-left corner longitude of the map view.
-        viewURCLat (QLineEdit): A text field for entering the upper-right corner latitude of the map view.
-        viewURCLon (QLineEdit): A text field for entering the upper-right corner longitude of the map view.
-        viewName (QLineEdit): A text field for entering the name of the map view.
-        df_events (pd.DataFrame): A DataFrame containing event data loaded from the ClimatePlotter Excel file.
-
-    Methods:
-        __init__(): Initializes the application, sets up file paths, loads initial data, and configures the user interface.
-        initUI(): Sets up the user interface components and layouts for the application.
-        read_views_file(file_path): Reads the views from the specified Excel file and returns them as a DataFrame.
-        read_excel_file(file_path): Reads event data from the specified Excel file and returns it as a DataFrame.
-        get_coordinates(city, state, plz, address=None): Retrieves the latitude and longitude coordinates for a given location.
-        plot_map(df_events, df_stats, plotPath, canvas, lat, lon, llc_lat, llc_lon, urc_lat, urc_lon, view_name, doSave=False): Plots the event data on a map.
-        onLookupAddressButtonClicked(): Handles the event when the 'Lookup Address' button is clicked.
-        onPreViewButtonClicked(): Handles the event when the 'Pre-View' button is clicked.
-        onViewAddButtonClicked(): Handles the event when the 'Add View' button is clicked.
-        onCityLookupButtonClicked(): Handles the event when the 'City Lookup' button is clicked.
-        onViewRemoveButtonClicked(): Handles the event when the 'Remove View' button is clicked.
-        recalculateStatistics(df_events, df_stats, lat=None, lon=None): Recalculates statistics for the events and updates the Excel file.
-        getPlotItem(): Retrieves the plot item from the DataFrame based on the currently selected item in the plot list widget.
-        create_msg_box(title, message, icon='information'): Creates and displays a message box with the specified title, message, and icon.
-        clearAll(): Clears all input fields in the user interface.
-        setupPlotListWidget(): Sets up and populates the plot list widget with available views.
-
-    """
-    def __init__(self):
-        super().__init__()
-
-        self.excelFilePath = os.path.join(os.path.dirname(__file__), 'Plotter_Output', 'ClimatePlotter.xlsx')
-        self.viewsFilePath = os.path.join(os.path.dirname(__file__), 'Views.xlsx')
-        self.plotPath = 'Plotter_Output'
-
-        self.setWindowTitle("Lecture Map Plotter")
-        self.setGeometry(100, 100, 1200, 900)
-
-        self.df_views = self.read_views_file(self.viewsFilePath)
-
-        self.stateList = [
-            'Baden-Württemberg',
-            'Bayern',
-            'Berlin',
-            'Brandenburg',
-            'Bremen',
-            'Hamburg',
-            'Hessen',
-            'Mecklenburg-Vorpommern',
-            'Niedersachsen',
-            'Nordrhein-Westfalen',
-            'Rheinland-Pfalz',
-            'Saarland',
-            'Sachsen',
-            'Sachsen-Anhalt',
-            'Schleswig-Holstein',
-            'Thüringen'
-        ]
-
-        self.initUI()
-
-    def get_address(self, name):
-        '''
-        Uses OSM's Nominatim to get a German address for a particular search name.
-        country_codes set to de to limit search to Germany.
-        addressdetails set to True to get more information about the address OSM has for the search object
-
-        Args:
-            name (str): Search string, ex: "HKA" or "Karlsruhe Institute of Technology".
-
-        Returns:
-            dict: geopy.location.Location.raw - dictionary containing unparsed location information returned
-                from Nominatim.
-        '''
-        geolocator = Nominatim(user_agent="http")
-        location = geolocator.geocode(name, country_codes="de", addressdetails=True)
-        if location is not None:
-            return location.raw
-        else:
-            self.create_msg_box("Address Error",
-                                f"Error: {'Bad search results returned'} \n\n"
-                                f"{name} returned no results.",
-                                'warning')
-            return None
-
-    def get_coordinates(self, city_name, state_name, plz_code, address=''):
-        '''
-        Uses OSM's Nominatim to get latitude and longitude coordinates for the search object
+        file_path (str): Path to the SQLite database file.
+        ttl (float): Lifetime of an entry in seconds.
+        max_entries (int): Maximum number of entries kept in the cache.
+        created (bool): True if the database did not exist before this instance opened it.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that were not in the cache.
+    '''
+    def __init__(self, file_path, ttl_days=365, max_entries=20000):
+        self.file_path = file_path
+        self.ttl = ttl_days * 24 * 60 * 60
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        folder_path = os.path.dirname(file_path)
+        if folder_path and not os.path.exists(folder_path):
+            os.makedirs(folder_path)
+        self.created = not os.path.exists(file_path)
+        self._conn = sqlite3.connect(file_path, check_same_thread=False)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS geocode ('
+                           'kind TEXT NOT NULL, '
+                           'query TEXT NOT NULL, '
+                           'value TEXT NOT NULL, '
+                           'created REAL NOT NULL, '
+                           'last_used REAL NOT NULL, '
+                           'PRIMARY KEY (kind, query))')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS geocode_last_used ON geocode (last_used)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS school ('
+                           'key TEXT PRIMARY KEY, '
+                           'fingerprint TEXT NOT NULL, '
+                           'latitude REAL, '
+                           'longitude REAL)')
+        self._conn.execute('DELETE FROM geocode WHERE created < ?', (time.time() - self.ttl,))
+        self._conn.commit()
+
+    @staticmethod
+    def normalize_query(query):
+        '''
+        Normalizes a search string so that equivalent queries share a cache key. Unicode is NFC normalized,
+        case is folded, whitespace is collapsed and empty comma separated parts are dropped.
 
         Args:
-           city_name (str): City to be searched. Ex: "Regensburg"
-           state_name (str): State to be searched. Ex: "Bayern"
-           plz_code (str): Post code. Ex: "76139"
-           address (str): Street Address of search object. Defaults to ''.
+            query (str): Search string, ex: "Moltkestraße 30, Karlsruhe, Baden-Württemberg, 76133, Germany".
 
         Returns:
-            str, str: latitude and longitude from Nominatim's location dict.
+            str: The normalized query.
         '''
-        geolocator = Nominatim(user_agent="http")
-        location = geolocator.geocode(
-            address + ", " + city_name + ", " + state_name + ", " + str(plz_code) + ", Germany")
-        if location:
-            return location.latitude, location.longitude
-        else:
-            return None, None
+        query = unicodedata.normalize('NFC', str(query)).casefold()
+        parts = (' '.join(part.split()) for part in query.split(','))
+        return ', '.join(part for part in parts if part and part != 'nan')
 
-    def read_excel_file(self, file_path):
+    def get(self, kind, query):
         '''
-        Reads the ClimatePlotter excel file, parses Events and Stats, or if they do not exist, creates them.
-        If the ClimatePlotter excel document does not exist, creates one.
+        Looks up a cached result and refreshes its LRU timestamp.
 
         Args:
-            file_path (str): Where to find the excel sheet
+            kind (str): Lookup kind, 'address' or 'coordinates'.
+            query (str): Search string, normalized internally.
 
         Returns:
-            pd.Dataframe, pd.Dataframe: Events dataframe, Stats dataframe
-        '''
-        try:
-            xl = pd.ExcelFile(file_path)
-            if len(xl.sheet_names) > 1 and 'Events' in xl.sheet_names and 'Stats' in xl.sheet_names:
-                df_events = xl.parse('Events')
-                df_stats = xl.parse('Stats')
-            else:
-                if 'Events' not in xl.sheet_names:
-                    df_events = pd.DataFrame(
-                        columns=['Datum', 'Hochschule', 'Adresse', 'Stadt', 'Bundesland', 'PLZ', 'Tische',
-                                 'Teilnehmer'])
-                    df_stats = pd.DataFrame(columns=['Hochschule', 'Stadt', 'PLZ', 'Latitude', 'Longitude',
-                                                     'EventCount', 'CityEventTotal', 'TotalTables',
-                                                     'TotalParticipants', 'CityParticipantsTotal'])
-                    msgText = "Events sheet not found, Stats reset"
-                elif 'Stats' not in xl.sheet_names:
-                    df_events = xl.parse('Events')
-                    df_stats = pd.DataFrame(columns=['Hochschule', 'Stadt', 'PLZ', 'Latitude', 'Longitude',
-                                                     'EventCount', 'CityEventTotal', 'TotalTables',
-                                                     'TotalParticipants', 'CityParticipantsTotal'])
-                    msgText = "Stats sheet not found, created new from values in Events sheet"
-                    self.recalculateStatistics(df_events, df_stats)
-                self.create_msg_box("Sheet Not Found", msgText, 'warning')
-            return df_events, df_stats
-        except FileNotFoundError:
-            df_events = pd.DataFrame(
-                columns=['Datum', 'Hochschule', 'Adresse', 'Stadt', 'Bundesland', 'PLZ', 'Tische', 'Teilnehmer'])
-            df_stats = pd.DataFrame(columns=['Hochschule', 'Stadt', 'PLZ', 'Latitude', 'Longitude',
-                                             'EventCount', 'CityEventTotal', 'TotalTables',
-                                             'TotalParticipants', 'CityParticipantsTotal'])
-            with pd.ExcelWriter(self.excelFilePath) as writer:
-                df_events.to_excel(writer, sheet_name='Events', index=False)
-                df_stats.to_excel(writer, sheet_name='Stats', index=False)
-                self.create_msg_box("File Not Found",
-                                    "ClimatePlotter.xlsx not found in the Plotter_Output directory, created new file",
-                                    'warning')
-            return df_events, df_stats
-
-    def update_excel(self, file_path, date, name, address, city, state, plz, lat, lon, tables=0,
-                     participants=0):
-        """
-        Writes the new rows of data to the ClimatePlotter Excel document.
-
-        Args:
-            file_path (str): The path to the ClimatePlotter document.
-            date (str): The date of the event being added.
-            name (str): The name of the school or university.
-            address (str): The street address of the school or university.
-            city (str): The city of the school or university.
-            state (str): The state of the school or university.
-            plz (str): The postal code of the school or university.
-            lat (str): [UNUSED] The latitude coordinates of the school or university.
-            lon (str): [UNUSED] The longitude coordinates of the school or university.
-            tables (int): The number of tables at the event.
-            participants (int): The total number of participants at the event.
-
-        Returns:
-            bool: A flag indicating whether the write to the Excel document was successful.
-        """
-        df_events, df_stats = self.read_excel_file(file_path)
-        df_events.loc[len(df_events.index) + 1] = [date, name, address, city, state, str(plz), int(tables),
-                                                   int(participants)]
-        try:
-            with pd.ExcelWriter(self.excelFilePath) as writer:
-                df_events.to_excel(writer, sheet_name='Events', index=False)
-                df_stats.to_excel(writer, sheet_name='Stats', index=False)
-            return True
-        except OSError:
-            return False
+            object or None: The cached value, or None on a miss or if the entry has expired.
+        '''
+        key = self.normalize_query(query)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT value, created FROM geocode WHERE kind = ? AND query = ?',
+                                     (kind, key)).fetchone()
+            if row is None or row[1] < now - self.ttl:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE geocode SET last_used = ? WHERE kind = ? AND query = ?', (now, kind, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
 
-    def plot_map(self, df_events, df_stats, save_path, canvas, lat, lon, llc_lat, llc_lon, urc_lat, urc_lon,
-                 view='Deutschland', doSave=False):
+    def put(self, kind, query, value):
         '''
-        Map plotting tool using Basemap.
+        Stores a result in the cache, evicting the least recently used entries if the cache is full.
 
         Args:
-            df_events (pd.Dataframe): [UNUSED] Dataframe of events
-            df_stats (pd.Dataframe): Dataframe of stats relating to how many events a school/city have held.
-            save_path (str): Location to save the generated map image.
-            canvas (FigureCanvasQTAgg object): Matplotlib backend object as a plot canvas for drawing the map
-            lat (float): [UNUSED] Latitude coordinate of plot center.
-            lon (float): [UNUSED] Longitude coordinate of plot center
-            llc_lat (float): Latitude - Lower left corner of view window
-            llc_lon (float): Longitude - Lower left corner of view window
-            urc_lat (float): Latitude - Upper right corner of view window
-            urc_lon (float): Longitude - Upper right corner of view window
-            view (str): Name of the view, used for title of saved map image. Defaults to 'Deutschland'
-            doSave (bool): Triggers the saving of the plot image. Defaults to False
+            kind (str): Lookup kind, 'address' or 'coordinates'.
+            query (str): Search string, normalized internally.
+            value (object): JSON serializable result to store.
 
         Returns:
             None
         '''
-        canvas.figure.clf()
-        ax = canvas.figure.add_subplot(111)
-        '''
-        resolution: c (crude), l (low), i (intermediate), h (high), f (full) or None
-        projection: 'merc' (Mercator), 'cyl' (Cylindrical Equidistant), 'mill' (Miller Cylindrical), 'gall' (Gall Stereographic Cylindrical), 'cea' (Cylindrical Equal Area), 'lcc' (Lambert Conformal), 'tmerc' (Transverse Mercator), 'omerc' (Oblique Mercator), 'nplaea' (North-Polar Lambert Azimuthal), 'npaeqd' (North-Polar Azimuthal Equidistant), 'nplaea' (South-Polar Lambert Azimuthal), 'spaeqd' (South-Polar Azimuthal Equidistant), 'aea' (Albers Equal Area), 'stere' (Stereographic), 'robin' (Robinson), 'eck4' (Eckert IV), 'eck6' (Eckert VI), 'kav7' (Kavrayskiy VII), 'mbtfpq' (McBryde-Thomas Flat-Polar Quartic), 'sinu' (Sinusoidal), 'gall' (Gall Stereographic Cylindrical), 'hammer' (Hammer), 'moll' (Mollweid
-        espg: 3857 (Web Mercator)
-        '''
-        m = Basemap(resolution='h', lat_0=(urc_lat - llc_lat) / 2, lon_0=(urc_lon - llc_lon) / 2, llcrnrlon=llc_lon,
-                    llcrnrlat=llc_lat,
-                    urcrnrlon=urc_lon, urcrnrlat=urc_lat, epsg=3857)
-        m.drawcountries()
+        self.put_many(kind, [(query, value)])
 
+    def put_many(self, kind, items):
         '''
-        https://gdz.bkg.bund.de/index.php/default/wmts-topplusopen-wmts-topplus-open.html
-        web
-        web_grau
-        web_scale
-        web_scale_grau
-        web_light
-        web_light_grau
-        '''
-        wms_server = 'https://sgx.geodatenzentrum.de/wms_topplus_open?request=GetCapabilities&service=wms'
-        m.wmsimage(wms_server, layers=["web_light"], verbose=False)
-
-        m.drawcoastlines()
-        if view == 'Deutschland' or view in self.stateList:
-            '''
-            Handle drawing Germany or the states
-            '''
-            shapePath = os.path.join(os.path.dirname(__file__), 'shapefiles', 'DEU_adm1')
-            m.readshapefile(shapePath, 'areas')
-            df_poly = pd.DataFrame(columns=['shapes', 'area'])
-            for info, shape in zip(m.areas_info, m.areas):
-                shape_array = np.array(shape)
-                df_poly.loc[len(df_poly.index) + 1] = [Polygon(shape_array), info['NAME_1']]
-
-            df1 = df_stats.groupby('CityParticipantsTotal')
-            colors = iter(cm.winter(np.linspace(1, 0, len(df1.groups))))
-
-            for group_cluster, data in df1:
-                msize = group_cluster * 5
-                if msize > 100:
-                    msize = 100
-                x, y = m(data['Longitude'], data['Latitude'])
-                ax.scatter(x, y, label=group_cluster, marker='o', s=msize, color=next(colors))
-        else:
-            '''
-            Handle drawing the cities
-            '''
-            df1 = df_stats.loc[df_stats['Stadt'] == view].reset_index(drop=True)
-            if df1.empty:
-                pass
-            else:
-                df_max = max(df1['TotalParticipants'])
-                for group_cluster, data in df1.iterrows():
-                    msize = data['TotalParticipants'] * 5
-                    if msize > 200:
-                        msize = 200
-                    col = cm.winter(data['TotalParticipants'] / df_max)
-                    x, y = m(data['Longitude'], data['Latitude'])
-                    ax.scatter(x, y, label=group_cluster, marker='o', s=msize, color=col)
-        canvas.draw()
-        if doSave:
-            save_path = os.path.join(os.path.dirname(__file__), save_path,
-                                     f'{view}.png')
-            plt.savefig(save_path, format='png', dpi=300)
-
-    def drawInitialMap(self):
-        '''
-        Function to draw the initial map during UI initialization. Reads the ClimatePlotter excel document
-        to add any existing events.
+        Stores several results in a single transaction.
 
         Args:
-            None
+            kind (str): Lookup kind, 'address' or 'coordinates'.
+            items (iterable of (str, object)): Query strings and their JSON serializable results.
 
         Returns:
             None
-
         '''
-        df_events, df_stats = self.read_excel_file(self.excelFilePath)
-        self.plot_map(df_events,
-                      df_stats,
-                      self.plotPath,
-                      self.canvas,
-                      self.df_views.loc[self.df_views['View'] == 'Deutschland']['lat_0'],
-                      self.df_views.loc[self.df_views['View'] == 'Deutschland']['lon_0'],
-                      self.df_views.loc[self.df_views['View'] == 'Deutschland']['llcrnrlat'],
-                      self.df_views.loc[self.df_views['View'] == 'Deutschland']['llcrnrlon'],
-                      self.df_views.loc[self.df_views['View'] == 'Deutschland']['urcrnrlat'],
-                      self.df_views.loc[self.df_views['View'] == 'Deutschland']['urcrnrlon']
-                      )
+        now = time.time()
+        rows = [(kind, self.normalize_query(query), json.dumps(value), now, now) for query, value in items]
+        with self._lock:
+            self._conn.executemany('INSERT OR REPLACE INTO geocode (kind, query, value, created, last_used) '
+                                   'VALUES (?, ?, ?, ?, ?)', rows)
+            count = self._conn.execute('SELECT COUNT(*) FROM geocode').fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute('DELETE FROM geocode WHERE rowid IN '
+                                   '(SELECT rowid FROM geocode ORDER BY last_used LIMIT ?)',
+                                   (count - self.max_entries,))
+            self._conn.commit()
 
-    def read_views_file(self, file_path):
+    def seed(self, df_events, df_stats):
         '''
-        Function to read the existing view window coordinates from the views excel file.
+        Seeds the cache with the coordinates already stored in the Stats sheet, so that schools which have
+        been geocoded before do not need another network lookup. The address of each school is taken from
+        its first event, matching the query recalculateStatistics would send.
 
         Args:
-            file_path (str): Path to the Views excel file, usually found in the root directory.
+            df_events (pd.DataFrame): Events dataframe.
+            df_stats (pd.DataFrame): Stats dataframe.
+
         Returns:
+            int: Number of entries seeded.
+        '''
+        if df_events.empty or df_stats.empty:
+            return 0
+        df_first = df_events.drop_duplicates(subset=['Hochschule', 'Stadt'])
+        df_seed = df_stats.merge(df_first[['Hochschule', 'Stadt', 'Adresse', 'Bundesland', 'PLZ']],
+                                 on=['Hochschule', 'Stadt'], suffixes=('', '_event'))
+        df_seed = df_seed.dropna(subset=['Latitude', 'Longitude'])
+        items = []
+        for name, address, city, state, plz, lat, lon in zip(df_seed['Hochschule'], df_seed['Adresse'],
+                                                              df_seed['Stadt'], df_seed['Bundesland'],
+                                                              df_seed['PLZ_event'], df_seed['Latitude'],
+                                                              df_seed['Longitude']):
+            query = str(address) + ", " + str(city) + ", " + str(state) + ", " + str(plz) + ", Germany"
+            items.append((query, [float(lat), float(lon)]))
+        self.put_many('coordinates', items)
+        return len(items)
+
+    def get_school_coordinates(self):
+        '''
+        Returns the coordinates recorded for each school at the last statistics build, together with the
+        fingerprint of the address fields they were geocoded from.
+
+        Args:
             None
 
+        Returns:
+            dict: Maps school_key(...) to (fingerprint, latitude, longitude).
         '''
-        return pd.read_excel(file_path)
+        with self._lock:
+            rows = self._conn.execute('SELECT key, fingerprint, latitude, longitude FROM school').fetchall()
+        return {key: (fingerprint, lat, lon) for key, fingerprint, lat, lon in rows}
 
-    def addExcelFiles(self):
+    def put_school_coordinates(self, items):
         '''
-        Opens a dialog box, allowing the user to select input excel documents containing new events to be
-        included in the running statistics. Files are added to the bulkImportList, which shows up in the
-        list widget.
+        Records the coordinates and address fingerprints of schools.
 
         Args:
-            None
+            items (iterable of (str, str, float, float)): School key, fingerprint, latitude and longitude.
 
         Returns:
             None
-
         '''
-        dialog = QFileDialog()
-        dialog.setFileMode(QFileDialog.FileMode.ExistingFiles)
-        dialog.setNameFilter("Excel files (*.xlsx)")
-        if dialog.exec():
-            fileNames = dialog.selectedFiles()
-            for fileName in fileNames:
-                self.bulkImportList.addItem(fileName)
+        with self._lock:
+            self._conn.executemany('INSERT OR REPLACE INTO school (key, fingerprint, latitude, longitude) '
+                                   'VALUES (?, ?, ?, ?)', list(items))
+            self._conn.commit()
 
-    def removeExcelFiles(self):
+    def stats(self):
         '''
-        Allows the user to remove files from the bulkImportList, such as if they were added in error.
+        Returns the hit/miss counters of this session and the number of stored entries.
 
         Args:
             None
 
         Returns:
-            None
-
+            dict: Keys 'hits', 'misses', 'entries' and 'hit_rate'.
         '''
-        try:
-            self.bulkImportList.takeItem(self.bulkImportList.currentRow())
-        except OSError:
-            self.create_msg_box("File Error", "Error in removing files", 'warning')
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM geocode').fetchone()[0]
+        lookups = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'entries': entries,
+                'hit_rate': self.hits / lookups if lookups else 0.0}
 
-    def clearExcelFiles(self):
-        '''
-        Clears the bulkImportList completely.
 
-        Args:
-            None
+STATS_COLUMNS = ['Hochschule', 'Stadt', 'PLZ', 'Latitude', 'Longitude', 'EventCount', 'CityEventTotal',
+                 'TotalTables', 'TotalParticipants', 'CityParticipantsTotal']
 
-        Returns:
-            None
 
-        '''
-        self.bulkImportList.clear()
+def compute_statistics(df_events, df_coordinates):
+    '''
+    Computes the Stats sheet from the Events sheet in a single groupby/aggregate pass.
 
-    def acceptBulkImport(self):
-        '''
-        Accept the import. Used in the import popup showing the file data vs the OSM data.
+    Every (Hochschule, Stadt) pair becomes one row, in order of its first event, with the PLZ of that first
+    event. EventCount, TotalTables and TotalParticipants are aggregated per school, CityEventTotal and
+    CityParticipantsTotal are the per city sums of those, broadcast back with transform. Coordinates are
+    joined from a lookup table rather than resolved here.
 
-        Args:
-            None
+    Args:
+        df_events (pd.DataFrame): Events dataframe with 'Hochschule', 'Stadt', 'PLZ', 'Tische' and 'Teilnehmer'.
+        df_coordinates (pd.DataFrame): Lookup table with 'Hochschule', 'Stadt', 'Latitude' and 'Longitude',
+            one row per school.
 
-        Returns:
-            None
+    Returns:
+        pd.DataFrame: Stats dataframe with the columns in STATS_COLUMNS.
+    '''
+    if df_events.empty:
+        return pd.DataFrame(columns=STATS_COLUMNS)
+    keys = ['Hochschule', 'Stadt']
+    # Counts left empty by apply_schema count as 0, as in update_statistics
+    df = df_events[keys + ['PLZ']].assign(Tische=pd.to_numeric(df_events['Tische']).fillna(0).astype('int64'),
+                                          Teilnehmer=pd.to_numeric(df_events['Teilnehmer']).fillna(0).astype('int64'))
+    df_stats = df.groupby(keys, sort=False, dropna=False).agg(EventCount=('Tische', 'size'),
+                                                              TotalTables=('Tische', 'sum'),
+                                                              TotalParticipants=('Teilnehmer', 'sum'))
+    df_stats = df.drop_duplicates(subset=keys)[keys + ['PLZ']].merge(df_stats.reset_index(), on=keys, how='left')
+    df_stats = df_stats.merge(df_coordinates[keys + ['Latitude', 'Longitude']].drop_duplicates(subset=keys),
+                              on=keys, how='left')
+    byCity = df_stats.groupby('Stadt', sort=False, dropna=False)
+    df_stats['CityEventTotal'] = byCity['EventCount'].transform('sum')
+    df_stats['CityParticipantsTotal'] = byCity['TotalParticipants'].transform('sum')
+    return df_stats[STATS_COLUMNS]
+
+
+def school_key(name, city, plz_code):
+    '''
+    Builds the key identifying a school's row in the Stats sheet across statistics builds.
 
-        '''
-        self.dialogBox.accept()
-        self.dialogBox.close()
+    Args:
+        name (str): Name of the school or university.
+        city (str): City of the school or university.
+        plz_code (int, float or str): Post code of the school or university.
 
-    def rejectBulkImport(self):
-        '''
-        Reject the import. Used in the import popup showing the file data vs the OSM data.
+    Returns:
+        str: Normalized 'Hochschule|Stadt|PLZ' key.
+    '''
+    plz = PlzGazetteer.normalize_plz(plz_code)
+    return '|'.join(GeocodeCache.normalize_query(value) for value in (name, city, plz if plz else plz_code))
 
-        Args:
-            None
 
-        Returns:
-            None
+def address_fingerprint(name, address, city, state, plz_code):
+    '''
+    Hashes the address fields a school was geocoded from, so later builds can tell whether they changed.
 
-        '''
-        self.dialogBox.reject()
-        self.dialogBox.close()
+    Args:
+        name (str): Name of the school or university.
+        address (str): Street address of the school or university.
+        city (str): City of the school or university.
+        state (str): State of the school or university.
+        plz_code (int, float or str): Post code of the school or university.
 
-    def validate_fields(self):
-        '''
-        Validation of data fields. If all fields are filled, enable the button associated with
-        acceptBulkImport
+    Returns:
+        str: Hex digest of the normalized address fields.
+    '''
+    plz = PlzGazetteer.normalize_plz(plz_code)
+    fields = (name, address, city, state, plz if plz else plz_code)
+    return hashlib.sha1('|'.join(GeocodeCache.normalize_query(value) for value in fields).encode()).hexdigest()
 
-        Args:
-            None
 
-        Returns:
-            None
+def event_key(event):
+    '''
+    Builds the key identifying an event for duplicate detection. Dates are written as dd.MM.yyyy whether they are
+    timestamps or text, names are normalized like geocoding queries and the counts are compared as integers.
 
-        '''
-        if (self.dateEdit.text() and
-                self.nameEdit.text() and
-                self.addressEdit.text() and
-                self.cityEdit.text() and
-                self.plzEdit.text() and
-                self.tableEdit.value() > 0 and
-                self.participantEdit.value() > 0):
-            self.buttonBox.button(QDialogButtonBox.StandardButton.Ok).setEnabled(True)
-        else:
-            self.buttonBox.button(QDialogButtonBox.StandardButton.Ok).setEnabled(False)
+    Args:
+        event (dict or pd.Series): Event with 'Datum', 'Hochschule', 'Stadt', 'Tische' and 'Teilnehmer'.
 
-    def bulkImportExcelFiles(self):
-        '''
-        Iterates through the bulkImportList/list widget, reads in the rows of each excel input document.
-        Validates the data for completeness. Appends the data to the Events and Stats dataframes, calculates
-        statistics and plots the results.
+    Returns:
+        str: Normalized 'Datum|Hochschule|Stadt|Tische|Teilnehmer' key.
+    '''
+    datum = event['Datum']
+    if isinstance(datum, str):
+        parsed = pd.to_datetime(datum.strip(), format='%d.%m.%Y', errors='coerce')
+        datum = datum if pd.isna(parsed) else parsed
+    if hasattr(datum, 'strftime'):
+        datum = datum.strftime('%d.%m.%Y')
+    counts = []
+    for column in ('Tische', 'Teilnehmer'):
+        try:
+            counts.append(str(int(event[column])))
+        except (TypeError, ValueError):
+            counts.append(str(event[column]))
+    fields = [datum, event['Hochschule'], event['Stadt']]
+    return '|'.join([GeocodeCache.normalize_query(value) for value in fields] + counts)
 
-        Args:
-            None
 
-        Returns:
-            None
+def update_statistics(df_stats, event, sign=1, lat=None, lon=None):
+    '''
+    Incrementally applies a single event to the Stats frame. Only the row of the event's school and the city
+    totals of its city are touched. Adding an event for a new school appends a row with the given coordinates,
+    removing the last event of a school drops its row.
+
+    Args:
+        df_stats (pd.DataFrame): Stats dataframe.
+        event (dict or pd.Series): Event with 'Hochschule', 'Stadt', 'PLZ', 'Tische' and 'Teilnehmer'.
+        sign (int): 1 to add the event, -1 to remove it. Defaults to 1.
+        lat (float, optional): Latitude of the school, used if the school is new. Defaults to None.
+        lon (float, optional): Longitude of the school, used if the school is new. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The updated Stats dataframe.
+    '''
+    df_stats = df_stats.reset_index(drop=True)
+    name = event['Hochschule']
+    city = event['Stadt']
+    tables = int(event['Tische']) if pd.notna(event['Tische']) else 0
+    participants = int(event['Teilnehmer']) if pd.notna(event['Teilnehmer']) else 0
+    school = (df_stats['Hochschule'] == name) & (df_stats['Stadt'] == city)
+    if school.any():
+        df_stats.loc[school, 'EventCount'] += sign
+        df_stats.loc[school, 'TotalTables'] += sign * tables
+        df_stats.loc[school, 'TotalParticipants'] += sign * participants
+        df_stats = df_stats[~(school & (df_stats['EventCount'] <= 0))].reset_index(drop=True)
+    elif sign > 0:
+        df_school = pd.DataFrame([[name, city, event['PLZ'], lat, lon, 1, 0, tables, participants, 0]],
+                                 columns=STATS_COLUMNS)
+        df_stats = df_school if df_stats.empty else pd.concat([df_stats, df_school], ignore_index=True)
+    else:
+        return df_stats
+    inCity = df_stats['Stadt'] == city
+    df_stats.loc[inCity, 'CityEventTotal'] = int(df_stats.loc[inCity, 'EventCount'].sum())
+    df_stats.loc[inCity, 'CityParticipantsTotal'] = int(df_stats.loc[inCity, 'TotalParticipants'].sum())
+    return df_stats
+
+
+def compare_statistics(df_stats, df_rebuilt):
+    '''
+    Compares incrementally maintained statistics with a full rebuild and describes every disagreement.
 
-        '''
-        importedData = []
+    Args:
+        df_stats (pd.DataFrame): Stats dataframe as currently stored.
+        df_rebuilt (pd.DataFrame): Stats dataframe from compute_statistics.
 
-        for i in reversed(range(self.bulkImportList.count())):
-            bulkFilePath = self.bulkImportList.item(i).text()
+    Returns:
+        list of str: One message per disagreeing school, empty if both agree.
+    '''
+    keys = ['Hochschule', 'Stadt']
+    columns = ['EventCount', 'CityEventTotal', 'TotalTables', 'TotalParticipants', 'CityParticipantsTotal']
+    df = df_stats[keys + columns].merge(df_rebuilt[keys + columns], on=keys, how='outer',
+                                        suffixes=('', '_rebuilt'), indicator=True)
+    messages = []
+    for row in df.to_dict('records'):
+        school = f"{row['Hochschule']}, {row['Stadt']}"
+        if row['_merge'] == 'left_only':
+            messages.append(f'{school}: not in the rebuilt statistics')
+        elif row['_merge'] == 'right_only':
+            messages.append(f'{school}: missing from the stored statistics')
+        else:
+            differences = [f"{column} {row[column]} != {row[column + '_rebuilt']}" for column in columns
+                           if row[column] != row[column + '_rebuilt']]
+            if differences:
+                messages.append(f'{school}: ' + ', '.join(differences))
+    return messages
 
-            # Load the Excel file into a DataFrame
-            df = pd.read_excel(bulkFilePath)
 
-            # Check for empty fields in any row
-            if df.isnull().any(axis=1).any():
-                self.create_msg_box(
-                    "Validation Error",
-                    f"File '{bulkFilePath.split('/')[-1]}' contains rows with empty fields.\nThis file will be skipped.",
-                    'warning'
-                )
-                importedData.append((bulkFilePath, i, "Empty Fields"))
-                continue
+def state_mismatches(df_stats, df_events, states):
+    '''
+    Joins the Stats locations to the Bundesland of their events and finds the schools whose coordinates lie in
+    another state, or in none, for example because an address was geocoded to a namesake town.
 
-            # Fill NaN values with empty strings to avoid issues later
-            df = df.fillna('')
+    Args:
+        df_stats (pd.DataFrame): Stats dataframe.
+        df_events (pd.DataFrame): Events dataframe.
+        states (pd.Series): State of each Stats row, from ShapeStore.state_assignments.
 
-            for index, row in df.iterrows():
-                if not self.validate_essential_fields(row, bulkFilePath, index):
-                    importedData.append((bulkFilePath, i, index))
-                    continue
+    Returns:
+        pd.DataFrame: 'Hochschule', 'Stadt', 'Latitude', 'Longitude', 'Bundesland' and 'Polygon' of every
+            disagreeing school and Bundesland.
+    '''
+    keys = ['Hochschule', 'Stadt']
+    df = df_stats[keys + ['Latitude', 'Longitude']].assign(Polygon=states.to_numpy())
+    df = df.merge(df_events[keys + ['Bundesland']].drop_duplicates(), on=keys, how='inner')
+    same = df['Bundesland'].astype(str).str.strip().str.casefold() == df['Polygon'].astype(str).str.casefold()
+    return df[~same].reset_index(drop=True)
+
+
+EVENT_COLUMNS = ['Datum', 'Hochschule', 'Adresse', 'Stadt', 'Bundesland', 'PLZ', 'Tische', 'Teilnehmer']
+EVENT_KEY_COLUMNS = EVENT_COLUMNS + ['event_key']
+VIEW_COLUMNS = ['View', 'lat_0', 'lon_0', 'llcrnrlon', 'llcrnrlat', 'urcrnrlon', 'urcrnrlat']
+
+# Declared columns and dtypes of the sheets read by the app. None keeps the dtype as read, for input columns whose
+# values are validated row by row during the bulk import.
+EVENT_SCHEMA = {'Datum': object, 'Hochschule': object, 'Adresse': object, 'Stadt': object, 'Bundesland': object,
+                'PLZ': 'int64', 'Tische': 'int64', 'Teilnehmer': 'int64'}
+STATS_SCHEMA = {'Hochschule': object, 'Stadt': object, 'PLZ': 'int64', 'Latitude': 'float64', 'Longitude': 'float64',
+                'EventCount': 'int64', 'CityEventTotal': 'int64', 'TotalTables': 'int64', 'TotalParticipants': 'int64',
+                'CityParticipantsTotal': 'int64'}
+VIEW_SCHEMA = {'View': object, 'lat_0': 'float64', 'lon_0': 'float64', 'llcrnrlon': 'float64', 'llcrnrlat': 'float64',
+               'urcrnrlon': 'float64', 'urcrnrlat': 'float64'}
+INPUT_SCHEMA = {'Datum': None, 'Hochschule': object, 'Adresse': object, 'Stadt': object, 'Bundesland': object,
+                'PLZ': None, 'Tische': None, 'Teilnehmer': None}
+
+# Raised when a workbook is locked, damaged or not a workbook at all
+WORKBOOK_ERRORS = (OSError, ValueError, KeyError, zipfile.BadZipFile, ElementTree.ParseError, InvalidFileException)
+
+try:
+    import python_calamine
+    XLSX_ENGINE = 'calamine'
+    WORKBOOK_ERRORS += (python_calamine.CalamineError,)
+except ImportError:
+    XLSX_ENGINE = 'openpyxl-stream'
+
+
+def apply_schema(df, schema, errors=None):
+    '''
+    Restricts a sheet to its declared columns and converts them to their declared dtypes. Missing columns are
+    added empty. Numeric cells that cannot be converted are emptied instead of failing the whole sheet, and an
+    integer column with empty cells is read as the nullable 'Int64' dtype.
+
+    Args:
+        df (pd.DataFrame): The sheet as read.
+        schema (dict): Declared dtype per column, None to keep the dtype as read.
+        errors (list, optional): Receives a (row, column, message) tuple per missing column, with row None, and
+            per emptied or empty numeric cell of an integer column, row counted as in Excel. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The sheet with exactly the declared columns.
+    '''
+    problems = []
+    result = df.reindex(columns=list(schema))
+    for column, dtype in schema.items():
+        if dtype is None:
+            continue
+        if column not in df.columns:
+            problems.append((None, column, 'is missing'))
+        kind = np.dtype(dtype).kind
+        if kind not in 'iuf':
+            result[column] = result[column].astype(dtype)
+            continue
+        values = pd.to_numeric(result[column], errors='coerce')
+        bad = values.isna() & result[column].notna()
+        for index in result.index[bad.to_numpy()]:
+            problems.append((index + 2, column, 'is not a number'))
+        if kind in 'iu':
+            fraction = values.notna() & (values % 1 != 0)
+            for index in result.index[fraction.to_numpy()]:
+                problems.append((index + 2, column, 'is not an integer'))
+            values = values.where(~fraction)
+            if column in df.columns:
+                for index in result.index[result[column].isna().to_numpy()]:
+                    problems.append((index + 2, column, 'is empty'))
+            dtype = dtype if values.notna().all() else 'Int64'
+        result[column] = values.astype(dtype)
+    if errors is not None:
+        errors.extend(sorted(problems, key=lambda problem: (problem[0] or 0, list(schema).index(problem[1]))))
+    return result
+
+
+def stream_sheet(worksheet, schema=None):
+    '''
+    Reads a worksheet of a read_only openpyxl workbook row by row as plain values, keeping only the declared
+    columns. Rows without any value are skipped.
 
-                plz = self.get_valid_plz(row, bulkFilePath, index)
-                if plz is None:
-                    importedData.append((bulkFilePath, i, index))
-                    continue
+    Args:
+        worksheet (openpyxl.worksheet.ReadOnlyWorksheet): The worksheet.
+        schema (dict, optional): Declared dtype per column. Defaults to None to read every column.
 
-                tables, participants = self.get_valid_table_participants(row, bulkFilePath, index)
-                if tables is None or participants is None:
-                    importedData.append((bulkFilePath, i, index))
-                    continue
+    Returns:
+        pd.DataFrame: The sheet, before the declared dtypes are applied.
+    '''
+    rows = worksheet.iter_rows(values_only=True)
+    header = list(next(rows, ()))
+    columns = [column for column in header if column is not None and (schema is None or column in schema)]
+    indices = [header.index(column) for column in columns]
+    data = []
+    for row in rows:
+        values = [row[i] if i < len(row) else None for i in indices]
+        if any(value is not None for value in values):
+            data.append(values)
+    return pd.DataFrame(data, columns=columns)
+
+
+def read_xlsx(file_path, sheets, engine=None, errors=None):
+    '''
+    Reads sheets of a workbook, restricted to their declared columns and converted to their declared dtypes. The
+    workbook is opened once for all sheets.
 
-                raw_address = self.get_address_from_row(row, plz, bulkFilePath, index)
-                if raw_address is None:
-                    importedData.append((bulkFilePath, i, index))
-                    continue
+    Engines:
+        calamine: pandas' calamine engine, used by default if python-calamine is installed.
+        openpyxl-stream: openpyxl in read_only mode, streaming plain cell values; the default otherwise.
+        default: pandas' default engine, kept for comparison.
+
+    Args:
+        file_path (str): Path to the workbook.
+        sheets (dict): Schema (see apply_schema) per sheet name or position, or None to read every column as is.
+        engine (str, optional): One of the engines above. Defaults to XLSX_ENGINE.
+        errors (dict, optional): Receives the conversion errors of each sheet, see apply_schema. Defaults to None.
 
-                self.process_and_display_dialog(row, raw_address, bulkFilePath, index, tables, participants)
+    Returns:
+        dict: Dataframe per requested sheet. Sheets missing from the workbook are left out.
 
-        self.cleanup_imported_files(importedData)
+    Raises:
+        FileNotFoundError: If the workbook does not exist.
+    '''
+    engine = engine or XLSX_ENGINE
+    frames = {}
+    if engine == 'openpyxl-stream':
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for sheet, schema in sheets.items():
+                names = workbook.sheetnames
+                name = names[sheet] if isinstance(sheet, int) and sheet < len(names) else sheet
+                if name in names:
+                    frames[sheet] = stream_sheet(workbook[name], schema)
+        finally:
+            workbook.close()
+    else:
+        with pd.ExcelFile(file_path, engine=None if engine == 'default' else engine) as xl:
+            for sheet, schema in sheets.items():
+                if sheet in xl.sheet_names or (isinstance(sheet, int) and sheet < len(xl.sheet_names)):
+                    usecols = None if schema is None else (lambda column, schema=schema: column in schema)
+                    frames[sheet] = xl.parse(sheet, usecols=usecols)
+    for sheet, df in frames.items():
+        if sheets[sheet] is not None:
+            problems = []
+            frames[sheet] = apply_schema(df, sheets[sheet], problems)
+            if problems and errors is not None:
+                errors[sheet] = problems
+    return frames
+
+
+class ValidationReport:
+    '''
+    Result of reading and validating one bulk import input file.
 
-        df_events, df_stats = self.read_excel_file(self.excelFilePath)
-        df_events = df_events.fillna('')  # Replace NaN with empty string
-        df_stats = df_stats.fillna('')  # Replace NaN with empty string
-        self.recalculateStatistics(df_events, df_stats)
-        self.drawInitialMap()
+    Attributes:
+        file_path (str): Path to the input file.
+        valid (pd.DataFrame): The rows that passed validation, normalized: Datum as Timestamp, stripped text,
+            PLZ as a 5 digit string, Tische and Teilnehmer as int. The index is the row index in the file.
+        errors (list of tuple): (line, column, message) per failed check, line counted as in the other import
+            messages. A file that could not be read has a single error with line and column None.
+    '''
+    def __init__(self, file_path, valid, errors):
+        self.file_path = file_path
+        self.valid = valid
+        self.errors = errors
 
-    def validate_essential_fields(self, row, bulkFilePath, index):
+    def summary(self, limit=20):
         '''
-        Validates the data from the current row of the input excel document to ensure that key data is available.
-        Without this data, Nominatim's search will return None, making it impossible to plot.
+        Formats the errors for a message box.
 
         Args:
-            row (dict): Current row from the excel document
-            bulkFilePath (str): Path to the current excel document
-            index (int): Row index of the current row
+            limit (int): Maximum number of errors listed. Defaults to 20.
 
         Returns:
-            bool: Returns false if fields are missing, else returns true
-
+            str: The file name followed by one line per error.
         '''
+        lines = [f'{os.path.basename(self.file_path)}: {len(self.errors)} errors']
+        for line, column, message in self.errors[:limit]:
+            lines.append(f'  {message}' if line is None else f'  Line {line}, {column}: {message}')
+        if len(self.errors) > limit:
+            lines.append(f'  ... and {len(self.errors) - limit} more')
+        return '\n'.join(lines)
 
-        required_fields = ['Hochschule', 'Stadt', 'Bundesland']
-        missing_fields = [field for field in required_fields if not row[field]]
 
-        if missing_fields:
-            self.create_msg_box(
-                "Validation Error",
-                f"Missing essential information in file: {bulkFilePath.split('/')[-1]}, Line: {index + 1}. "
-                f"Required fields: {', '.join(missing_fields)}.",
-                'warning'
-            )
-            return False
-        return True
+def validate_input_frame(df):
+    '''
+    Validates a whole bulk import input frame with column-wise checks: every column is filled in, Datum is a date,
+    PLZ has 5 digits (leading zeros lost in Excel are restored), Tische and Teilnehmer are positive integers and
+    Bundesland is one of STATE_LIST.
 
-    def get_valid_plz(self, row, bulkFilePath, index):
-        '''
-        Validates the post code from the current row of the input excel document.
+    Args:
+        df (pd.DataFrame): Input frame with the INPUT_SCHEMA columns.
 
-        Args:
-           row (dict): Current row from the excel document
-           bulkFilePath (str): Path to the current excel document
-           index (int): Row index of the current row
+    Returns:
+        pd.DataFrame, list of tuple: The normalized valid rows and the errors as in ValidationReport.
+    '''
+    failed = {}
+
+    def check(mask, column, message):
+        for index in df.index[mask.to_numpy()]:
+            failed.setdefault(index, []).append((column, message))
+
+    text = df.astype(object).where(df.notna(), '').astype(str).apply(lambda column: column.str.strip())
+    empty = text == ''
+    for column in df.columns:
+        check(empty[column], column, 'is empty')
+
+    datum = df['Datum']
+    is_text = datum.map(lambda value: isinstance(value, str))
+    dates = pd.to_datetime(datum.where(~is_text), errors='coerce')
+    dates[is_text] = pd.to_datetime(text.loc[is_text, 'Datum'], format='%d.%m.%Y', errors='coerce')
+    check(dates.isna() & ~empty['Datum'], 'Datum', 'is not a date')
+
+    plz_number = pd.to_numeric(df['PLZ'], errors='coerce')
+    plz_text = text['PLZ'].where(plz_number.isna() | (plz_number % 1 != 0),
+                                plz_number.fillna(0).astype('int64').astype(str))
+    plz = plz_text.where(~plz_text.str.fullmatch(r'\d{4}'), plz_text.str.zfill(5))
+    check(~plz.str.fullmatch(r'\d{5}') & ~empty['PLZ'], 'PLZ', 'is not a 5 digit post code')
+
+    counts = {}
+    for column in ('Tische', 'Teilnehmer'):
+        number = pd.to_numeric(df[column], errors='coerce')
+        check(~((number > 0) & (number % 1 == 0)) & ~empty[column], column, 'is not a positive integer')
+        counts[column] = number
+
+    states = {state.casefold(): state for state in STATE_LIST}
+    bundesland = text['Bundesland'].str.casefold().map(states)
+    check(bundesland.isna() & ~empty['Bundesland'], 'Bundesland', 'is not a German state')
+
+    errors = [(index + 1, column, message) for index in sorted(failed) for column, message in failed[index]]
+    keep = ~df.index.isin(list(failed))
+    valid = pd.DataFrame({'Datum': dates[keep],
+                          'Hochschule': text.loc[keep, 'Hochschule'],
+                          'Adresse': text.loc[keep, 'Adresse'],
+                          'Stadt': text.loc[keep, 'Stadt'],
+                          'Bundesland': bundesland[keep],
+                          'PLZ': plz[keep],
+                          'Tische': counts['Tische'][keep].astype('int64'),
+                          'Teilnehmer': counts['Teilnehmer'][keep].astype('int64')},
+                         index=df.index[keep])
+    return valid, errors
+
+
+IMPORT_SCORE_WEIGHTS = {'name': 0.4, 'plz': 0.25, 'city': 0.2, 'state': 0.15}
+
+
+def osm_fields(raw_address):
+    '''
+    Picks the fields compared during the bulk import from a Nominatim result.
 
-        Returns:
-            str or None: If the post code exists, returns the post code as a string. If the post code is invalid,
-                returns None. If the post code does not exist, returns empty string ''.
+    Args:
+        raw_address (dict): geopy.location.Location.raw with address details, or None.
 
-        '''
-        if row['PLZ']:
-            try:
-                return str(int(row['PLZ']))
-            except ValueError:
-                self.create_msg_box(
-                    "Validation Error",
-                    f"Invalid PLZ value in file: {bulkFilePath.split('/')[-1]}, Line: {index + 1}.",
-                    'warning'
-                )
-                return None
-        return ''
+    Returns:
+        dict: 'name', 'city', 'plz' and 'state', empty strings where Nominatim has no value. Nominatim names the
+            municipality city, town or village depending on its size.
+    '''
+    address = (raw_address or {}).get('address', {})
+    city = next((address[key] for key in ('city', 'town', 'village', 'municipality') if key in address), '')
+    return {'name': (raw_address or {}).get('name', ''),
+            'city': city,
+            'plz': address.get('postcode', ''),
+            'state': address.get('state', '')}
 
-    def get_valid_table_participants(self, row, bulkFilePath, index):
-        '''
-        Validates the number of tables and participants.
 
-        Args:
-           row (dict): Current row from the excel document
-           bulkFilePath (str): Path to the current excel document
-           index (int): Row index of the current row
+def text_similarity(a, b):
+    '''
+    Similarity of two names between 0 and 1 after GeocodeCache.normalize_query. Either the difflib ratio of the
+    whole strings or the share of the first name's words found in the second, whichever is higher, so that
+    "Hochschule Karlsruhe" still matches "Hochschule Karlsruhe - Technik und Wirtschaft".
 
-        Returns:
-            int, int or None, None: If tables and participants are positive and non-zero, returns the
-                integer values. If there's a value error, returns None for each.
+    Args:
+        a (str): Name from the input document.
+        b (str): Name from Nominatim.
 
-        '''
+    Returns:
+        float: The similarity.
+    '''
+    a = GeocodeCache.normalize_query(a)
+    b = GeocodeCache.normalize_query(b)
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    words = set(a.replace(',', ' ').split())
+    overlap = len(words & set(b.replace(',', ' ').split())) / len(words)
+    return max(difflib.SequenceMatcher(None, a, b).ratio(), overlap)
+
+
+def score_import_row(row, raw_address):
+    '''
+    Scores how well a validated input row agrees with the Nominatim result for it: name similarity, post code
+    match (half if only the two digit region matches), city similarity and state match, weighted by
+    IMPORT_SCORE_WEIGHTS.
+
+    Args:
+        row (pd.Series): Validated input row, see validate_input_frame.
+        raw_address (dict): geopy.location.Location.raw with address details, or None if nothing was found.
+
+    Returns:
+        float, dict: The confidence between 0 and 1 and the score of each part.
+    '''
+    osm = osm_fields(raw_address)
+    plz = str(row['PLZ'])
+    scores = {'name': text_similarity(row['Hochschule'], osm['name']),
+              'plz': 1.0 if plz == osm['plz'] else 0.5 if osm['plz'][:2] == plz[:2] else 0.0,
+              'city': text_similarity(row['Stadt'], osm['city']),
+              'state': float(GeocodeCache.normalize_query(row['Bundesland']) ==
+                             GeocodeCache.normalize_query(osm['state']))}
+    if raw_address is None:
+        scores = dict.fromkeys(scores, 0.0)
+    return sum(IMPORT_SCORE_WEIGHTS[part] * score for part, score in scores.items()), scores
+
+
+def parse_input_file(file_path):
+    '''
+    Reads and validates one bulk import input file. Runs in the worker processes of the bulk import.
+
+    Args:
+        file_path (str): Path to the input file.
+
+    Returns:
+        ValidationReport: The valid rows and the errors of the file.
+    '''
+    try:
+        df = read_xlsx(file_path, {0: INPUT_SCHEMA})[0]
+    except Exception as e:  # Every engine raises its own errors for files that are not workbooks
+        return ValidationReport(file_path, pd.DataFrame(columns=EVENT_COLUMNS), [(None, None, f'not readable: {e}')])
+    valid, errors = validate_input_frame(df.reset_index(drop=True))
+    return ValidationReport(file_path, valid, errors)
+
+
+def xlsx_identifier(file_path):
+    '''
+    Reads the identifier document property of a workbook straight from its docProps/core.xml, without parsing
+    the sheets.
+
+    Args:
+        file_path (str): Path to the workbook.
+
+    Returns:
+        str: The identifier, empty if it is not set.
+    '''
+    with zipfile.ZipFile(file_path) as archive:
         try:
-            tables = int(row['Tische'])
-            participants = int(row['Teilnehmer'])
-            if tables < 0 or participants < 0:
-                raise ValueError("Tables or Participants cannot be negative.")
-            return tables, participants
-        except (ValueError, KeyError):
-            self.create_msg_box(
-                "Validation Error",
-                f"Invalid table or participant values in file: {bulkFilePath.split('/')[-1]}, Line: {index + 1}.",
-                'warning'
-            )
-            return None, None
+            root = ElementTree.fromstring(archive.read('docProps/core.xml'))
+        except KeyError:
+            return ''
+    element = root.find('{http://purl.org/dc/elements/1.1/}identifier')
+    return (element.text or '') if element is not None else ''
 
-    def get_address_from_row(self, row, plz, bulkFilePath, index):
-        '''
-        Gets the address from the row using the name, city, state, and post code of the school/uni.
 
-        Args:
-           row (dict): Current row from the excel document
-           plz: (str): Post code of the current row
-           bulkFilePath (str): Path to the current excel document
-           index (int): Row index of the current row
+def frame_rows(df, columns):
+    '''
+    Converts dataframe rows to tuples of plain Python values for sqlite3. Missing values become None and dates
+    are written in the dd.MM.yyyy format used by the input fields.
 
-        Returns:
-            dict or None: If the raw address is found by the get_address function, returns the dict object.
-                If the address is not found by the function, or if there is a validation error, returns None.
-        '''
-        raw_address = self.get_address(row['Hochschule'] +
-                                       ", " +
-                                       row['Stadt'] +
-                                       ", " +
-                                       row['Bundesland'] +
-                                       ", " +
-                                       plz)
+    Args:
+        df (pd.DataFrame): The rows to convert.
+        columns (list of str): Columns to take, in order. Missing columns are filled with None.
 
-        if not raw_address or 'address' not in raw_address:
-            self.create_msg_box(
-                "Validation Error",
-                f"Incomplete address data returned from OpenStreetMap for file: {bulkFilePath.split('/')[-1]}, Line: {index + 1}.",
-                'warning'
-            )
+    Returns:
+        list of tuple: One tuple per row.
+    '''
+    def plain(value):
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
             return None
+        if isinstance(value, pd.Timestamp):
+            return value.strftime('%d.%m.%Y')
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
 
-        if not all(key in raw_address['address'] for key in ('postcode', 'road')):
-            self.create_msg_box(
-                "Validation Error",
-                f"Incomplete address data returned from OpenStreetMap for file: {bulkFilePath.split('/')[-1]}, Line: {index + 1}.",
-                'warning'
-            )
-            return None
+    frame = df.reindex(columns=columns).astype(object)
+    return [tuple(plain(value) for value in row) for row in frame.itertuples(index=False, name=None)]
 
-        return raw_address
 
-    def process_and_display_dialog(self, row, raw_address, bulkFilePath, index, tables, participants):
-        '''
-        To assist the user in validating input data from the excel documents, this function displays the raw address
-        found by Nominatim, side by side with the data from the excel document.
+class SqliteStore:
+    '''
+    Storage of the Events, Stats and Views tables in a SQLite database, the default backend of the app.
+
+    Unlike the workbook, which has to be parsed and rewritten as a whole, single events are inserted, edited and
+    deleted row by row, and the Stats rows of one city are replaced without touching the others. Events are
+    indexed by school, date and their event_key, Stats by school and city, and Views by name. Column types follow
+    what pandas reads from the workbook, so both backends return the same dataframes.
+
+    Attributes:
+        file_path (str): Path to the SQLite database file.
+        created (bool): True if the database did not exist before this instance opened it.
+    '''
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+
+        folder_path = os.path.dirname(file_path)
+        if folder_path and not os.path.exists(folder_path):
+            os.makedirs(folder_path)
+        self.created = not os.path.exists(file_path)
+        self._conn = sqlite3.connect(file_path, check_same_thread=False)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS events ('
+                           'id INTEGER PRIMARY KEY, '
+                           'Datum TEXT, '
+                           'Hochschule TEXT, '
+                           'Adresse TEXT, '
+                           'Stadt TEXT, '
+                           'Bundesland TEXT, '
+                           'PLZ INTEGER, '
+                           'Tische INTEGER, '
+                           'Teilnehmer INTEGER, '
+                           'event_key TEXT)')
+        if 'event_key' not in [column[1] for column in self._conn.execute('PRAGMA table_info(events)')]:
+            # Databases created before duplicate detection get their keys once
+            self._conn.execute('ALTER TABLE events ADD COLUMN event_key TEXT')
+            rows = self._conn.execute(f'SELECT id, {", ".join(EVENT_COLUMNS)} FROM events').fetchall()
+            self._conn.executemany('UPDATE events SET event_key = ? WHERE id = ?',
+                                   [(event_key(dict(zip(EVENT_COLUMNS, row[1:]))), row[0]) for row in rows])
+        self._conn.execute('CREATE INDEX IF NOT EXISTS events_school ON events (Hochschule, Stadt)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS events_datum ON events (Datum)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS events_key ON events (event_key)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS stats ('
+                           'id INTEGER PRIMARY KEY, '
+                           'Hochschule TEXT, '
+                           'Stadt TEXT, '
+                           'PLZ INTEGER, '
+                           'Latitude REAL, '
+                           'Longitude REAL, '
+                           'EventCount INTEGER, '
+                           'CityEventTotal INTEGER, '
+                           'TotalTables INTEGER, '
+                           'TotalParticipants INTEGER, '
+                           'CityParticipantsTotal INTEGER)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS stats_school ON stats (Hochschule, Stadt)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS stats_city ON stats (Stadt)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS views ('
+                           'id INTEGER PRIMARY KEY, '
+                           'View TEXT, '
+                           'lat_0 REAL, '
+                           'lon_0 REAL, '
+                           'llcrnrlon REAL, '
+                           'llcrnrlat REAL, '
+                           'urcrnrlon REAL, '
+                           'urcrnrlat REAL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS views_name ON views (View)')
+        self._conn.commit()
+
+    def _read_table(self, table, columns, where='', parameters=()):
+        with self._lock:
+            cursor = self._conn.execute(f'SELECT {", ".join(columns)} FROM {table} {where} ORDER BY id',
+                                        parameters)
+            rows = cursor.fetchall()
+        return pd.DataFrame.from_records(rows, columns=columns)
+
+    def _replace_table(self, table, columns, rows):
+        # Runs inside the caller's transaction, so several tables can be replaced atomically
+        placeholders = ', '.join('?' * len(columns))
+        self._conn.execute(f'DELETE FROM {table}')
+        self._conn.executemany(f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({placeholders})', rows)
+
+    @staticmethod
+    def _event_rows(df_events):
+        return [row + (event_key(dict(zip(EVENT_COLUMNS, row))),) for row in frame_rows(df_events, EVENT_COLUMNS)]
+
+    def read(self):
+        '''
+        Reads the Events and Stats tables.
 
         Args:
-           row (dict): Current row from the excel document
-           raw_address (dict): Raw address returned by Nominatim's search
-           bulkFilePath (str): Path to the current excel document
-           index (int): Row index of the current row
-           tables (int): Number of tables
-           participants (int): Number of participants
+            None
 
         Returns:
-            None
+            pd.Dataframe, pd.Dataframe: Events dataframe, Stats dataframe
+        '''
+        return self.read_events(), self.read_stats()
 
+    def read_events(self):
         '''
-        # Prepare dialog fields and populate them with the row data and suggestions
-        suggested_name = raw_address['name']
-        suggested_plz = raw_address['address']['postcode']
-        suggested_address = raw_address['address']['road']
-        if 'house_number' in raw_address['address']:
-            suggested_address += ' ' + raw_address['address']['house_number']
-        suggested_city = raw_address['address'].get('city', '')
-        suggested_state = raw_address['address'].get('state', '')
-
-        # Prepare and show the dialog
-        self.prepare_dialog(
-            row,
-            suggested_name,
-            suggested_address,
-            suggested_city,
-            suggested_plz,
-            suggested_state,
-            bulkFilePath,
-            index
-        )
-
-        button = self.dialogBox.exec()
-
-        if button == 1:  # Accepted
-            self.save_imported_data(row, raw_address, tables, participants, bulkFilePath, index)
-
-    def prepare_dialog(self, row, suggested_name, suggested_address, suggested_city, suggested_plz, suggested_state,
-                       bulkFilePath, index):
-        '''
-        Creates the popup UI that allows the user to inspect and compare the information from the input excel documents
-        versus the data found by Nominatim's search
-
-           row (dict): Current row from the excel document
-           suggested_name (str): Name of the school/university, as found by Nominatim
-           suggested_address (str): Address of the school/university, as found by Nominatim
-           suggested_city (str): City of the school/university, as found by Nominatim
-           suggested_plz (str): Post code of the school/university, as found by Nominatim
-           suggested_state (str): State of the school/university, as found by Nominatim
-           bulkFilePath (str): Path to the current excel document
-           index: (int) Row index of the current row
+        Reads the Events table in insertion order.
 
-        Returns:
+        Args:
             None
 
+        Returns:
+            pd.DataFrame: Events dataframe, indexed by the row id of each event.
         '''
-        # User certification dialog setup
-        self.dialogBox = QDialog(self)
-        self.dialogBox.setWindowTitle(f"Bulk Import - Certify Data {bulkFilePath.split('/')[-1]}, Line: {index + 1}")
-        self.dialogBox.resize(400, 200)
-        self.dialogBox.layout = QGridLayout()
+        df_events = self._read_table('events', ['id'] + EVENT_COLUMNS)
+        return df_events.set_index('id').rename_axis(None)
 
+    def read_event_ids(self):
         '''
-        Define dialog box columns
-        '''
-        firstColumn = QLabel('')
-        secondColumn = QLabel('Data from Excel')
-        thirdColumn = QLabel('Data from OpenStreetMap')
+        Reads the row id of every event.
 
+        Args:
+            None
+
+        Returns:
+            list of int: Row ids in the order of read_events.
         '''
-        Define Labels for column 1 and Edits for column 2.
-        
-        Column 3 is suggested values and are read-only
+        with self._lock:
+            return [row[0] for row in self._conn.execute('SELECT id FROM events ORDER BY id')]
+
+    def read_event_keys(self):
         '''
-        dateLabel = QLabel("Date:", self)
-        self.dateEdit = QLineEdit(self)
-        if row['Datum'] == '':
-            self.dateEdit.setText(QDate.currentDate().toString("dd.MM.yyyy"))
-            self.dateEdit.setStyleSheet('background-color: red')
-        else:
-            self.dateEdit.setText(row['Datum'].strftime("%d.%m.%Y"))
-        dateSuggested = QLabel('')
-
-        nameLabel = QLabel("Name:", self)
-        self.nameEdit = QLineEdit(self)
-        self.nameEdit.setText(row['Hochschule'].strip())
-        nameSuggested = QLineEdit(suggested_name)
-        nameSuggested.setReadOnly(True)
-
-        addressLabel = QLabel("Address:", self)
-        self.addressEdit = QLineEdit(self)
-        self.addressEdit.setText(str(row['Adresse']).strip())
-        addressSuggested = QLineEdit(suggested_address)
-        addressSuggested.setReadOnly(True)
-
-        cityLabel = QLabel("City:", self)
-        self.cityEdit = QLineEdit(self)
-        self.cityEdit.setText(row['Stadt'].strip())
-        citySuggested = QLineEdit(suggested_city)
-        citySuggested.setReadOnly(True)
-
-        plzLabel = QLabel("PLZ Code:", self)
-        self.plzEdit = QLineEdit(self)
-        self.plzEdit.setText(str(row['PLZ']).strip())
-        plzSuggested = QLineEdit(suggested_plz)
-        plzSuggested.setReadOnly(True)
-
-        stateLabel = QLabel("State:", self)
-        stateCombo = QComboBox()
-        for state in self.stateList:
-            stateCombo.addItem(state)
-        state = str(row['Bundesland']).strip()
-        if state in self.stateList:
-            stateCombo.setCurrentIndex(self.stateList.index(state))
-        stateSuggested = QLineEdit(suggested_state)
-        stateSuggested.setReadOnly(True)
-
-        tableLabel = QLabel("Tables:", self)
-        self.tableEdit = QSpinBox(self)
-        self.tableEdit.setMinimum(0)
-        self.tableEdit.setMaximum(2000)
-        self.tableEdit.setValue(int(row['Tische']))
-        tableSuggested = QLabel('')
-
-        participantLabel = QLabel("Participants:", self)
-        self.participantEdit = QSpinBox(self)
-        self.participantEdit.setMinimum(0)
-        self.participantEdit.setMaximum(9999)
-        self.participantEdit.setValue(int(row['Teilnehmer']))
-        participantSuggested = QLabel('')
-
-        # Setup dialog and buttons
-        QBtn = QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
-        self.buttonBox = QDialogButtonBox(QBtn)
-        self.buttonBox.button(QDialogButtonBox.StandardButton.Ok).setEnabled(False)
-
-        '''
-        Define the widget layout for the data review dialog box
-        '''
-        self.dialogBox.layout.addWidget(firstColumn, 0, 0)
-        self.dialogBox.layout.addWidget(secondColumn, 0, 1)
-        self.dialogBox.layout.addWidget(thirdColumn, 0, 2)
-        self.dialogBox.layout.addWidget(dateLabel, 1, 0)
-        self.dialogBox.layout.addWidget(self.dateEdit, 1, 1)
-        self.dialogBox.layout.addWidget(dateSuggested, 1, 2)
-        self.dialogBox.layout.addWidget(nameLabel, 2, 0)
-        self.dialogBox.layout.addWidget(self.nameEdit, 2, 1)
-        self.dialogBox.layout.addWidget(nameSuggested, 2, 2)
-        self.dialogBox.layout.addWidget(addressLabel, 3, 0)
-        self.dialogBox.layout.addWidget(self.addressEdit, 3, 1)
-        self.dialogBox.layout.addWidget(addressSuggested, 3, 2)
-        self.dialogBox.layout.addWidget(cityLabel, 4, 0)
-        self.dialogBox.layout.addWidget(self.cityEdit, 4, 1)
-        self.dialogBox.layout.addWidget(citySuggested, 4, 2)
-        self.dialogBox.layout.addWidget(plzLabel, 5, 0)
-        self.dialogBox.layout.addWidget(self.plzEdit, 5, 1)
-        self.dialogBox.layout.addWidget(plzSuggested, 5, 2)
-        self.dialogBox.layout.addWidget(stateLabel, 6, 0)
-        self.dialogBox.layout.addWidget(stateCombo, 6, 1)
-        self.dialogBox.layout.addWidget(stateSuggested, 6, 2)
-        self.dialogBox.layout.addWidget(tableLabel, 7, 0)
-        self.dialogBox.layout.addWidget(self.tableEdit, 7, 1)
-        self.dialogBox.layout.addWidget(tableSuggested, 7, 2)
-        self.dialogBox.layout.addWidget(participantLabel, 8, 0)
-        self.dialogBox.layout.addWidget(self.participantEdit, 8, 1)
-        self.dialogBox.layout.addWidget(participantSuggested, 8, 2)
-        self.dialogBox.layout.addWidget(self.buttonBox, 9, 0, 1, 3)
-        self.dialogBox.setLayout(self.dialogBox.layout)
-
-        # Connect signals to validation function
-        self.dateEdit.textChanged.connect(self.validate_fields)
-        self.nameEdit.textChanged.connect(self.validate_fields)
-        self.addressEdit.textChanged.connect(self.validate_fields)
-        self.cityEdit.textChanged.connect(self.validate_fields)
-        self.plzEdit.textChanged.connect(self.validate_fields)
-        self.tableEdit.valueChanged.connect(self.validate_fields)
-        self.participantEdit.valueChanged.connect(self.validate_fields)
-        self.validate_fields()
-
-        self.buttonBox.accepted.connect(self.acceptBulkImport)
-        self.buttonBox.rejected.connect(self.rejectBulkImport)
-
-    def save_imported_data(self, row, raw_address, tables, participants, bulkFilePath, index):
-        '''
-        Pulls the input data from the text edit fields and saves it by calling update_excel.
-
-        Args:
-           row (dict): [UNUSED] Current row from the excel document
-           raw_address: [UNUSED] (dict) Raw address returned by Nominatim's search
-           tables (int): Number of tables
-           participants (int): Number of Participants
-           bulkFilePath (str): [UNUSED] Path to the current excel document
-           index (int): [UNUSED] Row index of the current row
+        Reads the stored duplicate detection key of every event, see event_key.
 
-        Returns:
+        Args:
             None
 
+        Returns:
+            list of str: Keys in the order of read_events.
         '''
-        # Save the data
-        date = self.dateEdit.text()
-        name = self.nameEdit.text()
-        address = self.addressEdit.text()
-        city = self.cityEdit.text()
-        state = self.stateCombo.currentText()
-        plzCode = str(self.plzEdit.text())
-        latitude, longitude = self.get_coordinates(city, state, plzCode, address)
-        self.update_excel(self.excelFilePath, date, name, address, city, state, plzCode, latitude, longitude, tables,
-                          participants)
+        with self._lock:
+            return [row[0] for row in self._conn.execute('SELECT event_key FROM events ORDER BY id')]
 
-    def cleanup_imported_files(self, importedData):
+    def read_stats(self, city=None):
         '''
-        If the file was imported properly then the excel document is deleted from the disk. If the file had errors,
-        such as blank fields, it was not recorded, skipped, and is not deleted so that the user can correct the error.
+        Reads the Stats table, or only the rows of one city using the city index.
 
         Args:
-            importedData (list): List of files that were skipped during importing
+            city (str, optional): Only return the schools of this city. Defaults to None for all schools.
 
         Returns:
-            None
-
+            pd.DataFrame: Stats dataframe.
         '''
-        for i in reversed(range(self.bulkImportList.count())):
-            if i in [x[1] for x in importedData]:
-                continue
-            else:
-                bulkFilePath = self.bulkImportList.item(i).text()
-                if os.path.exists(bulkFilePath):
-                    os.remove(bulkFilePath)
-                self.bulkImportList.takeItem(i)
-
-        if importedData:
-            text = 'Not Processed:\n'
-            for i in importedData:
-                text += f'{i[0].split("/")[-1]} Line {i[1]}\n'
-            self.create_msg_box("Bulk Import Complete", text, 'warning')
-
-    def get_from_address(self, raw_address, *keys):
-        """
-        Helper function to retrieve the value from raw_address['address']
-        using the first matching key in the provided keys.
-
-        Args:
-           raw_address (dict): Raw address returned by Nominatim's search
-           keys (str): Keys to be checked if they exist in the address. Matching is necessary due to Nominatim's
-                inconsistencies. Sometimes uses city, town, or village.
-        Returns:
-            str or None: If the key exists, return the value, otherwise return None
-        """
-        for key in keys:
-            if key in raw_address['address']:
-                return raw_address['address'][key]
-        return None
+        if city is None:
+            return self._read_table('stats', STATS_COLUMNS)
+        return self._read_table('stats', STATS_COLUMNS, 'WHERE Stadt = ?', (city,))
 
-    def onLookupAddressButtonClicked(self):
-        """
-        Handles the event when the 'Lookup Address' button is clicked.
-
-        This method retrieves and processes the address information based on the name input by the user.
-        It attempts to fetch and display the corresponding city, state, postcode, and road details in the appropriate UI fields.
-        The method handles special cases for certain cities (Berlin, Hamburg, Bremen) and ensures that essential address components
-        like the city, state, postcode, and road are available before populating the UI.
+    def write(self, df_events, df_stats):
+        '''
+        Replaces the Events and Stats tables in one transaction.
 
         Args:
-            None
+            df_events (pd.DataFrame): Events dataframe.
+            df_stats (pd.DataFrame): Stats dataframe.
 
         Returns:
-            None
-
-        Raises:
-            AddressError: If the city, state, postcode, or road information is missing from the retrieved address.
-
-        """
-        name = self.nameEdit.text()
+            bool: True if the write succeeded.
+        '''
+        event_rows = self._event_rows(df_events)
+        stats_rows = frame_rows(df_stats, STATS_COLUMNS)
         try:
-            raw_address = self.get_address(name)
-            if raw_address == None:
-                return
-            self.nameEdit.setText(raw_address['name'])
+            with self._lock, self._conn:
+                self._replace_table('events', EVENT_KEY_COLUMNS, event_rows)
+                self._replace_table('stats', STATS_COLUMNS, stats_rows)
+            return True
+        except sqlite3.Error:
+            return False
 
-            # Attempt to retrieve the city, town, or village
-            city = self.get_from_address(raw_address, 'city', 'town', 'village')
-            if not city:
-                raise AddressError("City/Town/Village not found in the address.")
+    def insert_event(self, event, event_id=None):
+        '''
+        Appends a single event.
 
-            # Handle special cases for Berlin, Hamburg, and Bremen
-            if city in ['Berlin', 'Hamburg', 'Bremen']:
-                state = city
-                self.cityEdit.setText(city)
-            else:
-                # Attempt to retrieve the state or equivalent
-                state = self.get_from_address(raw_address, 'state', 'region')
-                if not state:
-                    raise AddressError("State/Region not found in the address.")
-                self.cityEdit.setText(city)
-
-            # Set the state in the combo box
-            self.stateCombo.setCurrentIndex(self.stateList.index(state))
-
-            # Handle postcode and road
-            postcode = raw_address['address'].get('postcode')
-            road = raw_address['address'].get('road')
-            if postcode and road:
-                self.plzEdit.setText(postcode)
-                house_number = raw_address['address'].get('house_number', '')
-                self.addressEdit.setText(f"{road} {house_number}".strip())
-            else:
-                raise AddressError("Incomplete address: postcode or road missing.")
+        Args:
+            event (dict or pd.Series): Values keyed by Events column.
+            event_id (int, optional): Row id of the new event. Defaults to None to let SQLite choose it.
 
-        except AttributeError:
-            self.create_msg_box("Address Not Found", "Address not found. Please try again.", 'warning')
-            return
-        except AddressError as e:
-            self.create_msg_box("Address Error",
-                                f"Error: {str(e)} \n\n"
-                                f"Returned address was:\n\n {raw_address['display_name']}.",
-                                'warning')
-            return
+        Returns:
+            int: Row id of the new event.
+        '''
+        row = (event_id,) + self._event_rows(pd.DataFrame([dict(event)]))[0]
+        with self._lock, self._conn:
+            cursor = self._conn.execute(f'INSERT INTO events (id, {", ".join(EVENT_KEY_COLUMNS)}) '
+                                        f'VALUES (?, {", ".join("?" * len(EVENT_KEY_COLUMNS))})', row)
+        return cursor.lastrowid
 
-    def clearAll(self):
+    def insert_events(self, df_events, event_ids=None):
         '''
-        Clears all text input fields
+        Appends many events in one transaction.
 
         Args:
-            None
+            df_events (pd.DataFrame): The events.
+            event_ids (list of int, optional): Row ids of the new events. Defaults to None to let SQLite choose
+                them.
 
         Returns:
             None
-
         '''
-        self.nameEdit.setText('')
-        self.addressEdit.setText('')
-        self.cityEdit.setText('')
-        self.plzEdit.setText('')
-        self.dateEdit.setDate(QDate.currentDate())
-        self.stateCombo.setCurrentIndex(0)
-        self.tableEdit.setValue(0)
-        self.participantEdit.setValue(0)
+        rows = self._event_rows(df_events)
+        if event_ids is None:
+            event_ids = [None] * len(rows)
+        with self._lock, self._conn:
+            self._conn.executemany(f'INSERT INTO events (id, {", ".join(EVENT_KEY_COLUMNS)}) '
+                                   f'VALUES (?, {", ".join("?" * len(EVENT_KEY_COLUMNS))})',
+                                   [(int(event_id) if event_id is not None else None,) + row
+                                    for event_id, row in zip(event_ids, rows)])
 
-    def onRecalculateButtonClicked(self):
+    def update_event(self, event_id, event):
         '''
-        When the button is clicked, recalculate the statistics for the Stats dataframe.
+        Overwrites an event, found by its row id through the primary key.
 
         Args:
-            None
+            event_id (int): Row id of the event, the index of the dataframe returned by read_events.
+            event (dict or pd.Series): New values keyed by Events column.
 
         Returns:
             None
 
+        Raises:
+            IndexError: If there is no event with this row id.
         '''
-        msgBox = QMessageBox(self)
-        msgBox.setIcon(QMessageBox.Icon.Warning)
-        msgBox.setWindowTitle("Recalculate Statistics?")
-        msgBox.setText(
-            "Proceeding will clear all existing statistics and recalculate them from scratch.\n\n "
-            "Are you sure you want to proceed?\n\n "
-            "Calculation may take a while.")
-        msgBox.setStandardButtons(
-            QMessageBox.StandardButton.Yes |
-            QMessageBox.StandardButton.No
-        )
-        button = msgBox.exec()
-
-        if button == QMessageBox.StandardButton.No:
-            return
-        elif button == QMessageBox.StandardButton.Yes:
-            df_events, df_stats = self.read_excel_file(self.excelFilePath)
-            df_stats = pd.DataFrame(columns=['Hochschule', 'Stadt', 'PLZ', 'Latitude', 'Longitude',
-                                             'EventCount', 'CityEventTotal', 'TotalTables',
-                                             'TotalParticipants', 'CityParticipantsTotal'])
-            self.recalculateStatistics(df_events, df_stats)
-            self.create_msg_box("Complete", "Recalculation Complete")
-            return
-
-    def recalculateStatistics(self, df_events, df_stats, lat=None, lon=None):
-        """
-        Recalculates statistical data based on event information and updates the statistics DataFrame.
+        row = self._event_rows(pd.DataFrame([dict(event)]))[0]
+        with self._lock, self._conn:
+            cursor = self._conn.execute(f'UPDATE events SET '
+                                        f'{", ".join(f"{column} = ?" for column in EVENT_KEY_COLUMNS)} WHERE id = ?',
+                                        row + (int(event_id),))
+        if cursor.rowcount == 0:
+            raise IndexError(f'no event with id {event_id}')
 
-        This method processes the events in the provided `df_events` DataFrame to generate and update statistical
-        information in the `df_stats` DataFrame. The statistics include the number of events, total tables,
-        and total participants for each university in the specified city. If latitude and longitude coordinates
-        are not provided, the method attempts to retrieve them using the city's address information.
+    def delete_event(self, event_id):
+        '''
+        Deletes an event, found by its row id through the primary key.
 
         Args:
-            df_events (pd.DataFrame): A DataFrame containing event details, including fields such as 'Hochschule',
-                'Adresse', 'Stadt', 'Bundesland', 'PLZ', 'Tische', and 'Teilnehmer'.
-            df_stats (pd.DataFrame): A DataFrame that will be populated with statistics including 'Hochschule',
-                'Stadt', 'PLZ', 'Latitude', 'Longitude', 'EventCount', 'CityEventTotal', 'TotalTables',
-                'TotalParticipants', and 'CityParticipantsTotal'.
-            lat (float, optional): Latitude coordinate to be used if not calculated or provided. Defaults to None.
-            lon (float, optional): Longitude coordinate to be used if not calculated or provided. Defaults to None.
+            event_id (int): Row id of the event, the index of the dataframe returned by read_events.
 
         Returns:
-            bool: True if the Excel file was successfully written, otherwise False if an OSError occurs during the file writing process.
+            None
 
         Raises:
-            None: All exceptions are handled internally, specifically file writing errors are caught and result in returning False.
-
-        """
-        df_stats = pd.DataFrame(columns=['Hochschule', 'Stadt', 'PLZ', 'Latitude', 'Longitude',
-                                         'EventCount', 'CityEventTotal', 'TotalTables',
-                                         'TotalParticipants', 'CityParticipantsTotal'])
-        for index, row in df_events.iterrows():
-            name = row['Hochschule']
-            address = row['Adresse']
-            city = row['Stadt']
-            state = row['Bundesland']
-            plz = row['PLZ']
-            tables = row['Tische']
-            participants = row['Teilnehmer']
-            school_exists = ((df_stats['Hochschule'] == name) & (df_stats['Stadt'] == city)).any().any()
-            if school_exists:
-                df_stats.loc[(df_stats['Hochschule'] == name) & (df_stats['Stadt'] == city), 'EventCount'] += 1
-                df_stats.loc[
-                    (df_stats['Hochschule'] == name) & (df_stats['Stadt'] == city), 'TotalTables'] += int(
-                    tables)
-                df_stats.loc[
-                    (df_stats['Hochschule'] == name) & (df_stats['Stadt'] == city), 'TotalParticipants'] += int(
-                    participants)
-            else:
-                if lat is None or lon is None:
-                    lat, lon = self.get_coordinates(city, state, plz, address)
-                    if lat is None or lon is None:
-                        self.create_msg_box("Coordinates not found",
-                                            f"No coordinates were found for {name} at {address}. {city}, {state}, {plz} \n"
-                                            f"using coordinates for city instead.",
-                                            'warning')
-                        lat, lon = self.get_coordinates(city, state, plz)
-                df_stats.loc[len(df_stats.index) + 1] = [name, city, plz, lat, lon, 1, -1, int(tables),
-                                                         int(participants), -1]
-                lat = None
-                lon = None
-            city_event_total = df_stats[df_stats['Stadt'] == city]['EventCount'].sum()
-            df_stats.loc[df_stats['Stadt'] == city, 'CityEventTotal'] = int(city_event_total)
-            city_participants_total = df_stats[df_stats['Stadt'] == city]['TotalParticipants'].sum()
-            df_stats.loc[df_stats['Stadt'] == city, 'CityParticipantsTotal'] = int(city_participants_total)
-        try:
-            with pd.ExcelWriter(self.excelFilePath) as writer:
-                df_events.to_excel(writer, sheet_name='Events', index=False)
-                df_stats.to_excel(writer, sheet_name='Stats', index=False)
-            return True
-        except OSError:
-            return False
+            IndexError: If there is no event with this row id.
+        '''
+        with self._lock, self._conn:
+            cursor = self._conn.execute('DELETE FROM events WHERE id = ?', (int(event_id),))
+        if cursor.rowcount == 0:
+            raise IndexError(f'no event with id {event_id}')
 
-    def onArchiveButtonClicked(self):
-        """
-        Archives the existing ClimatePlotter excel document, copying or moving it to the archive folder.
+    def replace_city_stats(self, city, df_city):
+        '''
+        Replaces the Stats rows of one city, the only rows that change when an event is added or removed.
 
         Args:
-            None
+            city (str): The city.
+            df_city (pd.DataFrame): The new Stats rows of the city.
 
         Returns:
             None
+        '''
+        placeholders = ', '.join('?' * len(STATS_COLUMNS))
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM stats WHERE Stadt = ?', (city,))
+            self._conn.executemany(f'INSERT INTO stats ({", ".join(STATS_COLUMNS)}) VALUES ({placeholders})',
+                                   frame_rows(df_city, STATS_COLUMNS))
 
-        """
-        msgBox = QMessageBox(self)
-        msgBox.setIcon(QMessageBox.Icon.Warning)
-        msgBox.setWindowTitle("Archive Excel?")
-        msgBox.setText(
-            "Archive and clear to start a new data file\n\n"
-            "Archive and keep to keep the current data file\n\n"
-            "Cancel to keep the current data file without archiving"
-        )
-        archive_and_clear_button = QPushButton("Archive and Clear")
-        archive_and_keep_button = QPushButton("Archive and Keep")
-
-        msgBox.addButton(archive_and_clear_button, QMessageBox.ButtonRole.AcceptRole)
-        msgBox.addButton(archive_and_keep_button, QMessageBox.ButtonRole.AcceptRole)
-        msgBox.addButton(QMessageBox.StandardButton.Cancel)
-
-        msgBox.exec()
-
-        if msgBox.clickedButton() == archive_and_clear_button:
-            self.archive_and_clear()
-        elif msgBox.clickedButton() == archive_and_keep_button:
-            self.archive_and_keep()
-        elif msgBox.clickedButton() == QMessageBox.StandardButton.Cancel:
-            return
-
-    def archive_and_clear(self):
-        """
-        Called from the onArchiveButtonClicked function. Moves the existing ClimatePlotter document to the
-        archive folder and creates a new file.
+    def read_views(self):
+        '''
+        Reads the Views table in its saved order.
 
         Args:
             None
 
         Returns:
-            None
-
-        """
-        try:
-            self.archiveExcel()
-            df_events = pd.DataFrame(
-                columns=['Datum', 'Hochschule', 'Adresse', 'Stadt', 'Bundesland', 'PLZ', 'Tische', 'Teilnehmer'])
-            df_stats = pd.DataFrame(columns=['Hochschule', 'Stadt', 'PLZ', 'Latitude', 'Longitude',
-                                             'EventCount', 'CityEventTotal', 'TotalTables',
-                                             'TotalParticipants', 'CityParticipantsTotal'])
-            with pd.ExcelWriter(self.excelFilePath) as writer:
-                df_events.to_excel(writer, sheet_name='Events', index=False)
-                df_stats.to_excel(writer, sheet_name='Stats', index=False)
-        except OSError:
-            self.create_msg_box("Error", "Error in archiving data")
-        return
+            pd.DataFrame: Views dataframe.
+        '''
+        return self._read_table('views', VIEW_COLUMNS)
 
-    def archive_and_keep(self):
-        """
-        Called from the onArchiveButtonClicked function. Copies the existing ClimatePlotter document to the
-        archive folder.
+    def write_views(self, df_views):
+        '''
+        Replaces the Views table.
 
         Args:
-            None
+            df_views (pd.DataFrame): Views dataframe.
 
         Returns:
             None
+        '''
+        rows = frame_rows(df_views, VIEW_COLUMNS)
+        with self._lock, self._conn:
+            self._replace_table('views', VIEW_COLUMNS, rows)
 
-        """
-        self.archiveExcel()
-        return
 
-    def archiveExcel(self):
-        """
-        Creates the copy of the ClimatePlotter excel document in the archive folder.
+class ExcelStore:
+    '''
+    Storage of Events and Stats in the ClimatePlotter workbook with an append-only journal next to it.
 
-        Args:
-            None
+    Rewriting the workbook costs time proportional to the whole history, so single changes are appended to a
+    JSON Lines journal instead: one line per inserted, edited or deleted event and per city whose Stats rows were
+    replaced, flushed to disk before returning. read merges the journal into the last compacted snapshot. compact
+    writes the merged data back into the workbook and empties the journal. It is never run by a journal write, so
+    saving a change does not wait for the workbook; the app compacts on a worker thread once needs_compaction
+    reports a journal past journal_limit bytes, and when it exits.
 
-        Returns:
-            None
+    Every journal line carries a sequence number and the workbook records the last one it contains, so lines left
+    behind by a crash between replacing the workbook and emptying the journal are not applied twice. A line cut
+    short by a crash is ignored. The workbook is rewritten without holding the journal lock: changes journaled
+    meanwhile get later sequence numbers and stay in the journal.
 
-        """
-        date = pd.Timestamp.now().strftime("%Y-%m-%d_H%HM%MS%S")
-        folder_path = os.path.join(os.path.dirname(__file__), 'Plotter_Output', 'Archive')
-        if not os.path.exists(folder_path):
-            os.makedirs(folder_path)
-        shutil.copy(
-            self.excelFilePath,
-            os.path.join(
-                folder_path,
-                date + "_Archived_ClimatePlotter.xlsx"
-            )
-        )
-        self.create_msg_box("Complete", "Archiving Complete")
-        return
+    Attributes:
+        file_path (str): Path to the workbook.
+        journal_path (str): Path to the journal.
+        journal_limit (int): Journal size in bytes above which it is compacted into the workbook.
+    '''
+    SEQUENCE_PREFIX = 'journal-seq:'
 
-    def initUI(self):
-        """
-        Initialize the UI of the main window
+    def __init__(self, file_path, journal_limit=1 << 20):
+        self.file_path = file_path
+        self.journal_path = os.path.splitext(file_path)[0] + '.journal.jsonl'
+        self.journal_limit = journal_limit
+        self._lock = threading.RLock()
+        # Serializes workbook rewrites; the journal stays writable while one runs
+        self._write_lock = threading.Lock()
+        self._sequence = None
+
+    def exists(self):
+        '''
+        Checks whether the workbook or its journal exists.
 
         Args:
             None
 
         Returns:
-            None
+            bool: True if there is anything to read.
+        '''
+        return os.path.exists(self.file_path) or os.path.exists(self.journal_path)
+
+    def _read_snapshot(self, errors=None):
+        if not os.path.exists(self.file_path):
+            return pd.DataFrame(columns=EVENT_COLUMNS), pd.DataFrame(columns=STATS_COLUMNS), 0
+        frames = read_xlsx(self.file_path, {'Events': EVENT_SCHEMA, 'Stats': STATS_SCHEMA}, errors=errors)
+        df_events = frames.get('Events', pd.DataFrame(columns=EVENT_COLUMNS))
+        df_stats = frames.get('Stats', pd.DataFrame(columns=STATS_COLUMNS))
+        return df_events, df_stats, self._snapshot_sequence()
+
+    def _snapshot_sequence(self):
+        if not os.path.exists(self.file_path):
+            return 0
+        identifier = xlsx_identifier(self.file_path)
+        return int(identifier[len(self.SEQUENCE_PREFIX):]) if identifier.startswith(self.SEQUENCE_PREFIX) else 0
+
+    def _read_journal(self):
+        entries = []
+        try:
+            with open(self.journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return entries
+
+    @staticmethod
+    def _apply(df_events, df_stats, entry):
+        if entry['op'] == 'insert':
+            row = pd.DataFrame([entry['event']], columns=EVENT_COLUMNS)
+            df_events = row if df_events.empty else pd.concat([df_events, row], ignore_index=True)
+        elif entry['op'] == 'update':
+            df_events = df_events.copy()
+            df_events.iloc[entry['position']] = pd.Series(entry['event']).reindex(df_events.columns)
+        elif entry['op'] == 'delete':
+            df_events = df_events.drop(df_events.index[entry['position']]).reset_index(drop=True)
+        elif entry['op'] == 'stats':
+            df_city = pd.DataFrame(entry['rows'], columns=STATS_COLUMNS)
+            frames = [df for df in (df_stats[df_stats['Stadt'] != entry['city']], df_city) if not df.empty]
+            df_stats = pd.concat(frames, ignore_index=True) if frames else df_city
+        return df_events, df_stats
+
+    def read(self, errors=None):
+        '''
+        Reads the Events and Stats sheets and applies the journal. A missing sheet is returned as an empty
+        dataframe.
+
+        Args:
+            errors (dict, optional): Receives the conversion errors of each sheet, see read_xlsx. Defaults to None.
+
+        Returns:
+            pd.Dataframe, pd.Dataframe: Events dataframe, Stats dataframe
 
-        """
-        self.setGeometry(300, 300, 1024, 700)
-        self.setWindowTitle('Deutschland - Klimapuzzle Plotter')
-        self.setWindowIcon(QIcon('icon/icon.png'))
-        # Create central widget
-        centralWidget = QWidget(self)
-        self.setCentralWidget(centralWidget)
+        Raises:
+            FileNotFoundError: If neither the workbook nor its journal exist.
+        '''
+        with self._lock:
+            if not self.exists():
+                raise FileNotFoundError(self.file_path)
+            df_events, df_stats, sequence = self._read_snapshot(errors)
+            for entry in self._read_journal():
+                if entry['seq'] > sequence:
+                    df_events, df_stats = self._apply(df_events, df_stats, entry)
+            return df_events, df_stats
 
-        # Layout
-        mylayout = QHBoxLayout()
-        leftBox = QGridLayout()
-        middleBox = QVBoxLayout()
-        rightBox = QGridLayout()
+    def _next_sequence(self):
+        if self._sequence is None:
+            sequence = self._snapshot_sequence()
+            self._sequence = max([sequence] + [entry['seq'] for entry in self._read_journal()])
+        self._sequence += 1
+        return self._sequence
+
+    def _append(self, *entries):
+        with self._lock:
+            lines = [json.dumps(dict(entry, seq=self._next_sequence()), ensure_ascii=False) + '\n' for entry in entries]
+            line = ''.join(lines).encode('utf-8')
+            with open(self.journal_path, 'ab+') as f:
+                # Starts on a new line if a crash cut the previous one short
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        line = b'\n' + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def needs_compaction(self):
+        '''
+        Checks whether the journal has grown past journal_limit bytes.
+
+        Args:
+            None
 
+        Returns:
+            bool: True if the journal should be compacted into the workbook.
         '''
-        BulkButtonBox
+        try:
+            return os.path.getsize(self.journal_path) > self.journal_limit
+        except OSError:
+            return False
+
+    def insert_event(self, event):
         '''
-        self.addButton = QPushButton("Add", self)
-        self.removeButton = QPushButton("Remove", self)
-        self.clearButton = QPushButton("Clear", self)
-
-        '''
-        BulkImportBox
-        '''
-        self.bulkImportList = QListWidget(self)
-        bulkImportGroupBox = QGroupBox("Bulk Import", self)
-        BulkImportBoxLayout = QGridLayout()
-        bulkImportGroupBox.setLayout(BulkImportBoxLayout)
-
-        self.bulkImportButton = QPushButton("Bulk Import", self)
-
-        BulkImportBoxLayout.addWidget(self.bulkImportList, 0, 0, 3, 1)
-        BulkImportBoxLayout.addWidget(self.addButton, 0, 1)
-        BulkImportBoxLayout.addWidget(self.removeButton, 1, 1)
-        BulkImportBoxLayout.addWidget(self.clearButton, 2, 1)
-        BulkImportBoxLayout.addWidget(self.bulkImportButton, 3, 0, 1, 2)
-
-        self.addButton.clicked.connect(self.addExcelFiles)
-        self.removeButton.clicked.connect(self.removeExcelFiles)
-        self.clearButton.clicked.connect(self.clearExcelFiles)
-        self.bulkImportButton.clicked.connect(self.bulkImportExcelFiles)
+        Appends a single event to the journal.
+
+        Args:
+            event (dict or pd.Series): Values keyed by Events column.
 
+        Returns:
+            None
         '''
-        Input Box
-        '''
-        # Add widgets to layout
-        self.nameLabel = QLabel("School/University Name:", self)
-        self.nameEdit = QLineEdit(self)
+        row = frame_rows(pd.DataFrame([dict(event)]), EVENT_COLUMNS)[0]
+        self._append({'op': 'insert', 'event': dict(zip(EVENT_COLUMNS, row))})
 
-        self.addressLookupButton = QPushButton("Lookup Address", self)
-        self.addressLookupButton.clicked.connect(self.onLookupAddressButtonClicked)
+    def insert_events(self, df_events):
+        '''
+        Appends many events to the journal with a single write.
 
-        self.addressLabel = QLabel("Address:", self)
-        self.addressEdit = QLineEdit(self)
-
-        self.cityLabel = QLabel("City:", self)
-        self.cityEdit = QLineEdit(self)
-
-        self.plzLabel = QLabel("PLZ Code:", self)
-        self.plzEdit = QLineEdit(self)
-
-        self.stateLabel = QLabel("State:", self)
-        self.stateCombo = QComboBox()
-        for state in self.stateList:
-            self.stateCombo.addItem(state)
-
-        self.dateLabel = QLabel("Date (dd.MM.yyyy):", self)
-        self.dateEdit = QDateEdit(self)
-        self.dateEdit.setCalendarPopup(True)
-        self.dateEdit.setDisplayFormat("dd.MM.yyyy")
-        self.dateEdit.setDate(QDate.currentDate())
-        minDate = QDate(2020, 1, 1)
-        maxDate = QDate.currentDate()
-        self.dateEdit.setMinimumDate(minDate)
-        self.dateEdit.setMaximumDate(maxDate)
-
-        self.tableLabel = QLabel("Tische:", self)
-        self.tableEdit = QSpinBox(self)
-        self.tableEdit.setMinimum(0)
-        self.tableEdit.setMaximum(2000)
-        self.tableEdit.setMinimum(0)
-
-        self.participantLabel = QLabel("Teilnehmer:", self)
-        self.participantEdit = QSpinBox(self)
-        self.participantEdit.setMinimum(0)
-        self.participantEdit.setMaximum(9999)
-
-        # New button for updating CSV
-        self.updateCsvButton = QPushButton("Update Excel", self)
-        self.updateCsvButton.clicked.connect(self.onUpdateCsvButtonClicked)
-
-        self.plotButton = QPushButton("Update Plot", self)
-        self.plotButton.clicked.connect(lambda: self.onPlotButtonClicked(doSave=True))
-
-        self.clearAllButton = QPushButton("Clear All", self)
-        self.clearAllButton.clicked.connect(self.clearAll)
-
-        self.recalculateButton = QPushButton("Recalculate Statistics", self)
-        self.recalculateButton.clicked.connect(self.onRecalculateButtonClicked)
-
-        self.archiveButton = QPushButton("Archive Xlsx", self)
-        self.archiveButton.clicked.connect(self.onArchiveButtonClicked)
-
-        InputBoxGroupBox = QGroupBox("Manual Input", self)
-        InputBoxLayout = QGridLayout()
-        InputBoxGroupBox.setLayout(InputBoxLayout)
-
-        InputBoxLayout.addWidget(self.nameLabel, 0, 0)
-        InputBoxLayout.addWidget(self.nameEdit, 0, 1)
-        InputBoxLayout.addWidget(self.addressLookupButton, 1, 0, 1, 2)
-        InputBoxLayout.addWidget(self.addressLabel, 2, 0)
-        InputBoxLayout.addWidget(self.addressEdit, 2, 1)
-        InputBoxLayout.addWidget(self.cityLabel, 3, 0)
-        InputBoxLayout.addWidget(self.cityEdit, 3, 1)
-        InputBoxLayout.addWidget(self.plzLabel, 4, 0)
-        InputBoxLayout.addWidget(self.plzEdit, 4, 1)
-        InputBoxLayout.addWidget(self.stateLabel, 5, 0)
-        InputBoxLayout.addWidget(self.stateCombo, 5, 1)
-        InputBoxLayout.addWidget(self.dateLabel, 6, 0)
-        InputBoxLayout.addWidget(self.dateEdit, 6, 1)
-        InputBoxLayout.addWidget(self.tableLabel, 7, 0)
-        InputBoxLayout.addWidget(self.tableEdit, 7, 1)
-        InputBoxLayout.addWidget(self.participantLabel, 8, 0)
-        InputBoxLayout.addWidget(self.participantEdit, 8, 1)
-        InputBoxLayout.addWidget(self.updateCsvButton, 9, 0)
-        InputBoxLayout.addWidget(self.plotButton, 9, 1)
-        InputBoxLayout.addWidget(self.clearAllButton, 10, 0, 1, 2)
-
-        FileControlGroupBox = QGroupBox("File Control", self)
-        FileControlBoxLayout = QVBoxLayout()
-        FileControlGroupBox.setLayout(FileControlBoxLayout)
-        FileControlBoxLayout.addWidget(self.recalculateButton)
-        FileControlBoxLayout.addWidget(self.archiveButton)
-
-        '''
-        middleBox
-        '''
-        self.figure = plt.figure()
-        self.canvas = FigureCanvas(self.figure)
-        middleBox.addWidget(self.canvas)  # Add the canvas to the layout
-
-        '''
-        rightBox
-        '''
-        self.plotListWidget = QListWidget(self)
-        self.setupPlotListWidget()
-        self.plotListWidget.clicked.connect(self.onplotListWidgetClicked)
-
-        viewInputBox = QGridLayout()
-
-        viewInputGroupBox = QGroupBox("Manual View Input", self)
-        viewInputBoxLayout = QGridLayout()
-        viewInputGroupBox.setLayout(viewInputBoxLayout)
-        self.viewNameLabel = QLabel("View Name:", self)
-        self.viewName = QLineEdit(self)
-        self.viewLatLabel = QLabel("Central Latitude:", self)
-        self.viewLat = QLineEdit(self)
-        self.viewLonLabel = QLabel("Central Longitude:", self)
-        self.viewLon = QLineEdit(self)
-        self.viewLLCLatLabel = QLabel("Lower Left Corner Latitude:", self)
-        self.viewLLCLat = QLineEdit(self)
-        self.viewLLCLonLabel = QLabel("Lower Left Corner Longitude:", self)
-        self.viewLLCLon = QLineEdit(self)
-        self.viewURCLatLabel = QLabel("Upper Right Corner Latitude:", self)
-        self.viewURCLat = QLineEdit(self)
-        self.viewURCLonLabel = QLabel("Upper Right Corner Longitude:", self)
-        self.viewURCLon = QLineEdit(self)
-        self.cityLookupButton = QPushButton("Find City Coordinates", self)
-
-        viewInputBoxLayout.addWidget(self.viewNameLabel, 0, 0)
-        viewInputBoxLayout.addWidget(self.viewName, 0, 1)
-        viewInputBoxLayout.addWidget(self.viewLatLabel, 1, 0)
-        viewInputBoxLayout.addWidget(self.viewLat, 1, 1)
-        viewInputBoxLayout.addWidget(self.viewLonLabel, 2, 0)
-        viewInputBoxLayout.addWidget(self.viewLon, 2, 1)
-        viewInputBoxLayout.addWidget(self.viewLLCLatLabel, 3, 0)
-        viewInputBoxLayout.addWidget(self.viewLLCLat, 3, 1)
-        viewInputBoxLayout.addWidget(self.viewLLCLonLabel, 4, 0)
-        viewInputBoxLayout.addWidget(self.viewLLCLon, 4, 1)
-        viewInputBoxLayout.addWidget(self.viewURCLatLabel, 5, 0)
-        viewInputBoxLayout.addWidget(self.viewURCLat, 5, 1)
-        viewInputBoxLayout.addWidget(self.viewURCLonLabel, 6, 0)
-        viewInputBoxLayout.addWidget(self.viewURCLon, 6, 1)
-
-        cityLookupGroupBox = QGroupBox("City Lookup", self)
-        cityLookupBoxLayout = QGridLayout()
-        cityLookupGroupBox.setLayout(cityLookupBoxLayout)
-
-        self.cityNameLabel = QLabel("City Name:", self)
-        self.cityName = QLineEdit(self)
-        self.stateNameLabel = QLabel("State Name:", self)
-        self.stateLookupCombo = QComboBox()
-        for state in self.stateList:
-            self.stateLookupCombo.addItem(state)
-        self.cityLookupButton.clicked.connect(self.onCityLookupButtonClicked)
-        cityLookupBoxLayout.addWidget(self.cityNameLabel, 0, 0)
-        cityLookupBoxLayout.addWidget(self.cityName, 0, 1)
-        cityLookupBoxLayout.addWidget(self.stateNameLabel, 1, 0)
-        cityLookupBoxLayout.addWidget(self.stateLookupCombo, 1, 1)
-        cityLookupBoxLayout.addWidget(self.cityLookupButton, 2, 0, 1, 2)
-
-        self.PreViewAddButton = QPushButton("Preview View", self)
-        self.PreViewAddButton.clicked.connect(self.onPreViewButtonClicked)
-        self.ViewAddButton = QPushButton("Save View", self)
-        self.ViewAddButton.clicked.connect(self.onViewAddButtonClicked)
-        self.ViewRemoveButton = QPushButton("Remove View", self)
-        self.ViewRemoveButton.clicked.connect(self.onViewRemoveButtonClicked)
-
-        viewInputBox.addWidget(cityLookupGroupBox, 0, 0, 5, 2)
-        viewInputBox.addWidget(viewInputGroupBox, 5, 0, 5, 2)
-        viewInputBox.addWidget(self.PreViewAddButton, 10, 0, 1, 2)
-        viewInputBox.addWidget(self.ViewAddButton, 11, 0, 1, 2)
-        viewInputBox.addWidget(self.ViewRemoveButton, 12, 0, 1, 2)
-
-        rightBox.addWidget(self.plotListWidget, 0, 0, 5, 1)
-        rightBox.addLayout(viewInputBox, 6, 0, 3, 1)
-
-        leftBox.addWidget(bulkImportGroupBox, 0, 0, 3, 2)
-        leftBox.addWidget(InputBoxGroupBox, 3, 0, 3, 2)
-        leftBox.addWidget(FileControlGroupBox, 6, 0, 1, 2)
-
-        mylayout.addLayout(leftBox)
-        mylayout.addLayout(middleBox)
-        mylayout.addLayout(rightBox)
-
-        centralWidget.setLayout(mylayout)
-
-        # Draw the initial map
-        self.drawInitialMap()
-
-    def create_msg_box(self, title, text, type='info'):
-        """
-        Creates popup style message boxes.
-
-        Args:
-            title (str): Title text for header for the pop up window
-            text (str): Body text for the pop up window
-            type (str): Class of pop up. Accepts 'info', 'warning', or 'critical'
+        Args:
+            df_events (pd.DataFrame): The events.
 
         Returns:
             None
+        '''
+        self._append(*({'op': 'insert', 'event': dict(zip(EVENT_COLUMNS, row))}
+                       for row in frame_rows(df_events, EVENT_COLUMNS)))
 
-        """
-        msgBox = QMessageBox(self)
-        if type == 'info':
-            type = QMessageBox.Icon.Information
-        elif type == 'warning':
-            type = QMessageBox.Icon.Warning
-        elif type == 'critical':
-            type = QMessageBox.Icon.Critical
-        msgBox.setIcon(QMessageBox.Icon.Information)
-        msgBox.setWindowTitle(title)
-        msgBox.setText(text)
-        msgBox.setStandardButtons(QMessageBox.StandardButton.Ok)
-        msgBox.exec()
-
-    def onUpdateCsvButtonClicked(self):
-        """
-        Handles the event when the 'Update CSV' button is clicked.
-
-        This method validates the input fields, converts relevant fields to integers,
-        and checks that they are greater than zero. It then retrieves the coordinates
-        based on the provided address details and updates the corresponding Excel file
-        with the new data. If the data is successfully saved, the statistics are recalculated
-        and the user is notified. If the input validation fails, or the Excel file cannot
-        be updated, an appropriate error message is displayed.
+    def update_event(self, position, event):
+        '''
+        Journals an edit of the event at a row position.
 
         Args:
+            position (int): Row position, as in the dataframe returned by read.
+            event (dict or pd.Series): New values keyed by Events column.
+
+        Returns:
             None
+        '''
+        row = frame_rows(pd.DataFrame([dict(event)]), EVENT_COLUMNS)[0]
+        self._append({'op': 'update', 'position': int(position), 'event': dict(zip(EVENT_COLUMNS, row))})
+
+    def delete_event(self, position):
+        '''
+        Journals the deletion of the event at a row position.
+
+        Args:
+            position (int): Row position, as in the dataframe returned by read.
 
         Returns:
             None
+        '''
+        self._append({'op': 'delete', 'position': int(position)})
 
-        Raises:
-            None: All exceptions are handled internally. A ValueError is caught and an error message
-            is displayed if any of the input fields are invalid, empty, or if tables and participants
-            are not greater than zero.
-
-        UI Feedback:
-            - Displays a success message if the data is saved successfully.
-            - Displays an error message if input validation fails or if the data cannot be saved.
-
-        """
-        date = self.dateEdit.text()
-        name = self.nameEdit.text()
-        address = self.addressEdit.text()
-        city = self.cityEdit.text()
-        plzCode = self.plzEdit.text()
-        state = self.stateCombo.currentText()
-        tables = self.tableEdit.text()
-        participants = self.participantEdit.text()
+    def replace_city_stats(self, city, df_city):
+        '''
+        Journals the new Stats rows of one city.
 
-        try:
-            # Validate that all required fields are filled
-            if not date or not name or not address or not city or not plzCode or not state or not tables or not participants:
-                raise ValueError("All fields must be filled in.")
-
-            # Convert tables and participants to integers and check if they are greater than zero
-            tables_int = int(tables)
-            participants_int = int(participants)
-
-            if tables_int <= 0 or participants_int <= 0:
-                raise ValueError("Tables and participants must be greater than zero.")
-
-            # Get coordinates and update the Excel file
-            latitude, longitude = self.get_coordinates(city, state, plzCode, address)
-            successFlag = self.update_excel(
-                self.excelFilePath,
-                date,
-                name,
-                address,
-                city,
-                state,
-                plzCode,
-                latitude,
-                longitude,
-                tables_int,
-                participants_int
-            )
-            df_events, df_stats = self.read_excel_file(self.excelFilePath)
-            self.recalculateStatistics(df_events, df_stats)
-
-            if not successFlag:
-                self.create_msg_box('Input Failed!',
-                                    'Data not saved.\n\nPlease check that the Excel file is not open and try again.',
-                                    'warning')
-            else:
-                self.create_msg_box('Input Successful!',
-                                    'Data saved successfully!\n\nClick on "Update Plot" to see the changes.')
-                # Clear inputs
-                self.clearAll()
+        Args:
+            city (str): The city.
+            df_city (pd.DataFrame): The new Stats rows of the city.
 
-        except ValueError as e:
-            # Display an error message if any validation fails
-            self.create_msg_box('Input Error', f'{str(e)}\n\nData not saved.', 'warning')
+        Returns:
+            None
+        '''
+        self._append({'op': 'stats', 'city': city, 'rows': frame_rows(df_city, STATS_COLUMNS)})
 
-    def getPlotItem(self):
-        """
-       Retrieves the plot item from the DataFrame based on the currently selected item in the plot list widget.
+    def _write_snapshot(self, df_events, df_stats, sequence):
+        temp_path = os.path.splitext(self.file_path)[0] + '.tmp.xlsx'
+        try:
+            with pd.ExcelWriter(temp_path) as writer:
+                df_events.to_excel(writer, sheet_name='Events', index=False)
+                df_stats.to_excel(writer, sheet_name='Stats', index=False)
+                writer.book.properties.identifier = f'{self.SEQUENCE_PREFIX}{sequence}'
+            os.replace(temp_path, self.file_path)
+            return True
+        except WORKBOOK_ERRORS:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
 
-       This method searches the `df_views` DataFrame for a row where the 'View' column matches the text of the currently
-       selected item in the `plotListWidget`. If a matching entry is found, the first row of that entry is returned.
+    def _drop_journal(self, sequence):
+        # Keeps the lines journaled after the snapshot, rewritten through a temporary file like the workbook
+        with self._lock:
+            try:
+                with open(self.journal_path, encoding='utf-8') as f:
+                    lines = f.readlines()
+            except FileNotFoundError:
+                return
+            kept = []
+            for line in lines:
+                try:
+                    if json.loads(line)['seq'] > sequence:
+                        kept.append(line if line.endswith('\n') else line + '\n')
+                except json.JSONDecodeError:
+                    continue
+            if not kept:
+                os.remove(self.journal_path)
+                return
+            temp_path = self.journal_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.writelines(kept)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.journal_path)
 
-       Args:
-           None
+    def write(self, df_events, df_stats):
+        '''
+        Writes the Events and Stats sheets as a new snapshot and empties the journal. The workbook is written to a
+        temporary file first and then renamed, so a crash never leaves a partial workbook behind.
 
-       Returns:
-           pd.Series: The first row of the matching entry as a Pandas Series if found, otherwise an empty Series.
-       """
-        entry = self.df_views.loc[self.df_views['View'] == self.plotListWidget.currentItem().text()]
-        if not entry.empty:
-            entry = entry.iloc[0]  # Select the first row
-        return entry
+        Args:
+            df_events (pd.DataFrame): Events dataframe, including every change journaled so far.
+            df_stats (pd.DataFrame): Stats dataframe.
 
-    def onPlotButtonClicked(self, doSave=False):
-        """
-        Handles the event of the Plot Update button being clicked.
+        Returns:
+            bool: True if the write succeeded.
+        '''
+        with self._write_lock:
+            with self._lock:
+                if self._sequence is None:
+                    self._next_sequence()
+                sequence = self._sequence
+            if not self._write_snapshot(df_events, df_stats, sequence):
+                return False
+            self._drop_journal(sequence)
+            return True
 
-        Reads the events and stats out of the ClimatePlotter excel document, retrieves the desired view from
-        the views widget, then sends the information to the plot_map function.
+    def compact(self):
+        '''
+        Merges the journal into the workbook. The journal lines are read under the lock, the workbook is rewritten
+        without it, and only the merged lines are then dropped from the journal, so changes journaled during the
+        rewrite are kept. The journal is kept if the workbook cannot be read or written, for example while it is
+        open in Excel.
 
         Args:
             None
 
         Returns:
+            bool: True if the journal was compacted or was already empty.
+        '''
+        with self._write_lock:
+            with self._lock:
+                entries = self._read_journal()
+            if not entries:
+                return True
+            try:
+                df_events, df_stats, sequence = self._read_snapshot()
+            except WORKBOOK_ERRORS:
+                return False
+            for entry in entries:
+                if entry['seq'] > sequence:
+                    df_events, df_stats = self._apply(df_events, df_stats, entry)
+            sequence = max([sequence] + [entry['seq'] for entry in entries])
+            if not self._write_snapshot(df_events, df_stats, sequence):
+                return False
+            self._drop_journal(sequence)
+            return True
+
+
+class ViewRecord:
+    '''
+    A saved map view: its name, the centre and the bounding box of the map, in the column order of the Views table.
+
+    Attributes:
+        name (str): Name of the view, ex: "Deutschland" or a city.
+        lat_0 (float): Latitude of the centre.
+        lon_0 (float): Longitude of the centre.
+        llcrnrlon (float): Longitude - Lower left corner of view window
+        llcrnrlat (float): Latitude - Lower left corner of view window
+        urcrnrlon (float): Longitude - Upper right corner of view window
+        urcrnrlat (float): Latitude - Upper right corner of view window
+    '''
+    __slots__ = ('name', 'lat_0', 'lon_0', 'llcrnrlon', 'llcrnrlat', 'urcrnrlon', 'urcrnrlat')
+
+    def __init__(self, name, lat_0, lon_0, llcrnrlon, llcrnrlat, urcrnrlon, urcrnrlat):
+        self.name = str(name)
+        self.lat_0 = float(lat_0)
+        self.lon_0 = float(lon_0)
+        self.llcrnrlon = float(llcrnrlon)
+        self.llcrnrlat = float(llcrnrlat)
+        self.urcrnrlon = float(urcrnrlon)
+        self.urcrnrlat = float(urcrnrlat)
+
+    @classmethod
+    def from_row(cls, row):
+        '''
+        Builds a record from a row of the Views table.
+
+        Args:
+            row (dict or pd.Series): Values keyed by VIEW_COLUMNS.
+
+        Returns:
+            ViewRecord: The record.
+        '''
+        return cls(*(row[column] for column in VIEW_COLUMNS))
+
+    def to_row(self):
+        '''
+        Returns the record as a row of the Views table.
+
+        Args:
             None
 
-        """
-        df_events, df_stats = self.read_excel_file(self.excelFilePath)
-        plotItem = self.getPlotItem()
-        self.plot_map(
-            df_events,
-            df_stats,
-            self.plotPath,
-            self.canvas,
-            plotItem['lat_0'],
-            plotItem['lon_0'],
-            plotItem['llcrnrlat'],
-            plotItem['llcrnrlon'],
-            plotItem['urcrnrlat'],
-            plotItem['urcrnrlon'],
-            plotItem['View'],
-            doSave
-        )
-
-    def setupPlotListWidget(self):
-        """
-        Initialize the UI of the plot view widget on the right hand side of the program.
+        Returns:
+            dict: Values keyed by VIEW_COLUMNS.
+        '''
+        return dict(zip(VIEW_COLUMNS, self._values()))
+
+    def _values(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, ViewRecord) and self._values() == other._values()
+
+    def __repr__(self):
+        return f'ViewRecord{self._values()!r}'
+
+    @property
+    def bbox(self):
+        '''
+        tuple of float: llcrnrlat, llcrnrlon, urcrnrlat, urcrnrlon, the order the map functions take them in.
+        '''
+        return self.llcrnrlat, self.llcrnrlon, self.urcrnrlat, self.urcrnrlon
+
+
+class ViewRegistry:
+    '''
+    The saved map views, keyed by name. Names are unique; if the Views table lists a name twice, the first entry
+    wins, as in the view list. The bounding boxes are also kept as arrays, so finding the views that contain a
+    point or a box is one vectorized comparison, for example to find the views a change of the Stats affects.
+
+    Changes are written to the store only if a record actually changed, as one transaction replacing the Views
+    table, so the table never holds a partial update. export writes the Views workbook to a temporary file and
+    renames it over the old one.
+
+    Attributes:
+        store (SqliteStore): The store holding the Views table.
+    '''
+    def __init__(self, store):
+        self.store = store
+        self._records = OrderedDict()
+        self._boxes = None
+        self.load()
+
+    def load(self):
+        '''
+        Reads the views from the store.
 
         Args:
             None
 
         Returns:
             None
+        '''
+        self._records = OrderedDict()
+        for row in self.store.read_views().to_dict('records'):
+            self._records.setdefault(str(row['View']), ViewRecord.from_row(row))
+        self._boxes = None
+
+    def __len__(self):
+        return len(self._records)
 
-        """
-        self.plotListWidget.clear()
-        self.plotListWidget.addItems(self.df_views['View'].tolist())
-        self.plotListWidget.setCurrentRow(0)
+    def __contains__(self, name):
+        return name in self._records
 
-    def onplotListWidgetClicked(self):
-        """
-        Handles the event of an item in the Views list being clicked upon.
+    def __iter__(self):
+        return iter(self._records.values())
 
-        Gets the data of the selected view and updates the text fields to match.
+    def names(self):
+        '''
+        Returns the view names in their saved order.
 
         Args:
             None
 
         Returns:
-            None
+            list of str: The names.
+        '''
+        return list(self._records)
+
+    def get(self, name):
+        '''
+        Looks up a view by name.
+
+        Args:
+            name (str): Name of the view.
+
+        Returns:
+            ViewRecord or None: The view, or None if there is no view of that name.
+        '''
+        return self._records.get(name)
+
+    def set(self, record):
+        '''
+        Adds a view, or replaces the view of the same name in place. Nothing is written if the view is unchanged.
+
+        Args:
+            record (ViewRecord): The view.
+
+        Returns:
+            bool: True if the views changed.
+        '''
+        if self._records.get(record.name) == record:
+            return False
+        self._records[record.name] = record
+        self._save()
+        return True
+
+    def remove(self, name):
+        '''
+        Removes a view.
+
+        Args:
+            name (str): Name of the view.
+
+        Returns:
+            bool: True if the view existed.
+        '''
+        if self._records.pop(name, None) is None:
+            return False
+        self._save()
+        return True
 
-        """
-        entry = self.getPlotItem()
-        self.viewName.setText(entry['View'])
-        self.viewLat.setText(str(entry['lat_0']))
-        self.viewLon.setText(str(entry['lon_0']))
-        self.viewLLCLat.setText(str(entry['llcrnrlat']))
-        self.viewLLCLon.setText(str(entry['llcrnrlon']))
-        self.viewURCLat.setText(str(entry['urcrnrlat']))
-        self.viewURCLon.setText(str(entry['urcrnrlon']))
+    def _save(self):
+        self._boxes = None
+        self.store.write_views(self.to_frame())
 
-    def ClearViewText(self):
-        """
-        Clears the text fields associated with the Views.
+    def to_frame(self):
+        '''
+        Returns the views as a Views dataframe.
 
         Args:
             None
 
+        Returns:
+            pd.DataFrame: One row per view with the VIEW_COLUMNS.
+        '''
+        return pd.DataFrame([record.to_row() for record in self], columns=VIEW_COLUMNS)
+
+    def export(self, file_path):
+        '''
+        Writes the views to an excel document, replacing it only once the new file is complete.
+
+        Args:
+            file_path (str): Path of the Views excel document.
+
         Returns:
             None
+        '''
+        temp_path = f'{os.path.splitext(file_path)[0]}.tmp.xlsx'
+        try:
+            self.to_frame().to_excel(temp_path, index=False)
+            os.replace(temp_path, file_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _bounding_boxes(self):
+        if self._boxes is None:
+            self._boxes = np.array([record.bbox for record in self], dtype=float).reshape(-1, 4)
+        return self._boxes
+
+    def containing_box(self, llc_lat, llc_lon, urc_lat, urc_lon):
+        '''
+        Finds the views whose bounding box contains a box completely.
+
+        Args:
+            llc_lat (float): Latitude - Lower left corner of the box
+            llc_lon (float): Longitude - Lower left corner of the box
+            urc_lat (float): Latitude - Upper right corner of the box
+            urc_lon (float): Longitude - Upper right corner of the box
+
+        Returns:
+            list of str: Names of the views, in their saved order.
+        '''
+        boxes = self._bounding_boxes()
+        inside = ((boxes[:, 0] <= llc_lat) & (boxes[:, 1] <= llc_lon)
+                  & (boxes[:, 2] >= urc_lat) & (boxes[:, 3] >= urc_lon))
+        names = self.names()
+        return [names[i] for i in np.flatnonzero(inside)]
+
+    def containing(self, lat, lon):
+        '''
+        Finds the views whose bounding box contains a point.
+
+        Args:
+            lat (float): Latitude of the point.
+            lon (float): Longitude of the point.
+
+        Returns:
+            list of str: Names of the views, in their saved order.
+        '''
+        return self.containing_box(lat, lon, lat, lon)
+
+
+class DataModel:
+    '''
+    In-memory Events and Stats shared by the app. Every read path uses the frames held here instead of querying the
+    store again, and they are only reloaded when the database file changed on disk, for example because another
+    instance or the headless renderer wrote to it. A change is detected by the file's mtime and size and confirmed
+    by its hash, so touching the file without changing it does not cause a reload.
+
+    Mutations only change the frames and mark the model dirty. They are written to the store when flush is called:
+    event inserts, edits and deletes row by row and the Stats rows of the touched cities, or both tables as a
+    whole after replace. Unflushed changes take precedence over changes on disk. The same changes are written to
+    the mirror, if given; a mirror that could not be written is rewritten as a whole by the next flush.
+
+    Alongside the frames the model counts the event_key of every event, loaded from the keys stored with the
+    events, so checking an event for duplicates does not scan df_events.
+
+    df_events is indexed by the row id of each event in the store, so edits and deletes are written through the
+    primary key. New events are given the next free id; after the tables were replaced as a whole, the ids are
+    read back from the store. The mirror has no ids and is addressed by row position instead.
+
+    Attributes:
+        store (SqliteStore): The store the model loads from and flushes to.
+        mirror (ExcelStore): Optional second store that receives every flushed change, such as the journaled
+            workbook.
+        df_events (pd.DataFrame): Events dataframe, indexed by row id. Treat as read-only and mutate through the
+            model.
+        df_stats (pd.DataFrame): Stats dataframe. Treat as read-only and mutate through the model.
+        dirty (bool): True if there are changes that have not been flushed.
+        event_keys (Counter): Number of events per event_key. Treat as read-only.
+
+    The locations of df_stats are indexed by a GridIndex and clustered by a ClusterLayer, both built on first use
+    after each change of the Stats.
+    '''
+    def __init__(self, store, mirror=None):
+        self.store = store
+        self.mirror = mirror
+        self.df_events = None
+        self.df_stats = None
+        self.event_keys = Counter()
+        self._statsIndex = None
+        self._statsClusters = None
+        self.dirty = False
+        self._pending = []
+        self._cities = set()
+        self._replaced = False
+        self._signature = None
+        self._digest = None
+        self._mirror_stale = mirror is not None and not mirror.exists()
+        self.load()
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.store.file_path)
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
 
-        """
-        self.viewName.clear()
-        self.viewLat.clear()
-        self.viewLon.clear()
-        self.viewLLCLat.clear()
-        self.viewLLCLon.clear()
-        self.viewURCLat.clear()
-        self.viewURCLon.clear()
+    def _file_digest(self):
+        digest = hashlib.sha1()
+        try:
+            with open(self.store.file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            return None
+        return digest.hexdigest()
 
-    def onPreViewButtonClicked(self):
-        """
-        Handles the event when the 'Pre-View' button is clicked.
+    def _mark_clean(self):
+        self.dirty = False
+        self._pending = []
+        self._cities = set()
+        self._replaced = False
+        self._signature = self._file_signature()
+        self._digest = self._file_digest()
 
-        This method validates and converts the input fields required for plotting. It checks that all necessary
-        fields (latitude, longitude, lower-left corner, upper-right corner coordinates, and view name) are filled
-        and correctly formatted as floats. If any validation fails, an error message is displayed. If all inputs
-        are valid, it proceeds to plot the map using the provided data.
+    def load(self):
+        '''
+        Reads the Events and Stats tables from the store, discarding unflushed changes.
 
         Args:
             None
 
         Returns:
             None
+        '''
+        self.df_events, self.df_stats = self.store.read()
+        self.event_keys = Counter(self.store.read_event_keys())
+        self._statsIndex = None
+        self._statsClusters = None
+        self._mark_clean()
 
-        Raises:
-            None: All exceptions are handled internally. A ValueError is caught and an error message is displayed
-            if any input conversion fails or if the view name is empty.
+    def refresh(self):
+        '''
+        Reloads the frames if the database file changed on disk since the last load or flush.
 
-        UI Feedback:
-            - Displays an error message if input validation fails, indicating the specific issue.
-        """
-        try:
-            # Convert input text to floats
-            lat = float(self.viewLat.text())
-            lon = float(self.viewLon.text())
-            llc_lat = float(self.viewLLCLat.text())
-            llc_lon = float(self.viewLLCLon.text())
-            urc_lat = float(self.viewURCLat.text())
-            urc_lon = float(self.viewURCLon.text())
-            view_name = self.viewName.text()
-
-            # Check if any field is empty after conversion
-            if view_name == '':
-                raise ValueError("View name cannot be empty.")
-
-            # If all conversions succeed, proceed with plotting
-            df_events, df_stats = self.read_excel_file(self.excelFilePath)
-            self.plot_map(
-                df_events,
-                df_stats,
-                self.plotPath,
-                self.canvas,
-                lat,
-                lon,
-                llc_lat,
-                llc_lon,
-                urc_lat,
-                urc_lon,
-                view_name,
-                doSave=False
-            )
-
-        except ValueError as e:
-            # Display an error message if there's a problem with conversion or an empty field
-            self.create_msg_box('Input Error', f'Invalid input: {str(e)}\n\nPlease correct the input and try again.',
-                                'warning')
-
-    def onCityLookupButtonClicked(self):
-        """
-        Handles the event when the 'City Lookup' button is clicked.
-
-        This method performs a lookup for the city and state combination entered by the user. It retrieves the
-        corresponding address information using the `get_address` method and populates the relevant fields
-        (view name, latitude, longitude, and bounding box coordinates) in the UI. If no address is found, an
-        error message is displayed. If the address is found, the method automatically triggers a preview of the
-        view by calling `onPreViewButtonClicked`.
+        Args:
+            None
+
+        Returns:
+            bool: True if the frames were reloaded.
+        '''
+        if self.dirty:
+            return False
+        signature = self._file_signature()
+        if signature == self._signature:
+            return False
+        digest = self._file_digest()
+        if digest == self._digest:
+            self._signature = signature
+            return False
+        self.load()
+        return True
+
+    def read(self):
+        '''
+        Returns the current Events and Stats frames, reloading them first if the file changed on disk.
 
         Args:
             None
 
         Returns:
+            pd.Dataframe, pd.Dataframe: Events dataframe, Stats dataframe
+        '''
+        self.refresh()
+        return self.df_events, self.df_stats
+
+    def stats_index(self):
+        '''
+        Returns the spatial index of the current Stats locations, reloading the frames first if the file changed
+        on disk.
+
+        Args:
             None
 
-        Raises:
-            None: All exceptions are handled internally. An `AddressError` is caught and an error message is displayed
-            if no address is found or if there is an issue with the address lookup.
+        Returns:
+            GridIndex: Index whose point numbers are row positions in df_stats.
+        '''
+        self.refresh()
+        if self._statsIndex is None:
+            self._statsIndex = GridIndex.from_stats(self.df_stats)
+        return self._statsIndex
 
-        UI Feedback:
-            - Populates the UI fields with the retrieved address information if successful.
-            - Displays an error message if the address lookup fails.
-        """
-        try:
-            raw_address = self.get_address(self.cityName.text() + ', ' + self.stateLookupCombo.currentText())
-            if raw_address == None:
-                raise AddressError('No address found')
-            self.viewName.setText(raw_address['name'])
-            self.viewLat.setText(str(raw_address['lat']))
-            self.viewLon.setText(str(raw_address['lon']))
-            self.viewLLCLat.setText(str(raw_address['boundingbox'][0]))
-            self.viewLLCLon.setText(str(raw_address['boundingbox'][2]))
-            self.viewURCLat.setText(str(raw_address['boundingbox'][1]))
-            self.viewURCLon.setText(str(raw_address['boundingbox'][3]))
-            self.onPreViewButtonClicked()
-            # return
-        except AddressError as e:
-            self.create_msg_box("Address Error",
-                                f"Error: {str(e)} \n\n"
-                                f"Check that you have selected the correct state where the city is.",
-                                'warning')
-            return
+    def stats_clusters(self):
+        '''
+        Returns the cluster layer of the current Stats locations, reloading the frames first if the file changed
+        on disk. Its zoom levels are kept until the Stats change.
 
+        Args:
+            None
+
+        Returns:
+            ClusterLayer: Clusters of df_stats.
+        '''
+        self.refresh()
+        if self._statsClusters is None:
+            self._statsClusters = ClusterLayer(self.df_stats)
+        return self._statsClusters
+
+    def contains_event(self, event):
+        '''
+        Checks whether an event with the same event_key is already stored.
+
+        Args:
+            event (pd.Series or dict): Values keyed by Events column.
+
+        Returns:
+            bool: True if the event is a duplicate.
+        '''
+        self.refresh()
+        return self.event_keys[event_key(event)] > 0
 
-    def onViewAddButtonClicked(self):
-        """
-        Handles the event when the 'Add View' button is clicked.
+    def find_duplicates(self):
+        '''
+        Groups the events that share an event_key. Only the keys counted more than once are looked up in df_events.
+
+        Args:
+            None
 
-        This method validates the input fields for adding or updating a view configuration. It checks that all
-        necessary fields (latitude, longitude, lower-left corner, upper-right corner coordinates, and view name)
-        are filled. If any field is empty, an error message is displayed. If all inputs are valid, the method
-        checks if the view name already exists in the `df_views` DataFrame:
+        Returns:
+            list of list of int: Row ids of each group of duplicates, in order of first occurrence.
+        '''
+        self.refresh()
+        duplicated = {key for key, count in self.event_keys.items() if count > 1}
+        if not duplicated:
+            return []
+        groups = OrderedDict()
+        for event_id, row in zip(self.df_events.index, self.df_events.to_dict('records')):
+            key = event_key(row)
+            if key in duplicated:
+                groups.setdefault(key, []).append(event_id)
+        return list(groups.values())
 
-        - If the view exists, the existing entry is updated with the new coordinates.
-        - If the view does not exist, a new entry is added to the DataFrame.
+    def _next_event_ids(self, count):
+        start = int(self.df_events.index.max()) + 1 if not self.df_events.empty else 1
+        return list(range(start, start + count))
 
-        The updated DataFrame is then saved to an Excel file, and the view list widget is refreshed to reflect the changes.
+    def add_event(self, event):
+        '''
+        Appends an event.
 
         Args:
+            event (pd.Series): Values keyed by Events column.
+
+        Returns:
             None
+        '''
+        self.refresh()
+        event_id = self._next_event_ids(1)[0]
+        row = pd.DataFrame([event.reindex(EVENT_COLUMNS)], index=[event_id])
+        self.df_events = row if self.df_events.empty else pd.concat([self.df_events, row])
+        self.event_keys[event_key(event)] += 1
+        self._pending.append(('insert', event, event_id))
+        self.dirty = True
+
+    def add_events(self, df_new):
+        '''
+        Appends many events at once.
+
+        Args:
+            df_new (pd.DataFrame): The events, with the Events columns.
 
         Returns:
             None
+        '''
+        self.refresh()
+        df_new = df_new.reindex(columns=EVENT_COLUMNS).set_axis(self._next_event_ids(len(df_new)))
+        self.df_events = df_new if self.df_events.empty else pd.concat([self.df_events, df_new])
+        self.event_keys.update(event_key(row) for row in df_new.to_dict('records'))
+        self._pending.append(('insert_many', df_new, list(df_new.index)))
+        self.dirty = True
 
-        Raises:
-            None: All exceptions are handled internally. An error message is displayed if any input field is empty.
-
-        UI Feedback:
-            - Displays a success message if the view is successfully added or updated.
-            - Displays an error message if any input field is empty.
-        """
-        lat = self.viewLat.text()
-        lon = self.viewLon.text()
-        llc_lat = self.viewLLCLat.text()
-        llc_lon = self.viewLLCLon.text()
-        urc_lat = self.viewURCLat.text()
-        urc_lon = self.viewURCLon.text()
-        view_name = self.viewName.text()
-        if lat == '' or lon == '' or llc_lat == '' or llc_lon == '' or urc_lat == '' or urc_lon == '' or view_name == '':
-            self.create_msg_box('Input Empty!', 'Fill in all the fields!\n\nData not saved.', 'warning')
-        else:
-            view_exists = ((self.df_views['View'] == view_name)).any().any()
-            if view_exists:
-                self.df_views.loc[self.df_views['View'] == view_name, 'lat_0'] = float(lat)
-                self.df_views.loc[self.df_views['View'] == view_name, 'lon_0'] = float(lon)
-                self.df_views.loc[self.df_views['View'] == view_name, 'llcrnrlat'] = float(llc_lat)
-                self.df_views.loc[self.df_views['View'] == view_name, 'llcrnrlon'] = float(llc_lon)
-                self.df_views.loc[self.df_views['View'] == view_name, 'urcrnrlat'] = float(urc_lat)
-                self.df_views.loc[self.df_views['View'] == view_name, 'urcrnrlon'] = float(urc_lon)
-                self.df_views.to_excel(self.viewsFilePath, index=False)
-                self.setupPlotListWidget()
-                self.ClearViewText()
-                self.create_msg_box('Input Successful!',
-                                    'View updated successfully')
-            else:
-                self.df_views.loc[len(self.df_views.index) + 1] = [view_name, float(lat), float(lon), float(llc_lon),
-                                                                   float(llc_lat), float(urc_lon), float(urc_lat)]
-                self.df_views.to_excel(self.viewsFilePath, index=False)
-                self.setupPlotListWidget()
-                self.ClearViewText()
-                self.create_msg_box('Input Successful!',
-                                    'View saved successfully')
+    def update_event(self, event_id, event):
+        '''
+        Overwrites an event.
+
+        Args:
+            event_id (int): Row id of the event, its label in the index of df_events.
+            event (pd.Series): New values keyed by Events column.
 
-    def onViewRemoveButtonClicked(self):
-        """
-        Handles the event when the 'Remove View' button is clicked.
+        Returns:
+            None
+        '''
+        self.refresh()
+        position = self.df_events.index.get_loc(event_id)
+        self.event_keys[event_key(self.df_events.iloc[position])] -= 1
+        self.event_keys[event_key(event)] += 1
+        self.df_events = self.df_events.copy()
+        self.df_events.iloc[position] = event.reindex(self.df_events.columns)
+        self._pending.append(('update', event_id, position, event))
+        self.dirty = True
 
-        This method removes the selected view from the `df_views` DataFrame, except for default views such as
-        'Deutschland' and any views listed in `stateList`. If an attempt is made to remove a default view, an
-        error message is displayed, and the removal is aborted. If the selected view is successfully removed,
-        the DataFrame is updated, saved to an Excel file, and the plot list widget is refreshed. The input fields
-        are cleared, and a success message is displayed.
+    def delete_event(self, event_id):
+        '''
+        Deletes an event.
 
         Args:
+            event_id (int): Row id of the event, its label in the index of df_events.
+
+        Returns:
             None
+        '''
+        self.refresh()
+        position = self.df_events.index.get_loc(event_id)
+        self.event_keys[event_key(self.df_events.iloc[position])] -= 1
+        self.df_events = self.df_events.drop(event_id)
+        self._pending.append(('delete', event_id, position))
+        self.dirty = True
+
+    def set_city_stats(self, city, df_city):
+        '''
+        Replaces the Stats rows of one city.
+
+        Args:
+            city (str): The city.
+            df_city (pd.DataFrame): The new Stats rows of the city.
 
         Returns:
             None
+        '''
+        self.refresh()
+        df_others = self.df_stats[self.df_stats['Stadt'] != city]
+        frames = [df for df in (df_others, df_city) if not df.empty]
+        self.df_stats = pd.concat(frames, ignore_index=True) if frames else df_city.reset_index(drop=True)
+        self._statsIndex = None
+        self._statsClusters = None
+        self._cities.add(city)
+        self.dirty = True
 
-        Raises:
-            None: All exceptions are handled internally. An error message is displayed if the user tries to remove
-            a default view.
-
-        UI Feedback:
-            - Displays a success message if the view is removed successfully.
-            - Displays an error message if the user attempts to remove a default view.
-        """
-        entry = self.plotListWidget.currentItem().text()
-        if entry == 'Deutschland' or entry in self.stateList:
-            self.create_msg_box('Error',
-                                'Cannot remove default views',
-                                'warning')
-            return
-        else:
-            self.df_views = self.df_views[self.df_views.View != entry]
-            self.df_views.to_excel(self.viewsFilePath, index=False)
-            self.setupPlotListWidget()
-            self.ClearViewText()
-            self.create_msg_box('Success',
-                                'View removed successfully')
+    def replace(self, df_events, df_stats):
+        '''
+        Replaces both frames, for example after a recalculation or an import.
 
+        Args:
+            df_events (pd.DataFrame): Events dataframe.
+            df_stats (pd.DataFrame): Stats dataframe.
 
-def run_app():
-    app = QApplication([])
-    mainWin = LectureMapApp()
-    mainWin.show()
-    sys.exit(app.exec())
+        Returns:
+            None
+        '''
+        self.df_events = df_events.reset_index(drop=True)
+        self.df_stats = df_stats.reset_index(drop=True)
+        self.event_keys = Counter(event_key(row) for row in self.df_events.to_dict('records'))
+        self._statsIndex = None
+        self._statsClusters = None
+        self._replaced = True
+        self.dirty = True
+
+    def flush(self):
+        '''
+        Writes the unflushed changes to the store. If the write fails the changes are kept, and the next flush
+        writes both tables as a whole.
+
+        Args:
+            None
+
+        Returns:
+            bool: True if the write succeeded or there was nothing to write.
+        '''
+        if not self.dirty:
+            return True
+        try:
+            self._write_changes(self.store, self._replaced)
+            if self._replaced:
+                self.df_events = self.df_events.set_axis(self.store.read_event_ids())
+        except (sqlite3.Error, OSError, IndexError):
+            self._replaced = True
+            return False
+        if self.mirror is not None:
+            try:
+                self._write_changes(self.mirror, self._replaced or self._mirror_stale)
+                self._mirror_stale = False
+            except WORKBOOK_ERRORS:
+                self._mirror_stale = True
+        self._mark_clean()
+        return True
+
+    def _write_changes(self, store, replace):
+        if replace:
+            if not store.write(self.df_events, self.df_stats):
+                raise OSError('could not replace the tables')
+            return
+        # The database addresses events by row id, the workbook by row position
+        by_id = store is self.store
+        for operation in self._pending:
+            if operation[0] == 'insert':
+                event, event_id = operation[1:]
+                if by_id:
+                    store.insert_event(event, event_id)
+                else:
+                    store.insert_event(event)
+            elif operation[0] == 'insert_many':
+                df_new, event_ids = operation[1:]
+                if by_id:
+                    store.insert_events(df_new, event_ids)
+                else:
+                    store.insert_events(df_new)
+            elif operation[0] == 'update':
+                event_id, position, event = operation[1:]
+                store.update_event(event_id if by_id else position, event)
+            else:
+                event_id, position = operation[1:]
+                store.delete_event(event_id if by_id else position)
+        for city in self._cities:
+            store.replace_city_stats(city, self.df_stats[self.df_stats['Stadt'] == city])
+
+
+class RateLimiter:
+    '''
+    Thread safe limiter that spaces calls at least 1 / requests_per_second seconds apart.
+
+    Attributes:
+        interval (float): Minimum time between two calls in seconds.
+    '''
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        '''
+        Blocks until the next call is allowed.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class BatchGeocoder:
+    '''
+    Resolves many Nominatim queries concurrently on a thread pool while respecting a requests per second limit.
+
+    Queries are deduplicated on their normalized form, so identical queries share a single in-flight request.
+    Cached results are returned without touching the network and new results are written to the geocode cache,
+    where get_address and get_coordinates will find them.
+
+    Attributes:
+        cache (GeocodeCache): Cache consulted before and filled after each lookup.
+        rateLimiter (RateLimiter): Limiter shared by all worker threads.
+    '''
+    def __init__(self, cache, requests_per_second=1.0, max_workers=4):
+        self.cache = cache
+        self.rateLimiter = RateLimiter(requests_per_second)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='geocode')
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _fetch(self, kind, query):
+        '''
+        Runs a single rate limited Nominatim lookup on a worker thread and caches the result.
+
+        Args:
+            kind (str): 'address' for a get_address style lookup, 'coordinates' for a get_coordinates style lookup.
+            query (str): Search string.
+
+        Returns:
+            dict or list or None: Raw location dict, [lat, lon], or None if nothing was found.
+        '''
+        if not hasattr(self._local, 'geolocator'):
+            self._local.geolocator = Nominatim(user_agent="http")
+        self.rateLimiter.wait()
+        try:
+            if kind == 'address':
+                location = self._local.geolocator.geocode(query, country_codes="de", addressdetails=True)
+                value = location.raw if location is not None else None
+            else:
+                location = self._local.geolocator.geocode(query)
+                value = [location.latitude, location.longitude] if location is not None else None
+        except GeopyError:
+            value = None
+        if value is not None:
+            self.cache.put(kind, query, value)
+        return value
+
+    def submit(self, kind, query):
+        '''
+        Schedules a lookup, reusing the cached result or an identical request that is already in flight.
+
+        Args:
+            kind (str): 'address' or 'coordinates'.
+            query (str): Search string.
+
+        Returns:
+            concurrent.futures.Future: Future resolving to the lookup result.
+        '''
+        key = (kind, GeocodeCache.normalize_query(query))
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            value = self.cache.get(kind, query)
+            if value is not None:
+                future = Future()
+                future.set_result(value)
+            else:
+                future = self._executor.submit(self._fetch, kind, query)
+            self._inflight[key] = future
+        future.add_done_callback(lambda done: self._release(key, done))
+        return future
+
+    def _release(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def resolve(self, queries, progress=None):
+        '''
+        Resolves a batch of queries concurrently and waits for all of them.
+
+        Args:
+            queries (iterable of (str, str)): (kind, query) pairs, duplicates are allowed.
+            progress (callable, optional): Called as progress(done, total) in the calling thread after each
+                unique query finishes. Returning False stops waiting for the remaining queries.
+
+        Returns:
+            dict: Maps each (kind, query) pair to its result, or None if nothing was found.
+        '''
+        futures = {}
+        for kind, query in queries:
+            if (kind, query) not in futures:
+                futures[(kind, query)] = self.submit(kind, query)
+        unique = set(futures.values())
+        done = 0
+        for _ in as_completed(unique):
+            done += 1
+            if progress is not None and progress(done, len(unique)) is False:
+                break
+        return {key: future.result() if future.done() and not future.cancelled() and future.exception() is None
+                else None
+                for key, future in futures.items()}
+
+    def shutdown(self):
+        '''
+        Stops the worker threads, cancelling lookups that have not started.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class GridIndex:
+    '''
+    Uniform latitude/longitude grid over points for bounding box queries.
+
+    Every point is filed under its cell number row * columns + column and the points are kept sorted by cell, so
+    the cells of one grid row inside a box are a single contiguous slice. A box query costs one binary search
+    per grid row it covers plus an exact check of the points in the border cells, all vectorized, which keeps
+    large boxes such as the Deutschland view cheap. Points without coordinates are left out.
+
+    Attributes:
+        lats (np.ndarray): Latitudes of the indexed points.
+        lons (np.ndarray): Longitudes of the indexed points.
+        cellSize (float): Edge length of a grid cell in degrees.
+    '''
+    def __init__(self, lats, lons, cell_size=0.1):
+        self.lats = pd.to_numeric(pd.Series(lats), errors='coerce').to_numpy(dtype=float)
+        self.lons = pd.to_numeric(pd.Series(lons), errors='coerce').to_numpy(dtype=float)
+        self.cellSize = cell_size
+        valid = np.flatnonzero(np.isfinite(self.lats) & np.isfinite(self.lons))
+        self._origin = (self.lats[valid].min(), self.lons[valid].min()) if len(valid) else (0.0, 0.0)
+        rows, columns = self._cells(self.lats[valid], self.lons[valid])
+        self._rows = int(rows.max()) + 1 if len(valid) else 0
+        self._columns = int(columns.max()) + 1 if len(valid) else 0
+        keys = rows * self._columns + columns
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        self._order = valid[order]
+
+    @classmethod
+    def from_stats(cls, df_stats):
+        '''
+        Indexes the locations of a Stats frame.
+
+        Args:
+            df_stats (pd.DataFrame): Stats dataframe.
+
+        Returns:
+            GridIndex: Index whose point numbers are row positions in df_stats.
+        '''
+        return cls(df_stats['Latitude'], df_stats['Longitude'])
+
+    def __len__(self):
+        return len(self._order)
+
+    def _cells(self, lats, lons):
+        rows = np.floor((np.asarray(lats, dtype=float) - self._origin[0]) / self.cellSize).astype(np.int64)
+        columns = np.floor((np.asarray(lons, dtype=float) - self._origin[1]) / self.cellSize).astype(np.int64)
+        return rows, columns
+
+    def query_box(self, llc_lat, llc_lon, urc_lat, urc_lon):
+        '''
+        Finds all points inside a latitude/longitude bounding box.
+
+        Args:
+            llc_lat (float): Latitude - Lower left corner of the box
+            llc_lon (float): Longitude - Lower left corner of the box
+            urc_lat (float): Latitude - Upper right corner of the box
+            urc_lon (float): Longitude - Upper right corner of the box
+
+        Returns:
+            np.ndarray: Sorted indices of the points inside the box.
+        '''
+        (low_row, high_row), (low_column, high_column) = self._cells([llc_lat, urc_lat], [llc_lon, urc_lon])
+        low_row, low_column = max(low_row, 0), max(low_column, 0)
+        high_row, high_column = min(high_row, self._rows - 1), min(high_column, self._columns - 1)
+        if low_row > high_row or low_column > high_column:
+            return np.array([], dtype=int)
+        starts = np.arange(low_row, high_row + 1) * self._columns
+        lo = np.searchsorted(self._keys, starts + low_column, side='left')
+        hi = np.searchsorted(self._keys, starts + high_column, side='right')
+        candidates = np.concatenate([self._order[a:b] for a, b in zip(lo, hi)])
+        lats = self.lats[candidates]
+        lons = self.lons[candidates]
+        inside = (lats >= llc_lat) & (lats <= urc_lat) & (lons >= llc_lon) & (lons <= urc_lon)
+        return np.sort(candidates[inside])
+
+
+VIEW_MARGIN = 0.05
+
+
+def view_box(llc_lat, llc_lon, urc_lat, urc_lon, margin=VIEW_MARGIN):
+    '''
+    Widens a view's bounding box by a margin, so that markers overlapping the edge are kept.
+
+    Args:
+        llc_lat (float): Latitude - Lower left corner of view window
+        llc_lon (float): Longitude - Lower left corner of view window
+        urc_lat (float): Latitude - Upper right corner of view window
+        urc_lon (float): Longitude - Upper right corner of view window
+        margin (float): Margin as a fraction of the box size. Defaults to VIEW_MARGIN
+
+    Returns:
+        tuple of float: llc_lat, llc_lon, urc_lat, urc_lon of the widened box.
+    '''
+    llc_lat, llc_lon, urc_lat, urc_lon = (float(np.ravel(value)[0]) for value in (llc_lat, llc_lon, urc_lat, urc_lon))
+    margin_lat = (urc_lat - llc_lat) * margin
+    margin_lon = (urc_lon - llc_lon) * margin
+    return llc_lat - margin_lat, llc_lon - margin_lon, urc_lat + margin_lat, urc_lon + margin_lon
+
+
+def stats_in_view(df_stats, llc_lat, llc_lon, urc_lat, urc_lon, index=None, margin=VIEW_MARGIN):
+    '''
+    Selects the Stats rows drawn in a view: the locations inside its bounding box, widened by a margin so that
+    markers overlapping the edge are kept.
+
+    Args:
+        df_stats (pd.DataFrame): Stats dataframe.
+        llc_lat (float): Latitude - Lower left corner of view window
+        llc_lon (float): Longitude - Lower left corner of view window
+        urc_lat (float): Latitude - Upper right corner of view window
+        urc_lon (float): Longitude - Upper right corner of view window
+        index (GridIndex): Optional. Index of df_stats, built on the fly if not given.
+        margin (float): Margin as a fraction of the box size. Defaults to VIEW_MARGIN
+
+    Returns:
+        pd.DataFrame: The selected rows with a fresh index.
+    '''
+    if index is None:
+        index = GridIndex.from_stats(df_stats)
+    positions = index.query_box(*view_box(llc_lat, llc_lon, urc_lat, urc_lon, margin))
+    return df_stats.iloc[positions].reset_index(drop=True)
+
+
+EARTH_RADIUS = 6378137.0
+CLUSTER_RADIUS = 24
+
+
+def web_mercator(lats, lons):
+    '''
+    Projects latitude/longitude to Web Mercator (EPSG:3857) metres, the projection the maps are drawn in.
+
+    Args:
+        lats (array-like): Latitudes.
+        lons (array-like): Longitudes.
+
+    Returns:
+        np.ndarray, np.ndarray: x and y in metres.
+    '''
+    lats = np.clip(np.asarray(lats, dtype=float), -85.0511, 85.0511)
+    x = EARTH_RADIUS * np.radians(np.asarray(lons, dtype=float))
+    y = EARTH_RADIUS * np.log(np.tan(np.pi / 4 + np.radians(lats) / 2))
+    return x, y
+
+
+class ClusterLayer:
+    '''
+    Zoom dependent clusters of the Stats locations. At zoom level z a map pixel covers
+    2 * pi * EARTH_RADIUS / (256 * 2 ** z) metres, as on web map tiles. The locations are binned into square
+    Web Mercator cells of radius pixels at that scale. Starting with the fullest cell, every cell then absorbs
+    the neighbouring cells whose mean position is closer than one cell, so a city on a cell border is not split
+    in two overlapping markers. Each group becomes one cluster at the mean position of its schools with their
+    summed TotalParticipants. The clusters of a zoom level are computed on first use
+    and cached, so panning and redrawing views at the same scale reuse them.
+
+    Attributes:
+        radius (int): Edge length of a cluster cell in pixels.
+    '''
+    def __init__(self, df_stats, radius=CLUSTER_RADIUS):
+        self.radius = radius
+        lats = pd.to_numeric(df_stats['Latitude'], errors='coerce').to_numpy(dtype=float)
+        lons = pd.to_numeric(df_stats['Longitude'], errors='coerce').to_numpy(dtype=float)
+        values = pd.to_numeric(df_stats['TotalParticipants'], errors='coerce').fillna(0).to_numpy(dtype=float)
+        valid = np.isfinite(lats) & np.isfinite(lons)
+        self._x, self._y = web_mercator(lats[valid], lons[valid])
+        self._values = values[valid]
+        self._levels = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def zoom_for(llc_lat, llc_lon, urc_lat, urc_lon, width, height):
+        '''
+        Picks the zoom level at which a view fits into an area of the given size.
+
+        Args:
+            llc_lat (float): Latitude - Lower left corner of view window
+            llc_lon (float): Longitude - Lower left corner of view window
+            urc_lat (float): Latitude - Upper right corner of view window
+            urc_lon (float): Longitude - Upper right corner of view window
+            width (float): Width of the drawing area in pixels.
+            height (float): Height of the drawing area in pixels.
+
+        Returns:
+            int: Zoom level between 0 and 22.
+        '''
+        (x0, x1), (y0, y1) = web_mercator([llc_lat, urc_lat], [llc_lon, urc_lon])
+        metres_per_pixel = max((x1 - x0) / max(width, 1), (y1 - y0) / max(height, 1))
+        if metres_per_pixel <= 0:
+            return 22
+        zoom = np.floor(np.log2(2 * np.pi * EARTH_RADIUS / (256 * metres_per_pixel)))
+        return int(np.clip(zoom, 0, 22))
+
+    def level(self, zoom):
+        '''
+        Returns the clusters of a zoom level, computing them on first use.
+
+        Args:
+            zoom (int): Zoom level.
+
+        Returns:
+            pd.DataFrame: One row per cluster with 'Latitude', 'Longitude', 'TotalParticipants' and 'Count'.
+        '''
+        with self._lock:
+            clusters = self._levels.get(zoom)
+        if clusters is not None:
+            return clusters
+        cell = self.radius * 2 * np.pi * EARTH_RADIUS / (256 * 2 ** zoom)
+        cells = np.column_stack((np.floor(self._x / cell), np.floor(self._y / cell))).astype(np.int64)
+        if len(cells):
+            cells, members = np.unique(cells, axis=0, return_inverse=True)
+            members = members.ravel()
+        else:
+            members = np.array([], dtype=int)
+        counts = np.bincount(members, minlength=len(cells))
+        x = np.bincount(members, weights=self._x, minlength=len(cells)) / np.maximum(counts, 1)
+        y = np.bincount(members, weights=self._y, minlength=len(cells)) / np.maximum(counts, 1)
+        members = self._merge_neighbours(cells, counts, x, y, cell)[members]
+        counts = np.bincount(members, minlength=len(cells))
+        keep = counts > 0
+        x = (np.bincount(members, weights=self._x, minlength=len(cells)) / np.maximum(counts, 1))[keep]
+        y = (np.bincount(members, weights=self._y, minlength=len(cells)) / np.maximum(counts, 1))[keep]
+        clusters = pd.DataFrame({
+            'Latitude': np.degrees(2 * np.arctan(np.exp(y / EARTH_RADIUS)) - np.pi / 2),
+            'Longitude': np.degrees(x / EARTH_RADIUS),
+            'TotalParticipants': np.bincount(members, weights=self._values, minlength=len(cells))[keep],
+            'Count': counts[keep],
+        })
+        with self._lock:
+            return self._levels.setdefault(zoom, clusters)
+
+    @staticmethod
+    def _merge_neighbours(cells, counts, x, y, cell):
+        lookup = {key: i for i, key in enumerate(map(tuple, cells.tolist()))}
+        xs, ys, keys = x.tolist(), y.tolist(), cells.tolist()
+        target = np.arange(len(cells))
+        assigned = np.zeros(len(cells), dtype=bool)
+        for i in np.argsort(-counts, kind='stable').tolist():
+            if assigned[i]:
+                continue
+            assigned[i] = True
+            cx, cy = keys[i]
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    j = lookup.get((cx + dx, cy + dy))
+                    if j is not None and not assigned[j] and np.hypot(xs[j] - xs[i], ys[j] - ys[i]) < cell:
+                        target[j] = i
+                        assigned[j] = True
+        return target
+
+    def query(self, zoom, llc_lat, llc_lon, urc_lat, urc_lon, margin=VIEW_MARGIN):
+        '''
+        Selects the clusters of a zoom level whose position lies inside a view.
+
+        Args:
+            zoom (int): Zoom level.
+            llc_lat (float): Latitude - Lower left corner of view window
+            llc_lon (float): Longitude - Lower left corner of view window
+            urc_lat (float): Latitude - Upper right corner of view window
+            urc_lon (float): Longitude - Upper right corner of view window
+            margin (float): Margin as a fraction of the box size. Defaults to VIEW_MARGIN
+
+        Returns:
+            pd.DataFrame: The selected clusters, see level.
+        '''
+        clusters = self.level(zoom)
+        llc_lat, llc_lon, urc_lat, urc_lon = view_box(llc_lat, llc_lon, urc_lat, urc_lon, margin)
+        inside = (clusters['Latitude'].between(llc_lat, urc_lat) & clusters['Longitude'].between(llc_lon, urc_lon))
+        return clusters[inside].reset_index(drop=True)
+
+
+class PlzGazetteer:
+    '''
+    Offline geocoder keyed by German postal code (PLZ), mapping each PLZ to its centroid, city and Bundesland.
+
+    The gazetteer is stored as a compressed NumPy archive with the PLZ codes sorted for binary search, so a
+    lookup needs no network and takes microseconds. The archive can be built from the GeoNames postal code export for Germany (DE.txt, CC BY 4.0,
+    https://download.geonames.org/export/zip/) with build_from_geonames.
+
+    Attributes:
+        file_path (str): Path to the gazetteer archive.
+    '''
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._plz = None
+
+    @staticmethod
+    def normalize_plz(plz_code):
+        '''
+        Converts a post code as read from Excel (int, float or str) to an integer.
+
+        Args:
+            plz_code (int, float or str): Post code. Ex: 1067, "01067" or 76133.0
+
+        Returns:
+            int or None: The post code as an integer, or None if it is not a valid 5 digit post code.
+        '''
+        try:
+            plz = int(float(str(plz_code).strip()))
+        except ValueError:
+            return None
+        if 1000 <= plz <= 99999:
+            return plz
+        return None
+
+    @classmethod
+    def build_from_geonames(cls, source_path, file_path):
+        '''
+        Builds the gazetteer archive from a GeoNames postal code export. Places sharing a PLZ are merged,
+        with the centroid averaged over all places and the first place name kept as the city.
+
+        Args:
+            source_path (str or file-like): Path to the tab separated GeoNames export, ex: "DE.txt".
+            file_path (str): Path of the archive to write.
+
+        Returns:
+            PlzGazetteer: The gazetteer for the written archive.
+        '''
+        df = pd.read_csv(source_path, sep='\t', header=None, dtype={1: str}, keep_default_na=False,
+                         usecols=[1, 2, 3, 9, 10], names=['PLZ', 'Stadt', 'Bundesland', 'Latitude', 'Longitude'])
+        return cls.build_from_frame(df, file_path)
+
+    @classmethod
+    def build_from_frame(cls, df, file_path):
+        '''
+        Builds the gazetteer archive from a DataFrame with 'PLZ', 'Stadt', 'Bundesland', 'Latitude' and
+        'Longitude' columns.
+
+        Args:
+            df (pd.DataFrame): Source rows, several rows may share a PLZ.
+            file_path (str): Path of the archive to write.
+
+        Returns:
+            PlzGazetteer: The gazetteer for the written archive.
+        '''
+        df = df.assign(PLZ=df['PLZ'].map(cls.normalize_plz)).dropna(subset=['PLZ', 'Latitude', 'Longitude'])
+        df = df.groupby('PLZ', sort=True).agg(Stadt=('Stadt', 'first'), Bundesland=('Bundesland', 'first'),
+                                               Latitude=('Latitude', 'mean'), Longitude=('Longitude', 'mean'))
+        cities, cityIndex = np.unique(df['Stadt'].to_numpy(dtype=str), return_inverse=True)
+        states, stateIndex = np.unique(df['Bundesland'].to_numpy(dtype=str), return_inverse=True)
+        folder_path = os.path.dirname(file_path)
+        if folder_path and not os.path.exists(folder_path):
+            os.makedirs(folder_path)
+        with open(file_path, 'wb') as file:
+            np.savez_compressed(file,
+                                plz=df.index.to_numpy(dtype=np.uint32),
+                                lat=df['Latitude'].to_numpy(dtype=np.float32),
+                                lon=df['Longitude'].to_numpy(dtype=np.float32),
+                                city=cityIndex.astype(np.uint32),
+                                state=stateIndex.astype(np.uint8),
+                                cities=cities,
+                                states=states)
+        return cls(file_path)
+
+    def _load(self):
+        '''
+        Loads the archive on first use. A missing archive yields an empty gazetteer.
+
+        Args:
+            None
+
+        Returns:
+            bool: True if the gazetteer has entries.
+        '''
+        if self._plz is None:
+            if os.path.exists(self.file_path):
+                with np.load(self.file_path) as data:
+                    self._plz = data['plz']
+                    self._lat = data['lat'].astype(float)
+                    self._lon = data['lon'].astype(float)
+                    self._city = data['city']
+                    self._state = data['state']
+                    self._cities = data['cities']
+                    self._states = data['states']
+            else:
+                self._plz = np.array([], dtype=np.uint32)
+        return len(self._plz) > 0
+
+    def _entry(self, index):
+        return (str(self._plz[index]).zfill(5), float(self._lat[index]), float(self._lon[index]),
+                str(self._cities[self._city[index]]), str(self._states[self._state[index]]))
+
+    def lookup(self, plz_code):
+        '''
+        Looks up a post code.
+
+        Args:
+            plz_code (int, float or str): Post code. Ex: "76139"
+
+        Returns:
+            tuple or None: (plz, latitude, longitude, city, state), or None if the post code is unknown.
+        '''
+        plz = self.normalize_plz(plz_code)
+        if plz is None or not self._load():
+            return None
+        index = np.searchsorted(self._plz, plz)
+        if index < len(self._plz) and self._plz[index] == plz:
+            return self._entry(index)
+        return None
+
+    def get_coordinates(self, plz_code):
+        '''
+        Returns the centroid of a post code.
+
+        Args:
+            plz_code (int, float or str): Post code. Ex: "76139"
+
+        Returns:
+            float, float: latitude and longitude of the centroid, or None, None if the post code is unknown.
+        '''
+        entry = self.lookup(plz_code)
+        if entry is None:
+            return None, None
+        return entry[1], entry[2]
+
+
+class BasemapCache:
+    '''
+    Bounded LRU cache of Basemap instances keyed by bounding box, resolution and projection.
+
+    Building a Basemap at high resolution loads the coastline and country datasets, which dominates render time.
+    Instances are kept in memory, and if a cache directory is given they are also pickled to disk, so later
+    sessions load each view in milliseconds instead of rebuilding it.
+
+    Attributes:
+        max_entries (int): Maximum number of Basemap instances kept in memory.
+        cache_path (str or None): Directory of the on-disk pickle cache, or None to cache in memory only.
+    '''
+    def __init__(self, max_entries=8, cache_path=None):
+        self.max_entries = max_entries
+        self.cache_path = cache_path
+        self._maps = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_path and not os.path.exists(cache_path):
+            os.makedirs(cache_path)
+
+    @staticmethod
+    def key(llc_lat, llc_lon, urc_lat, urc_lon, resolution='h', epsg=3857):
+        '''
+        Builds the cache key of a view. Coordinates are rounded to 6 decimals (about 0.1 m).
+
+        Args:
+            llc_lat (float): Latitude - Lower left corner of view window
+            llc_lon (float): Longitude - Lower left corner of view window
+            urc_lat (float): Latitude - Upper right corner of view window
+            urc_lon (float): Longitude - Upper right corner of view window
+            resolution (str): Basemap resolution, 'c', 'l', 'i', 'h' or 'f'. Defaults to 'h'.
+            epsg (int): EPSG code of the projection. Defaults to 3857 (Web Mercator).
+
+        Returns:
+            tuple: The cache key.
+        '''
+        bbox = tuple(round(float(np.asarray(value).ravel()[0]), 6) for value in (llc_lat, llc_lon, urc_lat, urc_lon))
+        return bbox + (resolution, int(epsg))
+
+    def _file_path(self, key):
+        digest = hashlib.sha1(repr((key, mpl_toolkits.basemap.__version__)).encode()).hexdigest()
+        return os.path.join(self.cache_path, digest + '.pickle')
+
+    def get(self, llc_lat, llc_lon, urc_lat, urc_lon, resolution='h', epsg=3857):
+        '''
+        Returns the Basemap for a view, from memory, from the disk cache, or by building it.
+
+        Args:
+            llc_lat (float): Latitude - Lower left corner of view window
+            llc_lon (float): Longitude - Lower left corner of view window
+            urc_lat (float): Latitude - Upper right corner of view window
+            urc_lon (float): Longitude - Upper right corner of view window
+            resolution (str): Basemap resolution, 'c', 'l', 'i', 'h' or 'f'. Defaults to 'h'.
+            epsg (int): EPSG code of the projection. Defaults to 3857 (Web Mercator).
+
+        Returns:
+            Basemap: The map projection for the view. Draw calls must be given an explicit ax, since the
+                instance is shared between figures.
+        '''
+        key = self.key(llc_lat, llc_lon, urc_lat, urc_lon, resolution, epsg)
+        with self._lock:
+            m = self._maps.get(key)
+            if m is not None:
+                self._maps.move_to_end(key)
+                return m
+        m = self._load(key)
+        if m is None:
+            llc_lat, llc_lon, urc_lat, urc_lon = key[:4]
+            m = Basemap(resolution=resolution, lat_0=(urc_lat - llc_lat) / 2, lon_0=(urc_lon - llc_lon) / 2,
+                        llcrnrlon=llc_lon, llcrnrlat=llc_lat, urcrnrlon=urc_lon, urcrnrlat=urc_lat, epsg=epsg)
+            self._save(key, m)
+        with self._lock:
+            self._maps[key] = m
+            self._maps.move_to_end(key)
+            while len(self._maps) > self.max_entries:
+                self._maps.popitem(last=False)
+        return m
+
+    def contains(self, llc_lat, llc_lon, urc_lat, urc_lon, resolution='h', epsg=3857):
+        '''
+        Checks whether a view's Basemap is available without building it.
+
+        Args:
+            llc_lat (float): Latitude - Lower left corner of view window
+            llc_lon (float): Longitude - Lower left corner of view window
+            urc_lat (float): Latitude - Upper right corner of view window
+            urc_lon (float): Longitude - Upper right corner of view window
+            resolution (str): Basemap resolution. Defaults to 'h'.
+            epsg (int): EPSG code of the projection. Defaults to 3857 (Web Mercator).
+
+        Returns:
+            bool: True if the Basemap is in memory or in the disk cache.
+        '''
+        key = self.key(llc_lat, llc_lon, urc_lat, urc_lon, resolution, epsg)
+        with self._lock:
+            if key in self._maps:
+                return True
+        return bool(self.cache_path) and os.path.exists(self._file_path(key))
+
+    def _load(self, key):
+        if not self.cache_path:
+            return None
+        file_path = self._file_path(key)
+        try:
+            with open(file_path, 'rb') as file:
+                return pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            os.remove(file_path)
+            return None
+
+    def _save(self, key, m):
+        if not self.cache_path:
+            return
+        file_path = self._file_path(key)
+        temp_path = f'{file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp_path, 'wb') as file:
+                pickle.dump(m, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, file_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+class WmsImageCache:
+    '''
+    Disk cache for WMS background images, keyed by layer, bounding box, pixel size and EPSG code.
+
+    Each image is stored as the PNG returned by the server next to a JSON sidecar holding its georeference
+    (server, layer, bounding box in projection coordinates, size and EPSG code). Once the cache grows past
+    max_bytes the least recently used images are evicted. In offline mode images are only served from the
+    cache and a miss draws no background instead of failing the render.
+
+    Attributes:
+        server (str): WMS server URL.
+        cache_path (str): Directory holding the cached images.
+        max_bytes (int): Maximum total size of the cached images in bytes.
+        offline (bool): If True, the server is never contacted.
+    '''
+    def __init__(self, server, cache_path, max_bytes=200 * 1024 * 1024, offline=False):
+        self.server = server
+        self.cache_path = cache_path
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._wms = None
+        self._lock = threading.Lock()
+        if not os.path.exists(cache_path):
+            os.makedirs(cache_path)
+
+    @staticmethod
+    def get_bbox(m):
+        '''
+        Computes the WMS bounding box of a Basemap in its EPSG projection, as Basemap.wmsimage does.
+
+        Args:
+            m (Basemap): Map created with an epsg code.
+
+        Returns:
+            tuple of float: (xmin, ymin, xmax, ymax) in projection coordinates.
+        '''
+        transformer = pyproj.Transformer.from_crs('EPSG:4326', f'EPSG:{m.epsg}', always_xy=True)
+        xmin, ymin = transformer.transform(m.llcrnrlon, m.llcrnrlat)
+        xmax, ymax = transformer.transform(m.urcrnrlon, m.urcrnrlat)
+        return xmin, ymin, xmax, ymax
+
+    def _file_path(self, layer, bbox, size, epsg):
+        key = (self.server, layer, tuple(round(value, 2) for value in bbox), tuple(size), int(epsg))
+        return os.path.join(self.cache_path, hashlib.sha1(repr(key).encode()).hexdigest())
+
+    def get_image(self, layer, bbox, size, epsg):
+        '''
+        Returns a background image from the cache, fetching and storing it on a miss unless offline.
+
+        Args:
+            layer (str): WMS layer name, ex: "web_light".
+            bbox (tuple of float): (xmin, ymin, xmax, ymax) in projection coordinates.
+            size (tuple of int): (xpixels, ypixels) of the requested image.
+            epsg (int): EPSG code of the projection.
+
+        Returns:
+            np.ndarray or None: The decoded image, or None if it is not cached and could not be fetched. A cached
+                image that no longer decodes is removed from the cache.
+        '''
+        file_path = self._file_path(layer, bbox, size, epsg)
+        try:
+            with open(file_path + '.png', 'rb') as file:
+                data = file.read()
+            os.utime(file_path + '.png')
+        except OSError:
+            if self.offline:
+                return None
+            data = self._fetch(layer, bbox, size, epsg)
+            image = self._decode(data) if data is not None else None
+            if image is not None:
+                self._store(file_path, data, layer, bbox, size, epsg)
+            return image
+        image = self._decode(data)
+        if image is None:
+            self._remove(file_path)
+        return image
+
+    @staticmethod
+    def _decode(data):
+        # Servers can answer with an error document or a cut off image, neither of which may reach the cache
+        try:
+            return matplotlib.image.imread(io.BytesIO(data), format='png')
+        except (OSError, ValueError, SyntaxError):
+            return None
+
+    def _fetch(self, layer, bbox, size, epsg):
+        try:
+            from owslib.wms import WebMapService
+        except ImportError:
+            raise ImportError('OWSLib required to fetch WMS images')
+        try:
+            with self._lock:
+                if self._wms is None:
+                    self._wms = WebMapService(self.server)
+            image = self._wms.getmap(service='wms', layers=[layer], bbox=tuple(bbox), size=tuple(size),
+                                     format='image/png', srs=f'EPSG:{epsg}')
+            return image.read()
+        except Exception:
+            # Any network or service error leaves the map without a background rather than failing the render
+            return None
+
+    def _store(self, file_path, data, layer, bbox, size, epsg):
+        # Written to a temporary file and renamed, so other processes sharing the cache never read a partial image
+        temp_path = f'{file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({'server': self.server, 'layer': layer, 'bbox': list(bbox), 'size': list(size),
+                       'epsg': int(epsg)}, file)
+        os.replace(temp_path, file_path + '.json')
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, file_path + '.png')
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            images = []
+            for entry in os.scandir(self.cache_path):
+                if entry.name.endswith('.png'):
+                    stat = entry.stat()
+                    images.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in images)
+            for _, size, path in sorted(images):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path[:-len('.png')])
+                total -= size
+
+    @staticmethod
+    def _remove(file_path):
+        for path in (file_path + '.png', file_path + '.json'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def draw(self, m, ax, layer, xpixels=400):
+        '''
+        Draws a cached WMS background on a map, equivalent to Basemap.wmsimage.
+
+        Args:
+            m (Basemap): Map created with an epsg code.
+            ax (Axes): Axes to draw on.
+            layer (str): WMS layer name, ex: "web_light".
+            xpixels (int): Requested number of image pixels in x-direction. Defaults to 400.
+
+        Returns:
+            AxesImage or None: The drawn image, or None if no image was available.
+        '''
+        size = (xpixels, int(m.aspect * xpixels))
+        image = self.get_image(layer, self.get_bbox(m), size, m.epsg)
+        if image is None:
+            return None
+        return m.imshow(image, origin='upper', ax=ax)
+
+
+class ShapeStore:
+    '''
+    DEU_adm1 state boundaries parsed once into NumPy arrays and cached as a .npz file.
+
+    All polygon parts are concatenated into flat longitude/latitude and Web Mercator (EPSG:3857) coordinate
+    arrays, with offsets marking where each part starts and the index of the state each part belongs to.
+    The cache is rebuilt whenever the modification time or size of the source shapefile changes.
+
+    Points are assigned to states part by part: a bounding box check selects the candidate points of a part
+    and Path.contains_points tests only those. A point lies in a state if it is inside an odd number of the
+    state's parts, which accounts for holes such as Berlin inside Brandenburg. Assignments of a Stats frame are
+    kept for the last few frames, keyed by a hash of their coordinates.
+
+    Attributes:
+        source_path (str): Path of the shapefile without extension, ex: "shapefiles/DEU_adm1".
+        cache_file (str): Path of the .npz cache.
+        names (np.ndarray): State names (NAME_1).
+        lons (np.ndarray): Longitudes of all vertices.
+        lats (np.ndarray): Latitudes of all vertices.
+        x (np.ndarray): Web Mercator x of all vertices.
+        y (np.ndarray): Web Mercator y of all vertices.
+        offsets (np.ndarray): Start of each part in the vertex arrays, followed by the total vertex count.
+        part_state (np.ndarray): Index into names for each part.
+    '''
+    def __init__(self, source_path, cache_file):
+        self.source_path = source_path
+        self.cache_file = cache_file
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._paths = None
+        self._labels = None
+        self._assignments = OrderedDict()
+
+    def _signature(self):
+        stat = os.stat(self.source_path + '.shp')
+        return np.array([stat.st_mtime, stat.st_size])
+
+    def load(self):
+        '''
+        Loads the geometry from the cache, reparsing the shapefile if the cache is missing or out of date.
+
+        Args:
+            None
+
+        Returns:
+            ShapeStore: self, for chaining.
+        '''
+        with self._lock:
+            if self._loaded:
+                return self
+            signature = self._signature()
+            data = None
+            if os.path.exists(self.cache_file):
+                with np.load(self.cache_file) as cached:
+                    if np.array_equal(cached['signature'], signature):
+                        data = {key: cached[key] for key in cached.files}
+            if data is None:
+                data = self._parse()
+                data['signature'] = signature
+                folder_path = os.path.dirname(self.cache_file)
+                if folder_path and not os.path.exists(folder_path):
+                    os.makedirs(folder_path)
+                temp_path = f'{self.cache_file}.{os.getpid()}.tmp'
+                with open(temp_path, 'wb') as file:
+                    np.savez(file, **data)
+                os.replace(temp_path, self.cache_file)
+            for key in ('names', 'lons', 'lats', 'x', 'y', 'offsets', 'part_state'):
+                setattr(self, key, data[key])
+            self._loaded = True
+        return self
+
+    def _parse(self):
+        reader = shapefile.Reader(self.source_path)
+        names = []
+        lons = []
+        lats = []
+        offsets = [0]
+        part_state = []
+        for state_index, shape_record in enumerate(reader.iterShapeRecords()):
+            names.append(shape_record.record['NAME_1'])
+            points = np.asarray(shape_record.shape.points, dtype=float)
+            parts = list(shape_record.shape.parts) + [len(points)]
+            for start, end in zip(parts[:-1], parts[1:]):
+                lons.append(points[start:end, 0])
+                lats.append(points[start:end, 1])
+                offsets.append(offsets[-1] + end - start)
+                part_state.append(state_index)
+        reader.close()
+        lons = np.concatenate(lons)
+        lats = np.concatenate(lats)
+        x, y = pyproj.Transformer.from_crs('EPSG:4326', 'EPSG:3857', always_xy=True).transform(lons, lats)
+        return {'names': np.array(names, dtype=str), 'lons': lons, 'lats': lats, 'x': x, 'y': y,
+                'offsets': np.array(offsets), 'part_state': np.array(part_state)}
+
+    def project(self, m):
+        '''
+        Projects all vertices into a map's coordinates. For Web Mercator maps this is a translation of the
+        stored coordinates, for other projections the longitudes and latitudes are projected in one call.
+
+        Args:
+            m (Basemap): Target map.
+
+        Returns:
+            np.ndarray, np.ndarray: x and y of all vertices in map coordinates.
+        '''
+        self.load()
+        if getattr(m, 'epsg', None) == 3857:
+            x0, y0 = pyproj.Transformer.from_crs('EPSG:4326', 'EPSG:3857', always_xy=True).transform(
+                m.llcrnrlon, m.llcrnrlat)
+            return self.x - x0, self.y - y0
+        return m(self.lons, self.lats)
+
+    def parts(self, m):
+        '''
+        Returns every polygon part as an (N, 2) array in map coordinates.
+
+        Args:
+            m (Basemap): Target map.
+
+        Returns:
+            list of np.ndarray: One array per part, in the order of part_state.
+        '''
+        x, y = self.project(m)
+        xy = np.column_stack((x, y))
+        return np.split(xy, self.offsets[1:-1])
+
+    def draw(self, m, ax, linewidth=0.5, color='k', zorder=None):
+        '''
+        Draws the state boundaries, as Basemap.readshapefile does with drawbounds=True.
+
+        Args:
+            m (Basemap): Target map.
+            ax (Axes): Axes to draw on.
+            linewidth (float): Boundary line width. Defaults to 0.5.
+            color (str): Boundary colour. Defaults to 'k'.
+            zorder (float, optional): Drawing order of the boundaries. Defaults to None.
+
+        Returns:
+            LineCollection: The drawn boundaries.
+        '''
+        lines = LineCollection(self.parts(m), antialiaseds=(1,), linewidths=(linewidth,), colors=color)
+        if zorder is not None:
+            lines.set_zorder(zorder)
+        lines.set_label('_nolabel_')
+        ax.add_collection(lines)
+        m.set_axes_limits(ax=ax)
+        return lines
+
+    def _part_geometry(self):
+        self.load()
+        with self._lock:
+            if self._paths is None:
+                starts = self.offsets[:-1]
+                lons = np.split(self.lons, self.offsets[1:-1])
+                lats = np.split(self.lats, self.offsets[1:-1])
+                # Shapefile rings run clockwise, holes counter-clockwise
+                area = np.array([np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y) for x, y in zip(lons, lats)])
+                self._boxes = np.column_stack((np.minimum.reduceat(self.lons, starts),
+                                               np.minimum.reduceat(self.lats, starts),
+                                               np.maximum.reduceat(self.lons, starts),
+                                               np.maximum.reduceat(self.lats, starts)))
+                self._holes = area > 0
+                self._paths = [Path(np.column_stack((x, y))) for x, y in zip(lons, lats)]
+        return self._paths, self._boxes, self._holes
+
+    def assign_states(self, lats, lons):
+        '''
+        Finds the state each point lies in.
+
+        Args:
+            lats (array-like): Latitudes of the points.
+            lons (array-like): Longitudes of the points.
+
+        Returns:
+            np.ndarray: Index into names per point, -1 for points outside every state or without coordinates.
+        '''
+        paths, boxes, holes = self._part_geometry()
+        lats = pd.to_numeric(pd.Series(lats), errors='coerce').to_numpy(dtype=float)
+        lons = pd.to_numeric(pd.Series(lons), errors='coerce').to_numpy(dtype=float)
+        inside = np.zeros((len(self.names), len(lats)), dtype=bool)
+        for path, (min_lon, min_lat, max_lon, max_lat), state in zip(paths, boxes, self.part_state):
+            candidates = np.flatnonzero((lons >= min_lon) & (lons <= max_lon) & (lats >= min_lat) & (lats <= max_lat))
+            if len(candidates):
+                hits = path.contains_points(np.column_stack((lons[candidates], lats[candidates])))
+                inside[state, candidates[hits]] ^= True
+        return np.where(inside.any(axis=0), inside.argmax(axis=0), -1)
+
+    def state_assignments(self, df_stats):
+        '''
+        Assigns the Stats locations to states, reusing the result for a frame with the same coordinates.
+
+        Args:
+            df_stats (pd.DataFrame): Stats dataframe.
+
+        Returns:
+            pd.Series: State name per Stats row, None outside every state, indexed like df_stats.
+        '''
+        coordinates = df_stats[['Latitude', 'Longitude']]
+        key = hashlib.sha1(pd.util.hash_pandas_object(coordinates, index=False).to_numpy().tobytes()).hexdigest()
+        with self._lock:
+            states = self._assignments.get(key)
+            if states is not None:
+                self._assignments.move_to_end(key)
+        if states is None:
+            states = self.assign_states(coordinates['Latitude'], coordinates['Longitude'])
+            with self._lock:
+                self._assignments[key] = states
+                while len(self._assignments) > 8:
+                    self._assignments.popitem(last=False)
+        names = np.array([str(name) for name in self.names] + [None], dtype=object)
+        return pd.Series(names[states], index=df_stats.index)
+
+    def label_points(self, samples=20):
+        '''
+        Finds a point inside every state to place its label at: of a samples x samples grid over the state, the
+        inner point farthest from the state's boundary. Unlike the centroid this stays clear of enclaves, such as
+        Berlin in the middle of Brandenburg.
+
+        Args:
+            samples (int): Grid points per axis. Defaults to 20.
+
+        Returns:
+            dict: (longitude, latitude) per state name.
+        '''
+        paths, boxes, holes = self._part_geometry()
+        if self._labels is not None:
+            return self._labels
+        labels = {}
+        for state, name in enumerate(self.names):
+            parts = self.part_state == state
+            min_lon, min_lat = boxes[parts, :2].min(axis=0)
+            max_lon, max_lat = boxes[parts, 2:].max(axis=0)
+            lons, lats = np.meshgrid(np.linspace(min_lon, max_lon, samples), np.linspace(min_lat, max_lat, samples))
+            lons, lats = lons.ravel(), lats.ravel()
+            inner = self.assign_states(lats, lons) == state
+            if not inner.any():
+                labels[str(name)] = ((min_lon + max_lon) / 2, (min_lat + max_lat) / 2)
+                continue
+            lons, lats = lons[inner], lats[inner]
+            vertices = np.concatenate([paths[i].vertices for i in np.flatnonzero(parts)])
+            scale = np.cos(np.radians(lats.mean()))
+            distance = np.full(len(lons), np.inf)
+            for chunk in np.array_split(vertices, max(1, len(vertices) // 2000)):
+                distance = np.minimum(distance, np.hypot((lons[:, None] - chunk[None, :, 0]) * scale,
+                                                         lats[:, None] - chunk[None, :, 1]).min(axis=1))
+            best = np.argmax(distance)
+            labels[str(name)] = (lons[best], lats[best])
+        with self._lock:
+            self._labels = labels
+        return labels
+
+    def draw_choropleth(self, m, ax, values, cmap=cm.winter_r, zorder=None):
+        '''
+        Fills every state with the colour of its value, larger states first so that enclaves such as Berlin and
+        Bremen stay visible. Holes are not filled.
+
+        Args:
+            m (Basemap): Target map.
+            ax (Axes): Axes to draw on.
+            values (pd.Series): Value per state name. Missing states are left empty.
+            cmap (Colormap): Colour map, scaled from 0 to the largest value. Defaults to cm.winter_r.
+            zorder (float, optional): Drawing order of the fills. Defaults to None.
+
+        Returns:
+            PolyCollection: The drawn fills.
+        '''
+        paths, boxes, holes = self._part_geometry()
+        maximum = max(float(values.max()), 1.0) if len(values) else 1.0
+        parts = self.parts(m)
+        size = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        order = [i for i in np.argsort(-size, kind='stable') if not holes[i]
+                 and self.names[self.part_state[i]] in values.index]
+        colors = [cmap(float(values[self.names[self.part_state[i]]]) / maximum, alpha=0.6) for i in order]
+        fills = PolyCollection([parts[i] for i in order], facecolors=colors, edgecolors='none')
+        if zorder is not None:
+            fills.set_zorder(zorder)
+        fills.set_label('_nolabel_')
+        ax.add_collection(fills)
+        return fills
+
+
+def choose_resolution(llc_lat, llc_lon, urc_lat, urc_lon, pixel_width):
+    '''
+    Chooses the coarsest Basemap coastline resolution whose detail is still visible on the canvas.
+
+    The nominal feature sizes of the GSHHS resolutions are about 25 km (c), 5 km (l), 1 km (i) and
+    0.2 km (h). A resolution is used while its features span at most two pixels. 'f' is never chosen,
+    matching the previous fixed 'h'. Saved maps keep using 'h'.
+
+    Args:
+        llc_lat (float): Latitude - Lower left corner of view window
+        llc_lon (float): Longitude - Lower left corner of view window
+        urc_lat (float): Latitude - Upper right corner of view window
+        urc_lon (float): Longitude - Upper right corner of view window
+        pixel_width (int): Width of the canvas in pixels.
+
+    Returns:
+        str: 'c', 'l', 'i' or 'h'.
+    '''
+    mid_lat = np.radians((float(llc_lat) + float(urc_lat)) / 2)
+    width_km = abs(float(urc_lon) - float(llc_lon)) * 111.32 * np.cos(mid_lat)
+    km_per_pixel = width_km / max(int(pixel_width), 1)
+    for resolution, feature_km in (('c', 25.0), ('l', 5.0), ('i', 1.0)):
+        if 2 * km_per_pixel >= feature_km:
+            return resolution
+    return 'h'
+
+
+def draw_markers(ax, m, lons, lats, values, size_cap, color_by_rank=True, legend_bins=5):
+    '''
+    Draws all location markers with one projection call and one scatter call.
+
+    Marker sizes are five times the value, capped at size_cap. With color_by_rank, every distinct value gets its
+    own colour from cm.winter, highest values darkest in the green end, otherwise the colour is proportional to
+    the value relative to the maximum. Markers are drawn in ascending order of value, so larger values stay on
+    top. A legend with at most legend_bins value ranges is added instead of one entry per distinct value.
+
+    Args:
+        ax (Axes): Axes to draw on.
+        m (Basemap): Map used to project the coordinates.
+        lons (array-like): Longitudes of the markers.
+        lats (array-like): Latitudes of the markers.
+        values (array-like): Value per marker, ex: participant totals.
+        size_cap (float): Maximum marker size.
+        color_by_rank (bool): Colour by rank of distinct values instead of proportionally. Defaults to True.
+        legend_bins (int): Maximum number of legend entries, 0 for no legend. Defaults to 5.
+
+    Returns:
+        PathCollection or None: The drawn markers, or None if there was nothing to draw.
+    '''
+    values = pd.to_numeric(pd.Series(values), errors='coerce').fillna(0).to_numpy(dtype=float)
+    if len(values) == 0:
+        return None
+    lons = pd.to_numeric(pd.Series(lons), errors='coerce').to_numpy(dtype=float)
+    lats = pd.to_numeric(pd.Series(lats), errors='coerce').to_numpy(dtype=float)
+    uniques = np.unique(values)
+    palette = cm.winter(np.linspace(1, 0, len(uniques)))
+    maximum = values.max()
+
+    def color_of(value):
+        if color_by_rank:
+            return palette[np.minimum(np.searchsorted(uniques, value), len(uniques) - 1)]
+        return cm.winter(np.divide(value, maximum, out=np.zeros_like(np.asarray(value, dtype=float)),
+                                   where=maximum != 0))
+
+    def size_of(value):
+        return np.minimum(np.asarray(value) * 5, size_cap)
+
+    order = np.argsort(values, kind='stable')
+    x, y = m(lons[order], lats[order])
+    markers = ax.scatter(x, y, s=size_of(values[order]), c=color_of(values[order]), marker='o')
+
+    if legend_bins:
+        edges = np.unique(np.quantile(uniques, np.linspace(0, 1, min(legend_bins, len(uniques)) + 1)).round())
+        handles = []
+        labels = []
+        low = uniques[0]
+        for high in edges[1:] if len(edges) > 1 else edges:
+            handles.append(Line2D([], [], linestyle='', marker='o', markersize=np.sqrt(size_of(high)),
+                                  color=color_of(high)))
+            labels.append(f'{low:g}' if low == high else f'{low:g}–{high:g}')
+            low = uniques[np.searchsorted(uniques, high, side='right')] if high < uniques[-1] else high
+        ax.legend(handles, labels, loc='lower right', fontsize='x-small', title_fontsize='x-small',
+                  title='Teilnehmer')
+    return markers
+
+
+STATE_LIST = [
+    'Baden-Württemberg',
+    'Bayern',
+    'Berlin',
+    'Brandenburg',
+    'Bremen',
+    'Hamburg',
+    'Hessen',
+    'Mecklenburg-Vorpommern',
+    'Niedersachsen',
+    'Nordrhein-Westfalen',
+    'Rheinland-Pfalz',
+    'Saarland',
+    'Sachsen',
+    'Sachsen-Anhalt',
+    'Schleswig-Holstein',
+    'Thüringen'
+]
+
+# The initial map falls back to this view if Deutschland was removed from the Views table
+DEUTSCHLAND_VIEW = ViewRecord('Deutschland', 51.1657, 10.4515, 5.866, 47.2701, 15.0418, 55.0583)
+
+'''
+https://gdz.bkg.bund.de/index.php/default/wmts-topplusopen-wmts-topplus-open.html
+web
+web_grau
+web_scale
+web_scale_grau
+web_light
+web_light_grau
+'''
+WMS_SERVER = 'https://sgx.geodatenzentrum.de/wms_topplus_open?request=GetCapabilities&service=wms'
+
+
+class MapRenderer:
+    '''
+    Draws map views using the on-disk Basemap, WMS and shapefile caches under Plotter_Output/Cache. It holds no Qt
+    state, so the window and the headless renderer share it, and every process using the same folder shares the
+    cached assets.
+
+    Attributes:
+        basemapCache (BasemapCache): Cache of Basemap projections per view.
+        wmsCache (WmsImageCache): Disk cache of the TopPlus WMS background images.
+        shapeStore (ShapeStore): Preparsed DEU_adm1 state boundaries.
+    '''
+    def __init__(self, base_path, offline=False):
+        cache_path = os.path.join(base_path, 'Plotter_Output', 'Cache')
+        self.basemapCache = BasemapCache(cache_path=os.path.join(cache_path, 'basemap'))
+        self.wmsCache = WmsImageCache(WMS_SERVER, os.path.join(cache_path, 'wms'), offline=offline)
+        self.shapeStore = ShapeStore(os.path.join(base_path, 'shapefiles', 'DEU_adm1'),
+                                     os.path.join(cache_path, 'DEU_adm1.npz'))
+
+    def render(self, figure, df_stats, llc_lat, llc_lon, urc_lat, urc_lon, view='Deutschland', resolution='h',
+               cancelled=None, index=None, clusters=None, choropleth=False, df_events=None):
+        '''
+        Draws the map of a view onto a figure. Only the Stats locations inside the view (see stats_in_view) are
+        projected and drawn. With clusters, the locations are drawn as the clusters of the zoom level matching the
+        view and the size of the axes instead, each labelled with its summed participants if it holds more than
+        one school. With choropleth, Germany and the states are drawn as states shaded by their total participants
+        and labelled with participants and events, with the markers on top. Schools whose coordinates lie outside
+        the Bundesland of their events are marked with a red cross.
+
+        Args:
+            figure (matplotlib.figure.Figure): Figure to draw on. It is cleared first.
+            df_stats (pd.Dataframe): Dataframe of stats relating to how many events a school/city have held.
+            llc_lat (float): Latitude - Lower left corner of view window
+            llc_lon (float): Longitude - Lower left corner of view window
+            urc_lat (float): Latitude - Upper right corner of view window
+            urc_lon (float): Longitude - Upper right corner of view window
+            view (str): Name of the view. Germany and the states get state borders, other views are cities.
+                Defaults to 'Deutschland'
+            resolution (str): Basemap coastline resolution, 'c', 'l', 'i' or 'h'. Defaults to 'h'
+            cancelled (threading.Event): Optional. When set, the render stops after its current stage.
+            index (GridIndex): Optional. Index of df_stats, built on the fly if not given.
+            clusters (ClusterLayer): Optional. Clusters of df_stats to draw instead of the single locations.
+            choropleth (bool): Shade the states of Germany and the state views. Defaults to False.
+            df_events (pd.Dataframe): Optional. Events dataframe, used to flag schools in the wrong state.
+
+        Returns:
+            matplotlib.figure.Figure: The figure, or None if the render was cancelled.
+        '''
+        def is_cancelled():
+            return cancelled is not None and cancelled.is_set()
+
+        figure.clf()
+        ax = figure.add_subplot(111)
+        '''
+        resolution: c (crude), l (low), i (intermediate), h (high), f (full) or None
+        projection: 'merc' (Mercator), 'cyl' (Cylindrical Equidistant), 'mill' (Miller Cylindrical), 'gall' (Gall Stereographic Cylindrical), 'cea' (Cylindrical Equal Area), 'lcc' (Lambert Conformal), 'tmerc' (Transverse Mercator), 'omerc' (Oblique Mercator), 'nplaea' (North-Polar Lambert Azimuthal), 'npaeqd' (North-Polar Azimuthal Equidistant), 'nplaea' (South-Polar Lambert Azimuthal), 'spaeqd' (South-Polar Azimuthal Equidistant), 'aea' (Albers Equal Area), 'stere' (Stereographic), 'robin' (Robinson), 'eck4' (Eckert IV), 'eck6' (Eckert VI), 'kav7' (Kavrayskiy VII), 'mbtfpq' (McBryde-Thomas Flat-Polar Quartic), 'sinu' (Sinusoidal), 'gall' (Gall Stereographic Cylindrical), 'hammer' (Hammer), 'moll' (Mollweid
+        espg: 3857 (Web Mercator)
+        '''
+        m = self.basemapCache.get(llc_lat, llc_lon, urc_lat, urc_lon, resolution=resolution, epsg=3857)
+        if is_cancelled():
+            return None
+        background = [m.drawcountries(ax=ax), self.wmsCache.draw(m, ax, "web_light")]
+        if is_cancelled():
+            return None
+        background.append(m.drawcoastlines(ax=ax))
+        if choropleth and (view == 'Deutschland' or view in STATE_LIST):
+            self.draw_choropleth(m, ax, df_stats, df_events)
+        if clusters is not None:
+            box = ax.get_window_extent()
+            zoom = ClusterLayer.zoom_for(llc_lat, llc_lon, urc_lat, urc_lon, box.width, box.height)
+            df_view = clusters.query(zoom, llc_lat, llc_lon, urc_lat, urc_lon)
+            column = 'TotalParticipants'
+        else:
+            df_view = stats_in_view(df_stats, llc_lat, llc_lon, urc_lat, urc_lon, index)
+            column = 'CityParticipantsTotal' if view == 'Deutschland' or view in STATE_LIST else 'TotalParticipants'
+        if view == 'Deutschland' or view in STATE_LIST:
+            '''
+            Handle drawing Germany or the states
+            '''
+            background.append(self.shapeStore.draw(m, ax))
+
+            draw_markers(ax, m, df_view['Longitude'], df_view['Latitude'], df_view[column],
+                         size_cap=100, color_by_rank=True)
+        else:
+            '''
+            Handle drawing the cities
+            '''
+            draw_markers(ax, m, df_view['Longitude'], df_view['Latitude'], df_view[column],
+                         size_cap=200, color_by_rank=False)
+        if clusters is not None:
+            grouped = df_view[df_view['Count'] > 1]
+            x, y = m(grouped['Longitude'].to_numpy(), grouped['Latitude'].to_numpy())
+            for x_, y_, value in zip(x, y, grouped['TotalParticipants']):
+                ax.annotate(f'{value:g}', (x_, y_), ha='center', va='center', fontsize='xx-small', color='white',
+                            fontweight='bold')
+        # Vector exports embed the background layers as one image each instead of many thousand paths;
+        # markers and legend stay vectors
+        for artist in background:
+            if artist is not None:
+                artist.set_rasterized(True)
+        return figure
+
+    def draw_choropleth(self, m, ax, df_stats, df_events=None):
+        '''
+        Shades every state by the participants of the schools inside it and labels it with its participants and
+        events. The schools are assigned to states by their coordinates, see ShapeStore.state_assignments. The
+        colorbar is drawn into an inset of ax, replacing the one of an earlier call, so the map keeps its size.
+
+        Args:
+            m (Basemap): Target map.
+            ax (Axes): Axes to draw on.
+            df_stats (pd.Dataframe): Stats dataframe.
+            df_events (pd.Dataframe): Optional. Events dataframe, used to flag schools in the wrong state.
+
+        Returns:
+            None
+        '''
+        states = self.shapeStore.state_assignments(df_stats)
+        totals = df_stats[['TotalParticipants', 'EventCount']].groupby(states.to_numpy()).sum()
+        self.shapeStore.draw_choropleth(m, ax, totals['TotalParticipants'])
+        labels = self.shapeStore.label_points()
+        for name, row in totals.iterrows():
+            x, y = m(*labels[name])
+            ax.annotate(f"{row['TotalParticipants']:g}\n{row['EventCount']:g} Events", (x, y), ha='center',
+                        va='center', fontsize='xx-small')
+        if df_events is not None:
+            flagged = state_mismatches(df_stats, df_events, states)
+            if not flagged.empty:
+                x, y = m(flagged['Longitude'].to_numpy(dtype=float), flagged['Latitude'].to_numpy(dtype=float))
+                marks = ax.scatter(x, y, marker='x', c='red', s=30, zorder=3)
+                # Added as an artist so the marker legend drawn afterwards does not replace it
+                ax.add_artist(ax.legend([marks], ['Bundesland mismatch'], loc='lower left', fontsize='x-small'))
+        for child in ax.child_axes:
+            if child.get_label() == 'choropleth colorbar':
+                child.remove()
+        mappable = cm.ScalarMappable(cmap=cm.winter_r, norm=matplotlib.colors.Normalize(
+            0, max(float(totals['TotalParticipants'].max()), 1.0) if len(totals) else 1.0))
+        cax = ax.inset_axes([1.02, 0.2, 0.025, 0.6], label='choropleth colorbar')
+        ax.figure.colorbar(mappable, cax=cax, alpha=0.6, label='Teilnehmer')
+
+
+EXPORT_FORMATS = [('png', 300), ('png', 96), ('svg', 150), ('pdf', 300)]
+
+
+def parse_export_formats(text):
+    '''
+    Parses export formats written as "png:300,png:96,svg,pdf". The dpi defaults to 300.
+
+    Args:
+        text (str): Comma separated formats, each optionally followed by ":dpi".
+
+    Returns:
+        list of tuple: (format, dpi) pairs.
+    '''
+    formats = []
+    for item in text.split(','):
+        fmt, _, dpi = item.strip().lower().partition(':')
+        if fmt not in ('png', 'svg', 'pdf'):
+            raise ValueError(f'unsupported export format: {fmt}')
+        formats.append((fmt, int(dpi) if dpi else 300))
+    return formats
+
+
+def export_paths(out_path, view, formats=EXPORT_FORMATS):
+    '''
+    Names the files export_figure writes. The first entry of each format gets the plain view name
+    (ex: Berlin.png), further entries of the same format get their dpi appended (ex: Berlin_96dpi.png).
+
+    Args:
+        out_path (str): Output folder.
+        view (str): Name of the view.
+        formats (list of tuple): (format, dpi) pairs. Defaults to EXPORT_FORMATS.
+
+    Returns:
+        list of str: One path per format entry.
+    '''
+    paths = []
+    seen = set()
+    for fmt, dpi in formats:
+        suffix = f'_{dpi}dpi' if fmt in seen else ''
+        seen.add(fmt)
+        paths.append(os.path.join(out_path, f'{view}{suffix}.{fmt}'))
+    return paths
+
+
+def export_figure(figure, out_path, view, formats=EXPORT_FORMATS):
+    '''
+    Writes an already rendered figure in several formats in one pass. The raster formats are rasterized once at
+    the highest requested dpi and downsampled for the others. Vector formats are drawn once each, with the
+    background layers embedded as images at their dpi (see MapRenderer.render).
+
+    The figure is only borrowed: its canvas and dpi are restored afterwards, but it must not be drawn by another
+    thread meanwhile. To export a figure shown in the window, export a copy.
+
+    Args:
+        figure (matplotlib.figure.Figure): The rendered map.
+        out_path (str): Output folder.
+        view (str): Name of the view, used for the file names.
+        formats (list of tuple): (format, dpi) pairs. Defaults to EXPORT_FORMATS.
+
+    Returns:
+        list of str: The written files.
+    '''
+    paths = export_paths(out_path, view, formats)
+    original_canvas = figure.canvas
+    original_dpi = figure.dpi
+    try:
+        raster = [(dpi, path) for (fmt, dpi), path in zip(formats, paths) if fmt == 'png']
+        if raster:
+            max_dpi = max(dpi for dpi, _ in raster)
+            canvas = FigureCanvasAgg(figure)
+            figure.dpi = max_dpi
+            canvas.draw()
+            image = Image.fromarray(np.asarray(canvas.buffer_rgba()))
+            for dpi, path in raster:
+                scaled = image
+                if dpi != max_dpi:
+                    size = (max(1, round(image.width * dpi / max_dpi)), max(1, round(image.height * dpi / max_dpi)))
+                    scaled = image.resize(size, Image.LANCZOS)
+                scaled.save(path, format='png', dpi=(dpi, dpi))
+        for (fmt, dpi), path in zip(formats, paths):
+            if fmt != 'png':
+                figure.savefig(path, format=fmt, dpi=dpi)
+    finally:
+        figure.dpi = original_dpi
+        figure.set_canvas(original_canvas)
+    return paths
+
+
+def view_fingerprint(view, df_stats, formats=EXPORT_FORMATS, index=None, cluster=False):
+    '''
+    Fingerprints everything a saved view depends on: its name and bounding box, the export formats and the
+    Stats rows drawn in it, which are the schools inside the view (see stats_in_view), so new events elsewhere
+    leave the view unchanged.
+
+    Args:
+        view (ViewRecord): The view.
+        df_stats (pd.DataFrame): Stats dataframe.
+        formats (list of tuple): (format, dpi) pairs that are exported. Defaults to EXPORT_FORMATS.
+        index (GridIndex): Optional. Index of df_stats, built on the fly if not given.
+        cluster (bool): Whether the markers are clustered. Defaults to False.
+
+    Returns:
+        str: Hex digest of the inputs.
+    '''
+    bbox = list(view.bbox)
+    rows = stats_in_view(df_stats, *bbox, index)
+    digest = hashlib.sha1(json.dumps([view.name, bbox, [[fmt, int(dpi)] for fmt, dpi in formats],
+                                      bool(cluster)]).encode())
+    digest.update(pd.util.hash_pandas_object(rows.astype(str), index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def run_app():
+    # Run as a script this module is __main__; registering it under its own name keeps ClimatePlotterGui from
+    # importing and initializing a second copy
+    sys.modules.setdefault('ClimatePlotter3', sys.modules[__name__])
+    # The window lives in ClimatePlotterGui, so rendering headless never imports Qt
+    import ClimatePlotterGui
+    ClimatePlotterGui.run_app()
+
+
+_headless = {}
+
+
+def _init_headless_worker(base_path, df_stats, offline, cluster=False):
+    '''
+    Process pool initializer: every worker builds its own MapRenderer on the shared on-disk caches.
+    '''
+    matplotlib.use('Agg')
+    _headless['renderer'] = MapRenderer(base_path, offline)
+    _headless['stats'] = df_stats
+    _headless['index'] = GridIndex.from_stats(df_stats)
+    _headless['clusters'] = ClusterLayer(df_stats) if cluster else None
+
+
+def _render_headless_view(view, out_path, formats):
+    '''
+    Renders one view in a worker process and exports it.
+
+    Args:
+        view (ViewRecord): The view.
+        out_path (str): Output folder.
+        formats (list of tuple): (format, dpi) pairs to export.
+
+    Returns:
+        float: Seconds spent on the view.
+    '''
+    start = time.perf_counter()
+    figure = Figure()
+    _headless['renderer'].render(figure, _headless['stats'], *view.bbox, view.name, index=_headless['index'],
+                                 clusters=_headless['clusters'])
+    export_figure(figure, out_path, view.name, formats)
+    return time.perf_counter() - start
+
+
+def run_headless(argv=None):
+    '''
+    Renders saved views to Plotter_Output without opening a window, using the Agg backend and a
+    process pool. The workers share the Basemap, WMS and shapefile caches on disk. A view is skipped if its
+    fingerprint (see view_fingerprint) matches the one recorded for its last output, unless --force is given.
+
+    Args:
+        argv (list of str): Command line arguments, defaults to sys.argv[1:].
+
+    Returns:
+        int: 0 if every view rendered or was skipped, 1 if any view failed.
+    '''
+    matplotlib.use('Agg')
+    parser = argparse.ArgumentParser(description='Render saved map views to Plotter_Output without the GUI.')
+    parser.add_argument('views', nargs='*', help='Names of the views to render. Defaults to all views.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of worker processes.')
+    parser.add_argument('--formats', type=parse_export_formats,
+                        default=EXPORT_FORMATS, help='Export formats as "png:300,png:96,svg:150,pdf:300" (the default).')
+    parser.add_argument('--force', action='store_true', help='Render views even if their inputs are unchanged.')
+    parser.add_argument('--offline', action='store_true', help='Only use cached WMS backgrounds.')
+    parser.add_argument('--cluster', action='store_true', help='Cluster dense markers as in the window.')
+    args = parser.parse_args(argv)
+
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    out_path = os.path.join(base_path, 'Plotter_Output')
+    fingerprint_path = os.path.join(out_path, 'Cache', 'headless_renders.json')
+    store = SqliteStore(os.path.join(out_path, 'ClimatePlotter.sqlite'))
+    if store.created:
+        excel_path = os.path.join(out_path, 'ClimatePlotter.xlsx')
+        if os.path.exists(excel_path):
+            store.write(*ExcelStore(excel_path).read())
+        store.write_views(read_xlsx(os.path.join(base_path, 'Views.xlsx'), {0: VIEW_SCHEMA})[0])
+    df_stats = store.read_stats()
+    # Names are unique in the output folder, so the first entry of a duplicated view wins as in the window
+    registry = ViewRegistry(store)
+    views = {view.name: view for view in registry}
+    unknown = [name for name in args.views if name not in views]
+    if unknown:
+        parser.error(f"unknown views: {', '.join(unknown)}")
+    names = args.views or list(views)
+
+    try:
+        with open(fingerprint_path) as file:
+            fingerprints = json.load(file)
+    except (OSError, ValueError):
+        fingerprints = {}
+
+    jobs = {}
+    index = GridIndex.from_stats(df_stats)
+    for name in names:
+        fingerprint = view_fingerprint(views[name], df_stats, args.formats, index, args.cluster)
+        if (not args.force and fingerprints.get(name) == fingerprint
+                and all(os.path.exists(path) for path in export_paths(out_path, name, args.formats))):
+            print(f'{name}: unchanged, skipped')
+        else:
+            jobs[name] = fingerprint
+
+    # Build the shared state borders cache once, rather than in every worker at the same time
+    MapRenderer(base_path, args.offline).shapeStore.load()
+    failed = False
+    start = time.perf_counter()
+    if jobs:
+        workers = max(1, min(args.workers or 1, len(jobs)))
+        with ProcessPoolExecutor(workers, initializer=_init_headless_worker,
+                                 initargs=(base_path, df_stats, args.offline, args.cluster)) as executor:
+            futures = {executor.submit(_render_headless_view, views[name], out_path, args.formats): name
+                       for name in jobs}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    print(f'{name}: {future.result():.2f} s')
+                    fingerprints[name] = jobs[name]
+                except Exception as e:
+                    print(f'{name}: failed ({e})')
+                    fingerprints.pop(name, None)
+                    failed = True
+        temp_path = fingerprint_path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(fingerprints, file, indent=1)
+        os.replace(temp_path, fingerprint_path)
+    print(f'{len(jobs)} rendered, {len(names) - len(jobs)} skipped in {time.perf_counter() - start:.2f} s')
+    return 1 if failed else 0
 
 
 if __name__ == '__main__':
+    # In the frozen build the process pool workers start this executable again; this hands them to the pool
+    multiprocessing.freeze_support()
+    if '--headless' in sys.argv[1:]:
+        sys.exit(run_headless([arg for arg in sys.argv[1:] if arg != '--headless']))
     run_app()
@@ -1,11 +1,14 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
+# The offline PLZ gazetteer is not built here, run tools/build_gazetteer.py first to ship it with the app.
+# Without shapefiles/PLZ_Gazetteer.npz the build works but has no offline post code lookup.
 
 a = Analysis(
     ['ClimatePlotter3.py'],
     pathex=["D:\Projects\Programming\Python\ClimatePlotter\venv"],
     binaries=[],
-    datas=[],
+    datas=[(os.path.join(SPECPATH, 'shapefiles'), 'shapefiles')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,2814 @@
+import os
+import sys
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from PySide6.QtWidgets import *
+from PySide6.QtGui import QIcon
+from PySide6.QtCore import *
+import pandas as pd
+import matplotlib
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from geopy.geocoders import Nominatim
+from geopy.exc import GeopyError
+# Imported after PySide6 so matplotlib binds to it without a backend having been selected
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from ClimatePlotter3 import (AddressError, BatchGeocoder, ClusterLayer, DataModel, ExcelStore, GeocodeCache,
+                             MapRenderer, PlzGazetteer, SqliteStore, ViewRecord, ViewRegistry, DEUTSCHLAND_VIEW,
+                             EVENT_COLUMNS, EVENT_SCHEMA, EXPORT_FORMATS, STATE_LIST, STATS_SCHEMA, VIEW_SCHEMA,
+                             address_fingerprint, choose_resolution, compare_statistics, compute_statistics, event_key,
+                             export_figure, osm_fields, parse_input_file, read_xlsx, school_key, score_import_row,
+                             state_mismatches, update_statistics)
+
+
+class WorkerSignals(QObject):
+    '''
+    Signals emitted by a Worker, delivered to the main thread through Qt's queued connections.
+    '''
+    finished = Signal(object)
+    error = Signal(str)
+
+
+class Worker:
+    '''
+    A function to run on a ThreadPoolExecutor, emitting its result through WorkerSignals. The signals object
+    lives on the main thread, so the slots run there.
+
+    Python threads are used rather than a QThreadPool: Qt's pool threads drop their Python thread state between
+    runs, which leaves pyproj's per-thread context dangling and crashes the next Basemap built on that thread.
+
+    Attributes:
+        signals (WorkerSignals): finished(result) on success, error(message) if the function raised.
+        cancelled (threading.Event): Set to drop the worker if it has not started yet. Long running functions
+            can be handed the same event to stop early.
+    '''
+    def __init__(self, fn, *args, **kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.cancelled = threading.Event()
+
+    def start(self, executor):
+        '''
+        Submits the worker to an executor.
+
+        Args:
+            executor (ThreadPoolExecutor): The executor to run on.
+
+        Returns:
+            None
+        '''
+        executor.submit(self.run)
+
+    def run(self):
+        if self.cancelled.is_set():
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+class LectureMapApp(QMainWindow):
+    """
+    A GUI application for visualizing and managing lecture and event data on a map.
+
+    The `LectureMapApp` class provides a user interface built with Pyside6 that allows users to interact with
+    event and view data stored in a SQLite database, with Excel workbooks as import and export format. Users can add, edit, remove, and plot lecture or event locations
+    on a map. The application supports custom views, allows for the import of event data, and provides the ability
+    to save and manage these views for future use.
+
+    Attributes:
+        excelFilePath (str): The file path to the ClimatePlotter Excel document, a journaled copy of the database.
+        viewsFilePath (str): The file path to the Views Excel document, migrated once and used for exports.
+        databasePath (str): The file path to the SQLite database holding the Events, Stats and Views tables.
+        store (SqliteStore): Row level access to the Events, Stats and Views tables.
+        workbook (ExcelStore): The ClimatePlotter workbook, kept up to date through its journal.
+        data (DataModel): In-memory Events and Stats shared by all read paths, flushed to the store deliberately.
+        plotPath (str): The directory path where plot output files are saved.
+        exportFormats (list of tuple): (format, dpi) pairs written when a plot is saved.
+        views (ViewRegistry): The saved views, keyed by name and persisted to the Views table.
+        stateList (list of str): A list of German states used for state selection and validation within the application.
+        canvas (QWidget): The canvas where map plots are rendered.
+        plotListWidget (QListWidget): A widget displaying the list of available views for selection.
+        nameEdit (QLineEdit): A text field for entering the name of the event or institution.
+        addressEdit (QLineEdit): A text field for entering the address of the event or institution.
+        cityEdit (QLineEdit): A text field for entering the city of the event or institution.
+        plzEdit (QLineEdit): A text field for entering the postal code (PLZ) of the event or institution.
+        stateCombo (QComboBox): A dropdown for selecting the state of the event or institution.
+        tableEdit (QLineEdit): A text field for entering the number of tables at the event.
+        participantEdit (QLineEdit): A text field for entering the number of participants at the event.
+        viewLat (QLineEdit): A text field for entering the latitude of the map view.
+        viewLon (QLineEdit): A text field for entering the longitude of the map view.
+        viewLLCLat (QLineEdit): A text field for entering the lower-left corner latitude of the map view.
+        viewLLCLon (QLineEdit): A text field for entering the lower-left corner longitude of the map view.
+        viewURCLat (QLineEdit): A text field for entering the upper-right corner latitude of the map view.
+        viewURCLon (QLineEdit): A text field for entering the upper-right corner longitude of the map view.
+        viewName (QLineEdit): A text field for entering the name of the map view.
+        df_events (pd.DataFrame): A DataFrame containing event data loaded from the ClimatePlotter Excel file.
+        geocodeCache (GeocodeCache): Persistent cache of Nominatim results used by get_address and get_coordinates.
+        plzGazetteer (PlzGazetteer): Offline post code geocoder, answers city level coordinate lookups.
+        geocodeRateLimit (float): Maximum Nominatim requests per second during bulk imports.
+        batchGeocoder (BatchGeocoder): Concurrent, rate limited geocoder used to pre-resolve bulk imports.
+        autoAcceptThreshold (float): Confidence from score_import_row above which bulk import rows are auto-accepted.
+        basemapCache (BasemapCache): Cache of Basemap projections per view, persisted under Plotter_Output/Cache.
+        wmsCache (WmsImageCache): Disk cache of the TopPlus WMS background images.
+        shapeStore (ShapeStore): Preparsed DEU_adm1 state boundaries.
+        mapRenderer (MapRenderer): Draws the maps; owns basemapCache, wmsCache and shapeStore.
+        renderExecutor (ThreadPoolExecutor): Single thread on which maps are rendered.
+        exportExecutor (ThreadPoolExecutor): Thread on which saved maps are exported and the workbook journal is
+            compacted.
+        lookupExecutor (ThreadPoolExecutor): Thread on which address lookups run.
+        compaction (Future or None): The last compaction of the workbook journal submitted to exportExecutor.
+
+    Methods:
+        __init__(): Initializes the application, sets up file paths, loads initial data, and configures the user interface.
+        initUI(): Sets up the user interface components and layouts for the application.
+        read_views_file(file_path): Reads the views from the specified Excel file and returns them as a DataFrame.
+        read_excel_file(file_path): Reads event data from the specified Excel file and returns it as a DataFrame.
+        report_read_errors(file_path, errors): Lists the workbook cells that could not be read as their declared type.
+        read_data(): Returns the Events and Stats frames of the shared data model.
+        write_data(df_events, df_stats): Replaces the Events and Stats frames and flushes them to the database.
+        flush_data(): Writes unflushed changes of the data model to the database.
+        get_coordinates(city, state, plz, address=None): Retrieves the latitude and longitude coordinates for a given location.
+        plot_map(df_events, df_stats, plotPath, canvas, lat, lon, llc_lat, llc_lon, urc_lat, urc_lon, view_name, doSave=False): Plots the event data on a map.
+        submit_render(df_stats, llc_lat, llc_lon, urc_lat, urc_lon, view, resolution, doSave, on_done): Renders a view on the render thread and shows it when ready.
+        onLookupAddressButtonClicked(): Handles the event when the 'Lookup Address' button is clicked.
+        onPreViewButtonClicked(): Handles the event when the 'Pre-View' button is clicked.
+        onViewAddButtonClicked(): Handles the event when the 'Add View' button is clicked.
+        onCityLookupButtonClicked(): Handles the event when the 'City Lookup' button is clicked.
+        onViewRemoveButtonClicked(): Handles the event when the 'Remove View' button is clicked.
+        recalculateStatistics(df_events, df_stats, lat=None, lon=None): Recalculates statistics for the events and updates the database.
+        getPlotItem(): Retrieves the view currently selected in the plot list widget.
+        create_msg_box(title, message, icon='information'): Creates and displays a message box with the specified title, message, and icon.
+        clearAll(): Clears all input fields in the user interface.
+        setupPlotListWidget(): Sets up and populates the plot list widget with available views.
+
+    """
+    def __init__(self):
+        super().__init__()
+
+        self.excelFilePath = os.path.join(os.path.dirname(__file__), 'Plotter_Output', 'ClimatePlotter.xlsx')
+        self.viewsFilePath = os.path.join(os.path.dirname(__file__), 'Views.xlsx')
+        self.plotPath = 'Plotter_Output'
+        self.exportFormats = list(EXPORT_FORMATS)
+        self.cachePath = os.path.join(os.path.dirname(__file__), 'Plotter_Output', 'Cache')
+        self.geocodeCache = GeocodeCache(os.path.join(self.cachePath, 'geocode.sqlite'))
+        self.plzGazetteer = PlzGazetteer(os.path.join(os.path.dirname(__file__), 'shapefiles', 'PLZ_Gazetteer.npz'))
+        # Nominatim's usage policy allows at most one request per second
+        self.geocodeRateLimit = 1.0
+        # Bulk import rows scoring at least this are imported without review when auto-accept is on
+        self.autoAcceptThreshold = 0.8
+        self.batchGeocoder = BatchGeocoder(self.geocodeCache, self.geocodeRateLimit)
+        self.mapRenderer = MapRenderer(os.path.dirname(__file__))
+        self.basemapCache = self.mapRenderer.basemapCache
+        self.wmsCache = self.mapRenderer.wmsCache
+        self.shapeStore = self.mapRenderer.shapeStore
+
+        self.setWindowTitle("Lecture Map Plotter")
+        self.setGeometry(100, 100, 1200, 900)
+
+        self.databasePath = os.path.join(os.path.dirname(__file__), 'Plotter_Output', 'ClimatePlotter.sqlite')
+        self.store = SqliteStore(self.databasePath)
+        self.workbook = ExcelStore(self.excelFilePath)
+        if self.store.created:
+            # One-time migration of the workbooks the app used before the database existed
+            if self.workbook.exists():
+                errors = {}
+                self.store.write(*self.workbook.read(errors))
+                self.report_read_errors(self.excelFilePath, errors)
+            self.store.write_views(self.read_views_file(self.viewsFilePath))
+        self.data = DataModel(self.store, self.workbook)
+
+        self.views = ViewRegistry(self.store)
+
+        self.stateList = list(STATE_LIST)
+
+        if self.geocodeCache.created:
+            df_events, df_stats = self.read_data()
+            self.geocodeCache.seed(df_events, df_stats)
+
+        self.initUI()
+
+    def get_address(self, name):
+        '''
+        Uses OSM's Nominatim to get a German address for a particular search name.
+        country_codes set to de to limit search to Germany.
+        addressdetails set to True to get more information about the address OSM has for the search object.
+        Results are served from the geocode cache when available, so the network is only used on a miss.
+
+        Args:
+            name (str): Search string, ex: "HKA" or "Karlsruhe Institute of Technology".
+
+        Returns:
+            dict: geopy.location.Location.raw - dictionary containing unparsed location information returned
+                from Nominatim, or None if nothing was found or the lookup failed. Both are reported to the user.
+        '''
+        try:
+            raw_address = self.fetch_address(name)
+        except AddressError as e:
+            self.create_msg_box("Address Error", f"Error: {e} \n\nThe address lookup failed.", 'warning')
+            return None
+        if raw_address is None:
+            self.address_not_found(name)
+        return raw_address
+
+    def fetch_address(self, name):
+        '''
+        The lookup behind get_address without any UI, so it can run on a worker thread.
+
+        Args:
+            name (str): Search string, ex: "HKA" or "Karlsruhe Institute of Technology".
+
+        Returns:
+            dict: geopy.location.Location.raw, or None if Nominatim found nothing.
+
+        Raises:
+            AddressError: If Nominatim could not be reached or returned an error.
+        '''
+        raw_address = self.geocodeCache.get('address', name)
+        if raw_address is not None:
+            return raw_address
+        geolocator = Nominatim(user_agent="http")
+        try:
+            location = geolocator.geocode(name, country_codes="de", addressdetails=True)
+        except GeopyError as e:
+            raise AddressError(f"Nominatim lookup failed: {e}") from e
+        if location is None:
+            return None
+        self.geocodeCache.put('address', name, location.raw)
+        return location.raw
+
+    def address_not_found(self, name):
+        '''
+        Tells the user that an address search returned nothing.
+
+        Args:
+            name (str): The search string.
+
+        Returns:
+            None
+        '''
+        self.create_msg_box("Address Error",
+                            f"Error: {'Bad search results returned'} \n\n"
+                            f"{name} returned no results.",
+                            'warning')
+
+    def start_address_lookup(self, name, slot):
+        '''
+        Looks up an address on the lookup thread and hands the result to a slot on the main thread.
+
+        Args:
+            name (str): The search string.
+            slot (callable): Called with the raw address. Not called if nothing was found or the lookup failed;
+                both are reported to the user instead.
+
+        Returns:
+            None
+        '''
+        worker = Worker(self.fetch_address, name)
+
+        def finished(raw_address):
+            self.lookupWorkers.remove(worker)
+            self.update_busy_state()
+            if raw_address is None:
+                self.address_not_found(name)
+            else:
+                slot(raw_address)
+
+        def failed(message):
+            self.lookupWorkers.remove(worker)
+            self.update_busy_state()
+            self.create_msg_box("Address Error", f"Error: {message} \n\nThe address lookup failed.", 'warning')
+
+        worker.signals.finished.connect(finished)
+        worker.signals.error.connect(failed)
+        # Pending workers are kept referenced until their result is delivered
+        self.lookupWorkers.append(worker)
+        self.update_busy_state()
+        worker.start(self.lookupExecutor)
+
+    def get_coordinates(self, city_name, state_name, plz_code, address=''):
+        '''
+        Gets latitude and longitude coordinates for the search object. City level searches without an address are
+        answered from the offline PLZ gazetteer when it knows the post code. Everything else uses OSM's Nominatim,
+        with results served from the geocode cache when available, so the network is only used on a miss.
+
+        Args:
+           city_name (str): City to be searched. Ex: "Regensburg"
+           state_name (str): State to be searched. Ex: "Bayern"
+           plz_code (str): Post code. Ex: "76139"
+           address (str): Street Address of search object. Defaults to ''.
+
+        Returns:
+            str, str: latitude and longitude from the gazetteer or Nominatim's location dict.
+        '''
+        if not address:
+            lat, lon = self.plzGazetteer.get_coordinates(plz_code)
+            if lat is not None:
+                return lat, lon
+        query = address + ", " + city_name + ", " + state_name + ", " + str(plz_code) + ", Germany"
+        coordinates = self.geocodeCache.get('coordinates', query)
+        if coordinates is not None:
+            return coordinates[0], coordinates[1]
+        geolocator = Nominatim(user_agent="http")
+        try:
+            location = geolocator.geocode(query)
+        except GeopyError:
+            location = None
+        if location:
+            self.geocodeCache.put('coordinates', query, [location.latitude, location.longitude])
+            return location.latitude, location.longitude
+        return None, None
+
+    def read_excel_file(self, file_path):
+        '''
+        Reads Events and Stats from a ClimatePlotter excel workbook, or if they do not exist, creates them. A
+        missing Stats sheet is computed from the Events sheet. Nothing is written to the database; the caller
+        stores the returned frames. Only used to import workbooks; the app reads its data from the database with
+        read_data.
+
+        Args:
+            file_path (str): Where to find the excel sheet
+
+        Returns:
+            pd.Dataframe, pd.Dataframe: Events dataframe, Stats dataframe
+        '''
+        try:
+            errors = {}
+            frames = read_xlsx(file_path, {'Events': EVENT_SCHEMA, 'Stats': STATS_SCHEMA}, errors=errors)
+            self.report_read_errors(file_path, errors)
+            if 'Events' in frames and 'Stats' in frames:
+                df_events = frames['Events']
+                df_stats = frames['Stats']
+            else:
+                if 'Events' not in frames:
+                    df_events = pd.DataFrame(
+                        columns=['Datum', 'Hochschule', 'Adresse', 'Stadt', 'Bundesland', 'PLZ', 'Tische',
+                                 'Teilnehmer'])
+                    df_stats = pd.DataFrame(columns=['Hochschule', 'Stadt', 'PLZ', 'Latitude', 'Longitude',
+                                                     'EventCount', 'CityEventTotal', 'TotalTables',
+                                                     'TotalParticipants', 'CityParticipantsTotal'])
+                    msgText = "Events sheet not found, Stats reset"
+                elif 'Stats' not in frames:
+                    df_events = frames['Events']
+                    df_stats = pd.DataFrame(columns=['Hochschule', 'Stadt', 'PLZ', 'Latitude', 'Longitude',
+                                                     'EventCount', 'CityEventTotal', 'TotalTables',
+                                                     'TotalParticipants', 'CityParticipantsTotal'])
+                    msgText = "Stats sheet not found, created new from values in Events sheet"
+                    df_stats = compute_statistics(df_events, self.resolve_school_coordinates(df_events))
+                self.create_msg_box("Sheet Not Found", msgText, 'warning')
+            return df_events, df_stats
+        except FileNotFoundError:
+            df_events = pd.DataFrame(
+                columns=['Datum', 'Hochschule', 'Adresse', 'Stadt', 'Bundesland', 'PLZ', 'Tische', 'Teilnehmer'])
+            df_stats = pd.DataFrame(columns=['Hochschule', 'Stadt', 'PLZ', 'Latitude', 'Longitude',
+                                             'EventCount', 'CityEventTotal', 'TotalTables',
+                                             'TotalParticipants', 'CityParticipantsTotal'])
+            self.create_msg_box("File Not Found",
+                                f"{os.path.basename(file_path)} not found, starting with empty Events and Stats",
+                                'warning')
+            return df_events, df_stats
+
+    def read_data(self):
+        '''
+        Returns the Events and Stats frames of the shared data model, which only reads the database again if it
+        changed on disk. The frames must not be modified in place.
+
+        Args:
+            None
+
+        Returns:
+            pd.Dataframe, pd.Dataframe: Events dataframe, Stats dataframe
+        '''
+        return self.data.read()
+
+    def write_data(self, df_events, df_stats):
+        '''
+        Replaces the Events and Stats frames of the data model and flushes them to the database.
+
+        Args:
+            df_events (pd.DataFrame): Events dataframe.
+            df_stats (pd.DataFrame): Stats dataframe.
+
+        Returns:
+            bool: A flag indicating whether the write to the database was successful.
+        '''
+        self.data.replace(df_events, df_stats)
+        return self.data.flush()
+
+    def flush_data(self):
+        '''
+        Writes the changes made by update_excel, remove_event and edit_event to the database. Once the workbook
+        journal has grown past its limit, it is compacted on the export thread.
+
+        Args:
+            None
+
+        Returns:
+            bool: A flag indicating whether the write to the database was successful.
+        '''
+        written = self.data.flush()
+        if self.workbook.needs_compaction() and (self.compaction is None or self.compaction.done()):
+            self.compaction = self.exportExecutor.submit(self.workbook.compact)
+        return written
+
+    def import_events(self, df_new):
+        '''
+        Adds many events to the data model in one change. The Stats rows of each touched city are updated once
+        for all of its new events. The change is written to the database by flush_data.
+
+        Args:
+            df_new (pd.DataFrame): The new events, with the Events columns.
+
+        Returns:
+            None
+        '''
+        self.data.add_events(df_new)
+        df_events, df_stats = self.read_data()
+        for city, group in df_new.groupby('Stadt', sort=False):
+            df_city = df_stats[df_stats['Stadt'] == city]
+            for _, event in group.iterrows():
+                df_city = self.apply_event(df_city, event, 1)
+            self.data.set_city_stats(city, df_city)
+
+    def closeEvent(self, event):
+        '''
+        Writes unflushed changes to the database and compacts the workbook journal before the window closes.
+
+        Args:
+            event (QCloseEvent): The close event.
+
+        Returns:
+            None
+        '''
+        if not self.flush_data():
+            self.create_msg_box("Error", "Unsaved changes could not be written to the database", 'warning')
+        self.workbook.compact()
+        super().closeEvent(event)
+
+    def update_excel(self, file_path, date, name, address, city, state, plz, lat, lon, tables=0,
+                     participants=0):
+        """
+        Adds the new event to the data model. The Stats are updated incrementally: only the rows of the event's
+        city are replaced. The change is written to the database by flush_data.
+
+        Args:
+            file_path (str): [UNUSED] The path to the ClimatePlotter document.
+            date (str): The date of the event being added.
+            name (str): The name of the school or university.
+            address (str): The street address of the school or university.
+            city (str): The city of the school or university.
+            state (str): The state of the school or university.
+            plz (str): The postal code of the school or university.
+            lat (str): The latitude coordinates of the school or university, used if the school is new.
+            lon (str): The longitude coordinates of the school or university, used if the school is new.
+            tables (int): The number of tables at the event.
+            participants (int): The total number of participants at the event.
+
+        Returns:
+            None
+        """
+        event = pd.Series([date, name, address, city, state, str(plz), int(tables), int(participants)],
+                          index=EVENT_COLUMNS)
+        self.data.add_event(event)
+        self.update_city_stats(event, 1, lat, lon)
+
+    def update_city_stats(self, event, sign, lat=None, lon=None):
+        """
+        Applies a single added or removed event to the Stats rows of its city in the data model.
+
+        Args:
+            event (pd.Series): Event row.
+            sign (int): 1 to add the event, -1 to remove it.
+            lat (float, optional): Latitude of the school. Defaults to None.
+            lon (float, optional): Longitude of the school. Defaults to None.
+
+        Returns:
+            None
+        """
+        df_events, df_stats = self.read_data()
+        df_city = df_stats[df_stats['Stadt'] == event['Stadt']]
+        self.data.set_city_stats(event['Stadt'], self.apply_event(df_city, event, sign, lat, lon))
+
+    def remove_event(self, file_path, event_id):
+        """
+        Removes an event from the data model and incrementally updates the Stats rows of its city. The change is
+        written to the database by flush_data.
+
+        Args:
+            file_path (str): [UNUSED] The path to the ClimatePlotter document.
+            event_id (int): Row id of the event, its label in the index of the Events dataframe.
+
+        Returns:
+            None
+        """
+        df_events, df_stats = self.read_data()
+        event = df_events.loc[event_id]
+        self.data.delete_event(event_id)
+        self.update_city_stats(event, -1)
+
+    def edit_event(self, file_path, event_id, **fields):
+        """
+        Edits an event in the data model and incrementally updates the Stats rows by removing the old event and
+        applying the edited one. The change is written to the database by flush_data.
+
+        Args:
+            file_path (str): [UNUSED] The path to the ClimatePlotter document.
+            event_id (int): Row id of the event, its label in the index of the Events dataframe.
+            **fields: New values keyed by Events column, ex: Teilnehmer=25.
+
+        Returns:
+            None
+        """
+        df_events, df_stats = self.read_data()
+        old_event = df_events.loc[event_id]
+        new_event = old_event.copy()
+        for column, value in fields.items():
+            new_event[column] = value
+        self.data.update_event(event_id, new_event)
+        self.update_city_stats(old_event, -1)
+        self.update_city_stats(new_event, 1)
+
+    def apply_event(self, df_stats, event, sign, lat=None, lon=None):
+        """
+        Applies a single added (sign 1) or removed (sign -1) event to the Stats dataframe. If the event is the first
+        one of a school and no coordinates are given, the school is geocoded here, falling back to the
+        coordinates of the city.
+
+        Args:
+            df_stats (pd.DataFrame): Stats dataframe.
+            event (pd.Series): Event row.
+            sign (int): 1 to add the event, -1 to remove it.
+            lat (float, optional): Latitude of the school. Defaults to None.
+            lon (float, optional): Longitude of the school. Defaults to None.
+
+        Returns:
+            pd.DataFrame: The updated Stats dataframe.
+        """
+        school_exists = ((df_stats['Hochschule'] == event['Hochschule']) & (df_stats['Stadt'] == event['Stadt'])).any()
+        if sign > 0 and not school_exists:
+            if lat is None or lon is None:
+                lat, lon = self.get_coordinates(event['Stadt'], event['Bundesland'], event['PLZ'], event['Adresse'])
+                if lat is None or lon is None:
+                    lat, lon = self.get_coordinates(event['Stadt'], event['Bundesland'], event['PLZ'])
+            if lat is not None and lon is not None:
+                self.geocodeCache.put_school_coordinates([(
+                    school_key(event['Hochschule'], event['Stadt'], event['PLZ']),
+                    address_fingerprint(event['Hochschule'], event['Adresse'], event['Stadt'], event['Bundesland'],
+                                        event['PLZ']),
+                    lat, lon)])
+        return update_statistics(df_stats, event, sign, lat, lon)
+
+    def verify_statistics(self):
+        """
+        Rebuilds the statistics from the Events sheet, using the coordinates already stored in the Stats sheet so
+        that no geocoding is needed, and compares the result with the incrementally maintained Stats sheet.
+
+        Args:
+            None
+
+        Returns:
+            list of str: One message per disagreeing school, empty if the stored statistics are consistent.
+        """
+        df_events, df_stats = self.read_data()
+        df_rebuilt = compute_statistics(df_events, df_stats[['Hochschule', 'Stadt', 'Latitude', 'Longitude']])
+        return compare_statistics(df_stats, df_rebuilt)
+
+    def verify_states(self):
+        """
+        Checks the stored coordinates of every school against the Bundesland of its events, using the state
+        boundaries of the choropleth.
+
+        Args:
+            None
+
+        Returns:
+            list of str: One message per school and Bundesland whose coordinates lie in another state.
+        """
+        df_events, df_stats = self.read_data()
+        flagged = state_mismatches(df_stats, df_events, self.shapeStore.state_assignments(df_stats))
+        return [f"{row['Hochschule']}, {row['Stadt']}: located in {row['Polygon'] or 'no state'}, "
+                f"events list {row['Bundesland']}" for row in flagged.to_dict('records')]
+
+    def onOfflineToggled(self, checked):
+        '''
+        Switches the WMS background between offline mode, served from the disk cache only, and online mode.
+
+        Args:
+            checked (bool): State of the offline checkbox.
+
+        Returns:
+            None
+
+        '''
+        self.wmsCache.offline = checked
+
+    def onVerifyButtonClicked(self):
+        """
+        Handles the event when the 'Verify Statistics' button is clicked, reporting whether the stored statistics
+        agree with a full rebuild from the Events sheet, and which schools lie outside the Bundesland of their
+        events (see verify_states).
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        messages = self.verify_statistics()
+        if not messages:
+            self.create_msg_box("Statistics Verified", "Stats agree with a full rebuild from Events.")
+        else:
+            text = '\n'.join(messages[:20])
+            if len(messages) > 20:
+                text += f'\n... and {len(messages) - 20} more'
+            self.create_msg_box("Statistics Mismatch",
+                                f"Stats disagree with a full rebuild from Events:\n\n{text}\n\n"
+                                f"Use 'Recalculate Statistics' to rebuild them.",
+                                'warning')
+        mismatches = self.verify_states()
+        if mismatches:
+            text = '\n'.join(mismatches[:20])
+            if len(mismatches) > 20:
+                text += f'\n... and {len(mismatches) - 20} more'
+            self.create_msg_box("Bundesland Mismatch",
+                                f"These schools are located outside the Bundesland of their events:\n\n{text}\n\n"
+                                f"Check their addresses, the geocode may have found a place of the same name.",
+                                'warning')
+
+    def onFindDuplicatesButtonClicked(self):
+        """
+        Handles the event when the 'Find Duplicates' button is clicked. Reports the stored events that share their
+        date, school, city, tables and participants, and offers to remove all but the first of each group.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        groups = self.data.find_duplicates()
+        if not groups:
+            self.create_msg_box("No Duplicates", "Every stored event is unique.")
+            return
+        df_events, df_stats = self.read_data()
+        lines = []
+        for eventIds in groups[:20]:
+            event = df_events.loc[eventIds[0]]
+            rows = (df_events.index.get_loc(event_id) + 2 for event_id in eventIds)
+            lines.append(f"{event['Datum']} {event['Hochschule']}, {event['Stadt']}: "
+                         f"rows {', '.join(str(row) for row in rows)}")
+        if len(groups) > 20:
+            lines.append(f"... and {len(groups) - 20} more")
+        extras = [event_id for eventIds in groups for event_id in eventIds[1:]]
+        button = QMessageBox.question(self, "Duplicate Events",
+                                      f"{len(groups)} events are stored more than once:\n\n" + '\n'.join(lines) +
+                                      f"\n\nRemove the {len(extras)} extra copies?")
+        if button != QMessageBox.StandardButton.Yes:
+            return
+        for event_id in extras:
+            self.remove_event(self.excelFilePath, event_id)
+        if not self.flush_data():
+            self.create_msg_box("Error", "Duplicates removed but not saved, is the database writable?", 'warning')
+        self.drawInitialMap()
+
+    def onEditEventsButtonClicked(self):
+        """
+        Handles the event when the 'Edit Events' button is clicked. Shows the stored events in an editable table
+        and applies the changed rows with edit_event, so only the Stats rows of the touched schools are updated.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        df_events, df_stats = self.read_data()
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Edit Events - {len(df_events)} Events")
+        dialog.resize(1200, 500)
+        layout = QVBoxLayout(dialog)
+        table = QTableWidget(len(df_events), len(EVENT_COLUMNS), dialog)
+        table.setHorizontalHeaderLabels(EVENT_COLUMNS)
+        for position, (event_id, event) in enumerate(df_events.iterrows()):
+            for column, name in enumerate(EVENT_COLUMNS):
+                value = event[name]
+                item = QTableWidgetItem(value.strftime('%d.%m.%Y') if isinstance(value, pd.Timestamp) else str(value))
+                # The original text is kept to tell which cells were edited
+                item.setData(Qt.ItemDataRole.UserRole, item.text())
+                table.setItem(position, column, item)
+        table.resizeColumnsToContents()
+        layout.addWidget(table)
+        buttonBox = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttonBox.accepted.connect(dialog.accept)
+        buttonBox.rejected.connect(dialog.reject)
+        layout.addWidget(buttonBox)
+        if not dialog.exec():
+            return
+
+        edits = []
+        for position, event_id in enumerate(df_events.index):
+            fields = {}
+            for column, name in enumerate(EVENT_COLUMNS):
+                item = table.item(position, column)
+                if item.text() != item.data(Qt.ItemDataRole.UserRole):
+                    fields[name] = item.text().strip()
+            if not fields:
+                continue
+            try:
+                for name in ('Tische', 'Teilnehmer'):
+                    if name in fields:
+                        fields[name] = int(fields[name])
+            except ValueError:
+                self.create_msg_box("Input Error",
+                                    f"Row {position + 2}: Tische and Teilnehmer must be whole numbers.", 'warning')
+                return
+            edits.append((event_id, fields))
+        for event_id, fields in edits:
+            self.edit_event(self.excelFilePath, event_id, **fields)
+        if edits:
+            if not self.flush_data():
+                self.create_msg_box("Error", "Events edited but not saved, is the database writable?", 'warning')
+            self.drawInitialMap()
+
+    def plot_map(self, df_events, df_stats, save_path, canvas, lat, lon, llc_lat, llc_lon, urc_lat, urc_lon,
+                 view='Deutschland', doSave=False, resolution='h', choropleth=False):
+        '''
+        Map plotting tool using Basemap. Renders synchronously onto the canvas; the UI uses submit_render instead,
+        which renders the same map on the render thread.
+
+        Args:
+            df_events (pd.Dataframe): Dataframe of events, used to flag schools in the wrong state in choropleth mode
+            df_stats (pd.Dataframe): Dataframe of stats relating to how many events a school/city have held.
+            save_path (str): Location to save the generated map image.
+            canvas (FigureCanvasQTAgg object): Matplotlib backend object as a plot canvas for drawing the map
+            lat (float): [UNUSED] Latitude coordinate of plot center.
+            lon (float): [UNUSED] Longitude coordinate of plot center
+            llc_lat (float): Latitude - Lower left corner of view window
+            llc_lon (float): Longitude - Lower left corner of view window
+            urc_lat (float): Latitude - Upper right corner of view window
+            urc_lon (float): Longitude - Upper right corner of view window
+            view (str): Name of the view, used for title of saved map image. Defaults to 'Deutschland'
+            doSave (bool): Triggers the export of the plot in exportFormats. Defaults to False
+            resolution (str): Basemap coastline resolution, 'c', 'l', 'i' or 'h'. Defaults to 'h'
+            choropleth (bool): Shade the states by participants below the markers. Defaults to False
+
+        Returns:
+            None
+        '''
+        self.render_map(canvas.figure, df_stats, llc_lat, llc_lon, urc_lat, urc_lon, view, resolution,
+                        choropleth=choropleth, df_events=df_events)
+        canvas.draw()
+        if doSave:
+            self.save_figure(canvas.figure, save_path, view)
+
+    def render_map(self, figure, df_stats, llc_lat, llc_lon, urc_lat, urc_lon, view='Deutschland', resolution='h',
+                   cancelled=None, index=None, clusters=None, choropleth=False, df_events=None):
+        '''
+        Draws the map of a view onto a figure with the shared MapRenderer. No widget is touched, so this can run
+        on a worker thread.
+
+        Args:
+            figure (matplotlib.figure.Figure): Figure to draw on. It is cleared first.
+            df_stats (pd.Dataframe): Dataframe of stats relating to how many events a school/city have held.
+            llc_lat (float): Latitude - Lower left corner of view window
+            llc_lon (float): Longitude - Lower left corner of view window
+            urc_lat (float): Latitude - Upper right corner of view window
+            urc_lon (float): Longitude - Upper right corner of view window
+            view (str): Name of the view. Defaults to 'Deutschland'
+            resolution (str): Basemap coastline resolution, 'c', 'l', 'i' or 'h'. Defaults to 'h'
+            cancelled (threading.Event): Optional. When set, the render stops after its current stage.
+            index (GridIndex): Optional. Index of df_stats, built on the fly if not given.
+            clusters (ClusterLayer): Optional. Clusters of df_stats to draw instead of the single locations.
+            choropleth (bool): Shade the states of Germany and the state views. Defaults to False.
+            df_events (pd.Dataframe): Optional. Events dataframe, used to flag schools in the wrong state.
+
+        Returns:
+            matplotlib.figure.Figure: The figure, or None if the render was cancelled.
+        '''
+        return self.mapRenderer.render(figure, df_stats, llc_lat, llc_lon, urc_lat, urc_lon, view, resolution,
+                                       cancelled, index, clusters, choropleth, df_events)
+
+    def save_figure(self, figure, save_path, view):
+        '''
+        Exports a rendered map in all of exportFormats, named after its view. Runs on the calling thread.
+
+        Args:
+            figure (matplotlib.figure.Figure): The rendered map.
+            save_path (str): Output folder, relative to the program folder.
+            view (str): Name of the view, used as the file name.
+
+        Returns:
+            list of str: The written files.
+        '''
+        return export_figure(figure, os.path.join(os.path.dirname(__file__), save_path), view, self.exportFormats)
+
+    def submit_export(self, figure, view):
+        '''
+        Exports a map shown in the window on the export thread, so large high dpi renders don't block the UI.
+        The figure is copied first, since the window keeps drawing the original.
+
+        Args:
+            figure (matplotlib.figure.Figure): The rendered map.
+            view (str): Name of the view, used as the file name.
+
+        Returns:
+            None
+        '''
+        worker = Worker(self.save_figure, pickle.loads(pickle.dumps(figure)), self.plotPath, view)
+
+        def finished(paths):
+            self.exportWorkers.remove(worker)
+            self.update_busy_state()
+            self.statusBar().showMessage(f"Saved {', '.join(os.path.basename(path) for path in paths)}", 10000)
+
+        def failed(message):
+            self.exportWorkers.remove(worker)
+            self.update_busy_state()
+            self.create_msg_box('Save Error', f'The map of {view} could not be saved:\n\n{message}', 'warning')
+
+        worker.signals.finished.connect(finished)
+        worker.signals.error.connect(failed)
+        self.exportWorkers.append(worker)
+        self.update_busy_state()
+        worker.start(self.exportExecutor)
+
+    def submit_render(self, df_stats, llc_lat, llc_lon, urc_lat, urc_lon, view='Deutschland', resolution='h',
+                      doSave=False, on_done=None):
+        '''
+        Renders a view on the render thread and shows it on the canvas once it is ready, so the window stays
+        responsive while Basemap and the WMS background load. Dense markers are clustered if clusterCheckBox is
+        checked, and Germany and the states are shaded by participants if choroplethCheckBox is checked. Each
+        request supersedes the previous one: a queued render is dropped, a running one stops after its current
+        stage and its figure is discarded.
+
+        Args:
+            df_stats (pd.Dataframe): Dataframe of stats relating to how many events a school/city have held.
+            llc_lat (float): Latitude - Lower left corner of view window
+            llc_lon (float): Longitude - Lower left corner of view window
+            urc_lat (float): Latitude - Upper right corner of view window
+            urc_lon (float): Longitude - Upper right corner of view window
+            view (str): Name of the view. Defaults to 'Deutschland'
+            resolution (str): Basemap coastline resolution, 'c', 'l', 'i' or 'h'. Defaults to 'h'
+            doSave (bool): Exports the map on the export thread once it is shown. Defaults to False
+            on_done (callable): Optional. Called without arguments after the map is shown, unless superseded.
+
+        Returns:
+            None
+        '''
+        if self.renderRequest is not None:
+            self.renderRequest['worker'].cancelled.set()
+        # The figure is created here and only populated on the render thread. Its dpi includes the screen's
+        # pixel ratio like the canvas' own figure, so it can be swapped in as is.
+        ratio = self.canvas.device_pixel_ratio
+        figure = Figure(dpi=self.figure.dpi / ratio)
+        figure.dpi = self.figure.dpi
+        # Sized like the canvas up front, so clusters are chosen for the size the map is shown at
+        figure.set_size_inches(self.canvas.width() * ratio / figure.dpi, self.canvas.height() * ratio / figure.dpi,
+                               forward=False)
+        worker = Worker(self.render_map, figure, df_stats, llc_lat, llc_lon, urc_lat, urc_lon, view, resolution)
+        worker.kwargs['cancelled'] = worker.cancelled
+        # The index is built here, so the render thread never touches the data model
+        index = self.data.stats_index()
+        clusters = self.data.stats_clusters() if self.clusterCheckBox.isChecked() else None
+        if df_stats is self.data.df_stats:
+            worker.kwargs['index'] = index
+            worker.kwargs['clusters'] = clusters
+        elif clusters is not None:
+            worker.kwargs['clusters'] = ClusterLayer(df_stats)
+        if self.choroplethCheckBox.isChecked():
+            worker.kwargs['choropleth'] = True
+            worker.kwargs['df_events'] = self.data.df_events
+        worker.signals.finished.connect(self.onRenderFinished)
+        worker.signals.error.connect(self.onRenderError)
+        self.renderRequest = {'worker': worker, 'figure': figure, 'view': view, 'doSave': doSave, 'on_done': on_done}
+        self.update_busy_state()
+        worker.start(self.renderExecutor)
+
+    def onRenderFinished(self, figure):
+        '''
+        Shows a finished render on the canvas. Results of superseded requests are ignored.
+
+        Args:
+            figure (matplotlib.figure.Figure): The rendered figure, or None if the render was cancelled.
+
+        Returns:
+            None
+        '''
+        request = self.renderRequest
+        if request is None or figure is not request['figure']:
+            return
+        self.renderRequest = None
+        ratio = self.canvas.device_pixel_ratio
+        figure.set_size_inches(self.canvas.width() * ratio / figure.dpi, self.canvas.height() * ratio / figure.dpi,
+                               forward=False)
+        figure.set_canvas(self.canvas)
+        self.canvas.figure = figure
+        self.figure = figure
+        self.canvas.draw()
+        if request['doSave']:
+            self.submit_export(figure, request['view'])
+        if request['on_done'] is not None:
+            request['on_done']()
+        self.update_busy_state()
+
+    def onRenderError(self, message):
+        '''
+        Reports a failed render. Failures of superseded requests are ignored.
+
+        Args:
+            message (str): The error message.
+
+        Returns:
+            None
+        '''
+        if self.renderRequest is None or self.sender() is not self.renderRequest['worker'].signals:
+            return
+        self.renderRequest = None
+        self.update_busy_state()
+        self.create_msg_box('Plot Error', f'The map could not be drawn:\n\n{message}', 'warning')
+
+    def update_busy_state(self):
+        '''
+        Shows the busy indicator in the status bar while a render, an export or an address lookup is pending.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        if self.renderRequest is not None:
+            self.statusBar().showMessage(f"Drawing {self.renderRequest['view']}...")
+        elif self.exportWorkers:
+            self.statusBar().showMessage('Saving map...')
+        elif self.lookupWorkers:
+            self.statusBar().showMessage('Looking up address...')
+        else:
+            self.statusBar().clearMessage()
+        self.busyBar.setVisible(self.renderRequest is not None or len(self.lookupWorkers) + len(self.exportWorkers) > 0)
+
+    def drawInitialMap(self):
+        '''
+        Function to draw the initial map during UI initialization. Reads the ClimatePlotter excel document
+        to add any existing events. Without a saved Deutschland view the default bounding box of Germany is used.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        '''
+        df_events, df_stats = self.read_data()
+        view = self.views.get('Deutschland')
+        if view is None:
+            view = DEUTSCHLAND_VIEW
+        self.submit_render(df_stats, *view.bbox)
+
+    def read_views_file(self, file_path):
+        '''
+        Function to read the existing view window coordinates from the views excel file.
+
+        Args:
+            file_path (str): Path to the Views excel file, usually found in the root directory.
+        Returns:
+            None
+
+        '''
+        errors = {}
+        df_views = read_xlsx(file_path, {0: VIEW_SCHEMA}, errors=errors)[0]
+        self.report_read_errors(file_path, errors)
+        return df_views
+
+    def report_read_errors(self, file_path, errors, limit=20):
+        '''
+        Tells the user which cells of a workbook could not be read as their declared type and were left empty.
+
+        Args:
+            file_path (str): Path to the workbook.
+            errors (dict): Conversion errors per sheet, as filled in by read_xlsx.
+            limit (int): Maximum number of errors listed. Defaults to 20.
+
+        Returns:
+            None
+        '''
+        problems = [(sheet,) + problem for sheet, sheetProblems in errors.items() for problem in sheetProblems]
+        if not problems:
+            return
+        lines = []
+        for sheet, row, column, message in problems[:limit]:
+            sheetName = f'Sheet {sheet + 1}' if isinstance(sheet, int) else sheet
+            lines.append(f'{sheetName}, {column}: {message}' if row is None
+                         else f'{sheetName}, Row {row}, {column}: {message}')
+        if len(problems) > limit:
+            lines.append(f'... and {len(problems) - limit} more')
+        self.create_msg_box("Read Warning",
+                            f"Some cells of {os.path.basename(file_path)} could not be read and were left "
+                            f"empty:\n\n" + '\n'.join(lines),
+                            'warning')
+
+    def addExcelFiles(self):
+        '''
+        Opens a dialog box, allowing the user to select input excel documents containing new events to be
+        included in the running statistics. Files are added to the bulkImportList, which shows up in the
+        list widget.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        '''
+        dialog = QFileDialog()
+        dialog.setFileMode(QFileDialog.FileMode.ExistingFiles)
+        dialog.setNameFilter("Excel files (*.xlsx)")
+        if dialog.exec():
+            fileNames = dialog.selectedFiles()
+            for fileName in fileNames:
+                self.bulkImportList.addItem(fileName)
+
+    def removeExcelFiles(self):
+        '''
+        Allows the user to remove files from the bulkImportList, such as if they were added in error.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        '''
+        try:
+            self.bulkImportList.takeItem(self.bulkImportList.currentRow())
+        except OSError:
+            self.create_msg_box("File Error", "Error in removing files", 'warning')
+
+    def clearExcelFiles(self):
+        '''
+        Clears the bulkImportList completely.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        '''
+        self.bulkImportList.clear()
+
+    def acceptBulkImport(self):
+        '''
+        Accept the import. Used in the import popup showing the file data vs the OSM data.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        '''
+        self.dialogBox.accept()
+        self.dialogBox.close()
+
+    def rejectBulkImport(self):
+        '''
+        Reject the import. Used in the import popup showing the file data vs the OSM data.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        '''
+        self.dialogBox.reject()
+        self.dialogBox.close()
+
+    def validate_fields(self):
+        '''
+        Validation of data fields. If all fields are filled, enable the button associated with
+        acceptBulkImport
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        '''
+        if (self.dateEdit.text() and
+                self.nameEdit.text() and
+                self.addressEdit.text() and
+                self.cityEdit.text() and
+                self.plzEdit.text() and
+                self.tableEdit.value() > 0 and
+                self.participantEdit.value() > 0):
+            self.buttonBox.button(QDialogButtonBox.StandardButton.Ok).setEnabled(True)
+        else:
+            self.buttonBox.button(QDialogButtonBox.StandardButton.Ok).setEnabled(False)
+
+    def bulkImportExcelFiles(self):
+        '''
+        Reads and validates all excel input documents of the bulkImportList/list widget in one pass with
+        read_input_files, and reports the files with invalid rows together. Files with errors are skipped and
+        kept so they can be corrected. Rows whose event is already stored, or repeats an earlier row, are skipped
+        and reported once. Every geocoding query of the valid rows is then resolved up front
+        by prefetch_geocodes, so the review runs against results that are already cached. With auto-accept on,
+        the rows are scored by batch_import and only the uncertain ones are reviewed in one table; otherwise every
+        row is confirmed in its own dialog. Appends the data to the Events dataframe, updates the statistics
+        incrementally and plots the results.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        '''
+        importedData = []
+        validRows = []
+
+        positions = list(reversed(range(self.bulkImportList.count())))
+        reports = self.read_input_files([self.bulkImportList.item(i).text() for i in positions])
+        failedReports = []
+        for i, report in zip(positions, reports):
+            if report.errors:
+                failedReports.append(report)
+                importedData.append((report.file_path, i, "Validation"))
+                continue
+            for index, row in report.valid.iterrows():
+                validRows.append((report.file_path, i, index, row, row['PLZ'], row['Tische'], row['Teilnehmer']))
+
+        if failedReports:
+            self.create_msg_box("Validation Error",
+                                "These files contain invalid rows and will be skipped:\n\n" +
+                                '\n\n'.join(report.summary() for report in failedReports),
+                                'warning')
+
+        validRows, duplicateRows = self.split_duplicate_rows(validRows)
+        if duplicateRows:
+            # Already stored rows count as imported, they do not keep their file around
+            lines = [f"{os.path.basename(bulkFilePath)}, line {index + 1}: {row['Hochschule']}, {row['Stadt']}"
+                     for bulkFilePath, i, index, row in duplicateRows[:20]]
+            if len(duplicateRows) > 20:
+                lines.append(f"... and {len(duplicateRows) - 20} more")
+            self.create_msg_box("Duplicate Events",
+                                "These rows are already stored or repeat an earlier row and will be skipped:\n\n" +
+                                '\n'.join(lines))
+
+        self.prefetch_geocodes(validRows)
+
+        if self.autoAcceptCheckBox.isChecked():
+            importedData += self.batch_import(validRows)
+        else:
+            for bulkFilePath, i, index, row, plz, tables, participants in validRows:
+                raw_address = self.get_address_from_row(row, plz, bulkFilePath, index)
+                if raw_address is None:
+                    importedData.append((bulkFilePath, i, index))
+                    continue
+
+                self.process_and_display_dialog(row, raw_address, bulkFilePath, index, tables, participants)
+
+        # The input files are only deleted once their events are in the database
+        if not self.flush_data():
+            self.create_msg_box("Bulk Import Failed",
+                                "Imported events could not be saved, the input files were kept.", 'warning')
+            return
+        self.cleanup_imported_files(importedData)
+        self.drawInitialMap()
+
+    def split_duplicate_rows(self, validRows):
+        '''
+        Separates the bulk import rows whose event is already stored, or repeats an earlier row of the import, from
+        the new ones. Each check is a lookup of the row's event_key.
+
+        Args:
+            validRows (list): (bulkFilePath, i, index, row, plz, tables, participants) tuples of the rows that
+                passed validation.
+
+        Returns:
+            list, list: The new rows, and (bulkFilePath, i, index, row) of the duplicates.
+
+        '''
+        newRows = []
+        duplicateRows = []
+        seen = set()
+        for entry in validRows:
+            bulkFilePath, i, index, row = entry[:4]
+            key = event_key(row)
+            if key in seen or self.data.contains_event(row):
+                duplicateRows.append((bulkFilePath, i, index, row))
+            else:
+                seen.add(key)
+                newRows.append(entry)
+        return newRows, duplicateRows
+
+    def batch_import(self, validRows):
+        '''
+        Non-interactive stage of the bulk import. Scores every row against its Nominatim result with
+        score_import_row, imports the rows at or above autoAcceptThreshold directly and shows the others in one
+        review table. All accepted rows are added with a single import_events call.
+
+        Args:
+            validRows (list): (bulkFilePath, i, index, row, plz, tables, participants) tuples of the rows that
+                passed validation.
+
+        Returns:
+            list: (bulkFilePath, i, index) of the rows that were not imported.
+
+        '''
+        accepted = []
+        uncertain = []
+        for bulkFilePath, i, index, row, plz, tables, participants in validRows:
+            try:
+                raw_address = self.fetch_address(self.get_address_query(row, plz))
+            except AddressError:
+                raw_address = None
+            score, scores = score_import_row(row, raw_address)
+            entry = (bulkFilePath, i, index, row, raw_address, score)
+            (accepted if score >= self.autoAcceptThreshold else uncertain).append(entry)
+
+        reviewed = self.review_import_rows(uncertain) if uncertain else []
+        accepted += reviewed
+        if accepted:
+            self.import_events(pd.DataFrame([
+                [row['Datum'].strftime('%d.%m.%Y'), row['Hochschule'], row['Adresse'], row['Stadt'],
+                 row['Bundesland'], row['PLZ'], int(row['Tische']), int(row['Teilnehmer'])]
+                for bulkFilePath, i, index, row, raw_address, score in accepted], columns=EVENT_COLUMNS))
+        reviewedRows = {id(entry) for entry in reviewed}
+        return [entry[:3] for entry in uncertain if id(entry) not in reviewedRows]
+
+    def review_import_rows(self, rows):
+        '''
+        Shows the bulk import rows below the auto-accept threshold in one sortable table next to what
+        OpenStreetMap found for them, and lets the user tick the rows to import.
+
+        Args:
+            rows (list): (bulkFilePath, i, index, row, raw_address, score) tuples.
+
+        Returns:
+            list: The ticked tuples, empty if the review was cancelled.
+
+        '''
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Bulk Import - Review {len(rows)} Rows")
+        dialog.resize(1200, 500)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(f"These rows matched OpenStreetMap with less than {self.autoAcceptThreshold:.0%} "
+                                f"confidence. Tick the rows to import.", dialog))
+
+        headers = ['Import', 'Score', 'File', 'Line', 'Name', 'OSM Name', 'City', 'OSM City', 'PLZ', 'OSM PLZ',
+                   'State', 'OSM State', 'Tables', 'Participants']
+        table = QTableWidget(len(rows), len(headers), dialog)
+        table.setHorizontalHeaderLabels(headers)
+        for position, (bulkFilePath, i, index, row, raw_address, score) in enumerate(rows):
+            osm = osm_fields(raw_address)
+            values = [round(score, 2), os.path.basename(bulkFilePath), index + 1, row['Hochschule'], osm['name'],
+                      row['Stadt'], osm['city'], row['PLZ'], osm['plz'], row['Bundesland'], osm['state'],
+                      int(row['Tische']), int(row['Teilnehmer'])]
+            checkItem = QTableWidgetItem()
+            checkItem.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
+            checkItem.setCheckState(Qt.CheckState.Unchecked)
+            checkItem.setData(Qt.ItemDataRole.UserRole, position)
+            table.setItem(position, 0, checkItem)
+            for column, value in enumerate(values, start=1):
+                item = QTableWidgetItem()
+                # Numbers are set as data so the columns sort numerically
+                item.setData(Qt.ItemDataRole.DisplayRole, value)
+                item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
+                table.setItem(position, column, item)
+        table.setSortingEnabled(True)
+        table.sortItems(1, Qt.SortOrder.DescendingOrder)
+        table.resizeColumnsToContents()
+        layout.addWidget(table)
+
+        def setAll(state):
+            for position in range(table.rowCount()):
+                table.item(position, 0).setCheckState(state)
+
+        selectAllButton = QPushButton("Select All", dialog)
+        selectAllButton.clicked.connect(lambda: setAll(Qt.CheckState.Checked))
+        selectNoneButton = QPushButton("Select None", dialog)
+        selectNoneButton.clicked.connect(lambda: setAll(Qt.CheckState.Unchecked))
+        buttonBox = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttonBox.accepted.connect(dialog.accept)
+        buttonBox.rejected.connect(dialog.reject)
+        buttonLayout = QHBoxLayout()
+        buttonLayout.addWidget(selectAllButton)
+        buttonLayout.addWidget(selectNoneButton)
+        buttonLayout.addStretch()
+        buttonLayout.addWidget(buttonBox)
+        layout.addLayout(buttonLayout)
+
+        if not dialog.exec():
+            return []
+        return [rows[table.item(position, 0).data(Qt.ItemDataRole.UserRole)] for position in range(table.rowCount())
+                if table.item(position, 0).checkState() == Qt.CheckState.Checked]
+
+    def prefetch_geocodes(self, validRows):
+        '''
+        Pre-resolution stage of the bulk import. Collects the unique address and coordinate queries of all
+        valid rows across all selected files and resolves them concurrently through the BatchGeocoder, within
+        the configured requests per second limit. Results land in the geocode cache, so the later calls to
+        get_address_from_row and save_imported_data do not wait on the network. A progress dialog is shown
+        while the queries resolve and can be cancelled.
+
+        Args:
+            validRows (list): (bulkFilePath, i, index, row, plz, tables, participants) tuples of the rows that
+                passed validation.
+
+        Returns:
+            None
+
+        '''
+        queries = []
+        for bulkFilePath, i, index, row, plz, tables, participants in validRows:
+            queries.append(('address', self.get_address_query(row, plz)))
+            queries.append(('coordinates', str(row['Adresse']).strip() + ", " + row['Stadt'].strip() + ", " +
+                            str(row['Bundesland']).strip() + ", " + str(row['PLZ']).strip() + ", Germany"))
+        if not queries:
+            return
+
+        progressDialog = QProgressDialog("Looking up addresses...", "Cancel", 0, len(set(queries)), self)
+        progressDialog.setWindowTitle("Bulk Import")
+        progressDialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progressDialog.setMinimumDuration(0)
+
+        def progress(done, total):
+            progressDialog.setMaximum(total)
+            progressDialog.setValue(done)
+            QApplication.processEvents()
+            return not progressDialog.wasCanceled()
+
+        self.batchGeocoder.resolve(queries, progress)
+        progressDialog.close()
+
+    def read_input_files(self, filePaths):
+        '''
+        Validation stage of the bulk import. Reads and validates the input documents with parse_input_file,
+        in a process pool if there is more than one.
+
+        Args:
+            filePaths (list of str): Paths to the input excel documents.
+
+        Returns:
+            list of ValidationReport: One report per file, in the order of filePaths.
+
+        '''
+        if len(filePaths) < 2:
+            return [parse_input_file(filePath) for filePath in filePaths]
+        with ProcessPoolExecutor(max_workers=min(len(filePaths), os.cpu_count() or 1)) as executor:
+            return list(executor.map(parse_input_file, filePaths))
+
+    def get_address_from_row(self, row, plz, bulkFilePath, index):
+        '''
+        Gets the address from the row using the name, city, state, and post code of the school/uni.
+
+        Args:
+           row (dict): Current row from the excel document
+           plz: (str): Post code of the current row
+           bulkFilePath (str): Path to the current excel document
+           index (int): Row index of the current row
+
+        Returns:
+            dict or None: If the raw address is found by the get_address function, returns the dict object.
+                If the address is not found by the function, or if there is a validation error, returns None.
+        '''
+        raw_address = self.get_address(self.get_address_query(row, plz))
+
+        if not raw_address or 'address' not in raw_address:
+            self.create_msg_box(
+                "Validation Error",
+                f"Incomplete address data returned from OpenStreetMap for file: {bulkFilePath.split('/')[-1]}, Line: {index + 1}.",
+                'warning'
+            )
+            return None
+
+        if not all(key in raw_address['address'] for key in ('postcode', 'road')):
+            self.create_msg_box(
+                "Validation Error",
+                f"Incomplete address data returned from OpenStreetMap for file: {bulkFilePath.split('/')[-1]}, Line: {index + 1}.",
+                'warning'
+            )
+            return None
+
+        return raw_address
+
+    def get_address_query(self, row, plz):
+        '''
+        Builds the Nominatim search string for a row of an input excel document.
+
+        Args:
+           row (dict): Current row from the excel document
+           plz: (str): Post code of the current row
+
+        Returns:
+            str: Search string made of the name, city, state and post code of the school/uni.
+        '''
+        return row['Hochschule'] + ", " + row['Stadt'] + ", " + row['Bundesland'] + ", " + plz
+
+    def process_and_display_dialog(self, row, raw_address, bulkFilePath, index, tables, participants):
+        '''
+        To assist the user in validating input data from the excel documents, this function displays the raw address
+        found by Nominatim, side by side with the data from the excel document.
+
+        Args:
+           row (dict): Current row from the excel document
+           raw_address (dict): Raw address returned by Nominatim's search
+           bulkFilePath (str): Path to the current excel document
+           index (int): Row index of the current row
+           tables (int): Number of tables
+           participants (int): Number of participants
+
+        Returns:
+            None
+
+        '''
+        # Prepare dialog fields and populate them with the row data and suggestions
+        suggested_name = raw_address['name']
+        suggested_plz = raw_address['address']['postcode']
+        suggested_address = raw_address['address']['road']
+        if 'house_number' in raw_address['address']:
+            suggested_address += ' ' + raw_address['address']['house_number']
+        suggested_city = raw_address['address'].get('city', '')
+        suggested_state = raw_address['address'].get('state', '')
+
+        # Prepare and show the dialog
+        self.prepare_dialog(
+            row,
+            suggested_name,
+            suggested_address,
+            suggested_city,
+            suggested_plz,
+            suggested_state,
+            bulkFilePath,
+            index
+        )
+
+        button = self.dialogBox.exec()
+
+        if button == 1:  # Accepted
+            self.save_imported_data(row, raw_address, tables, participants, bulkFilePath, index)
+
+    def prepare_dialog(self, row, suggested_name, suggested_address, suggested_city, suggested_plz, suggested_state,
+                       bulkFilePath, index):
+        '''
+        Creates the popup UI that allows the user to inspect and compare the information from the input excel documents
+        versus the data found by Nominatim's search
+
+           row (dict): Current row from the excel document
+           suggested_name (str): Name of the school/university, as found by Nominatim
+           suggested_address (str): Address of the school/university, as found by Nominatim
+           suggested_city (str): City of the school/university, as found by Nominatim
+           suggested_plz (str): Post code of the school/university, as found by Nominatim
+           suggested_state (str): State of the school/university, as found by Nominatim
+           bulkFilePath (str): Path to the current excel document
+           index: (int) Row index of the current row
+
+        Returns:
+            None
+
+        '''
+        # User certification dialog setup
+        self.dialogBox = QDialog(self)
+        self.dialogBox.setWindowTitle(f"Bulk Import - Certify Data {bulkFilePath.split('/')[-1]}, Line: {index + 1}")
+        self.dialogBox.resize(400, 200)
+        self.dialogBox.layout = QGridLayout()
+
+        '''
+        Define dialog box columns
+        '''
+        firstColumn = QLabel('')
+        secondColumn = QLabel('Data from Excel')
+        thirdColumn = QLabel('Data from OpenStreetMap')
+
+        '''
+        Define Labels for column 1 and Edits for column 2.
+        
+        Column 3 is suggested values and are read-only
+        '''
+        dateLabel = QLabel("Date:", self)
+        self.dateEdit = QLineEdit(self)
+        if row['Datum'] == '':
+            self.dateEdit.setText(QDate.currentDate().toString("dd.MM.yyyy"))
+            self.dateEdit.setStyleSheet('background-color: red')
+        else:
+            self.dateEdit.setText(row['Datum'].strftime("%d.%m.%Y"))
+        dateSuggested = QLabel('')
+
+        nameLabel = QLabel("Name:", self)
+        self.nameEdit = QLineEdit(self)
+        self.nameEdit.setText(row['Hochschule'].strip())
+        nameSuggested = QLineEdit(suggested_name)
+        nameSuggested.setReadOnly(True)
+
+        addressLabel = QLabel("Address:", self)
+        self.addressEdit = QLineEdit(self)
+        self.addressEdit.setText(str(row['Adresse']).strip())
+        addressSuggested = QLineEdit(suggested_address)
+        addressSuggested.setReadOnly(True)
+
+        cityLabel = QLabel("City:", self)
+        self.cityEdit = QLineEdit(self)
+        self.cityEdit.setText(row['Stadt'].strip())
+        citySuggested = QLineEdit(suggested_city)
+        citySuggested.setReadOnly(True)
+
+        plzLabel = QLabel("PLZ Code:", self)
+        self.plzEdit = QLineEdit(self)
+        self.plzEdit.setText(str(row['PLZ']).strip())
+        plzSuggested = QLineEdit(suggested_plz)
+        plzSuggested.setReadOnly(True)
+
+        stateLabel = QLabel("State:", self)
+        self.dialogStateCombo = QComboBox()
+        for state in self.stateList:
+            self.dialogStateCombo.addItem(state)
+        state = str(row['Bundesland']).strip()
+        if state in self.stateList:
+            self.dialogStateCombo.setCurrentIndex(self.stateList.index(state))
+        stateSuggested = QLineEdit(suggested_state)
+        stateSuggested.setReadOnly(True)
+
+        tableLabel = QLabel("Tables:", self)
+        self.tableEdit = QSpinBox(self)
+        self.tableEdit.setMinimum(0)
+        self.tableEdit.setMaximum(2000)
+        self.tableEdit.setValue(int(row['Tische']))
+        tableSuggested = QLabel('')
+
+        participantLabel = QLabel("Participants:", self)
+        self.participantEdit = QSpinBox(self)
+        self.participantEdit.setMinimum(0)
+        self.participantEdit.setMaximum(9999)
+        self.participantEdit.setValue(int(row['Teilnehmer']))
+        participantSuggested = QLabel('')
+
+        # Setup dialog and buttons
+        QBtn = QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        self.buttonBox = QDialogButtonBox(QBtn)
+        self.buttonBox.button(QDialogButtonBox.StandardButton.Ok).setEnabled(False)
+
+        '''
+        Define the widget layout for the data review dialog box
+        '''
+        self.dialogBox.layout.addWidget(firstColumn, 0, 0)
+        self.dialogBox.layout.addWidget(secondColumn, 0, 1)
+        self.dialogBox.layout.addWidget(thirdColumn, 0, 2)
+        self.dialogBox.layout.addWidget(dateLabel, 1, 0)
+        self.dialogBox.layout.addWidget(self.dateEdit, 1, 1)
+        self.dialogBox.layout.addWidget(dateSuggested, 1, 2)
+        self.dialogBox.layout.addWidget(nameLabel, 2, 0)
+        self.dialogBox.layout.addWidget(self.nameEdit, 2, 1)
+        self.dialogBox.layout.addWidget(nameSuggested, 2, 2)
+        self.dialogBox.layout.addWidget(addressLabel, 3, 0)
+        self.dialogBox.layout.addWidget(self.addressEdit, 3, 1)
+        self.dialogBox.layout.addWidget(addressSuggested, 3, 2)
+        self.dialogBox.layout.addWidget(cityLabel, 4, 0)
+        self.dialogBox.layout.addWidget(self.cityEdit, 4, 1)
+        self.dialogBox.layout.addWidget(citySuggested, 4, 2)
+        self.dialogBox.layout.addWidget(plzLabel, 5, 0)
+        self.dialogBox.layout.addWidget(self.plzEdit, 5, 1)
+        self.dialogBox.layout.addWidget(plzSuggested, 5, 2)
+        self.dialogBox.layout.addWidget(stateLabel, 6, 0)
+        self.dialogBox.layout.addWidget(self.dialogStateCombo, 6, 1)
+        self.dialogBox.layout.addWidget(stateSuggested, 6, 2)
+        self.dialogBox.layout.addWidget(tableLabel, 7, 0)
+        self.dialogBox.layout.addWidget(self.tableEdit, 7, 1)
+        self.dialogBox.layout.addWidget(tableSuggested, 7, 2)
+        self.dialogBox.layout.addWidget(participantLabel, 8, 0)
+        self.dialogBox.layout.addWidget(self.participantEdit, 8, 1)
+        self.dialogBox.layout.addWidget(participantSuggested, 8, 2)
+        self.dialogBox.layout.addWidget(self.buttonBox, 9, 0, 1, 3)
+        self.dialogBox.setLayout(self.dialogBox.layout)
+
+        # Connect signals to validation function
+        self.dateEdit.textChanged.connect(self.validate_fields)
+        self.nameEdit.textChanged.connect(self.validate_fields)
+        self.addressEdit.textChanged.connect(self.validate_fields)
+        self.cityEdit.textChanged.connect(self.validate_fields)
+        self.plzEdit.textChanged.connect(self.validate_fields)
+        self.tableEdit.valueChanged.connect(self.validate_fields)
+        self.participantEdit.valueChanged.connect(self.validate_fields)
+        self.validate_fields()
+
+        self.buttonBox.accepted.connect(self.acceptBulkImport)
+        self.buttonBox.rejected.connect(self.rejectBulkImport)
+
+    def save_imported_data(self, row, raw_address, tables, participants, bulkFilePath, index):
+        '''
+        Pulls the input data from the text edit fields and saves it by calling update_excel.
+
+        Args:
+           row (dict): [UNUSED] Current row from the excel document
+           raw_address: [UNUSED] (dict) Raw address returned by Nominatim's search
+           tables (int): Number of tables
+           participants (int): Number of Participants
+           bulkFilePath (str): [UNUSED] Path to the current excel document
+           index (int): [UNUSED] Row index of the current row
+
+        Returns:
+            None
+
+        '''
+        # Save the data
+        date = self.dateEdit.text()
+        name = self.nameEdit.text()
+        address = self.addressEdit.text()
+        city = self.cityEdit.text()
+        state = self.dialogStateCombo.currentText()
+        plzCode = str(self.plzEdit.text())
+        latitude, longitude = self.get_coordinates(city, state, plzCode, address)
+        self.update_excel(self.excelFilePath, date, name, address, city, state, plzCode, latitude, longitude, tables,
+                          participants)
+
+    def cleanup_imported_files(self, importedData):
+        '''
+        If the file was imported properly then the excel document is deleted from the disk. If the file had errors,
+        such as blank fields, it was not recorded, skipped, and is not deleted so that the user can correct the error.
+
+        Args:
+            importedData (list): List of files that were skipped during importing
+
+        Returns:
+            None
+
+        '''
+        for i in reversed(range(self.bulkImportList.count())):
+            if i in [x[1] for x in importedData]:
+                continue
+            else:
+                bulkFilePath = self.bulkImportList.item(i).text()
+                if os.path.exists(bulkFilePath):
+                    os.remove(bulkFilePath)
+                self.bulkImportList.takeItem(i)
+
+        if importedData:
+            text = 'Not Processed:\n'
+            for i in importedData:
+                text += f'{i[0].split("/")[-1]} Line {i[1]}\n'
+            self.create_msg_box("Bulk Import Complete", text, 'warning')
+
+    def get_from_address(self, raw_address, *keys):
+        """
+        Helper function to retrieve the value from raw_address['address']
+        using the first matching key in the provided keys.
+
+        Args:
+           raw_address (dict): Raw address returned by Nominatim's search
+           keys (str): Keys to be checked if they exist in the address. Matching is necessary due to Nominatim's
+                inconsistencies. Sometimes uses city, town, or village.
+        Returns:
+            str or None: If the key exists, return the value, otherwise return None
+        """
+        for key in keys:
+            if key in raw_address['address']:
+                return raw_address['address'][key]
+        return None
+
+    def onLookupAddressButtonClicked(self):
+        """
+        Handles the event when the 'Lookup Address' button is clicked.
+
+        This method retrieves and processes the address information based on the name input by the user.
+        The lookup runs in the background; once it returns, fill_address_fields attempts to fetch and display the corresponding city, state, postcode, and road details in the appropriate UI fields.
+        The method handles special cases for certain cities (Berlin, Hamburg, Bremen) and ensures that essential address components
+        like the city, state, postcode, and road are available before populating the UI.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            AddressError: If the city, state, postcode, or road information is missing from the retrieved address.
+
+        """
+        self.start_address_lookup(self.nameEdit.text(), self.fill_address_fields)
+
+    def fill_address_fields(self, raw_address):
+        """
+        Fills the manual input fields from an address found by onLookupAddressButtonClicked.
+
+        Args:
+            raw_address (dict): geopy.location.Location.raw returned by Nominatim.
+
+        Returns:
+            None
+        """
+        try:
+            self.nameEdit.setText(raw_address['name'])
+
+            # Attempt to retrieve the city, town, or village
+            city = self.get_from_address(raw_address, 'city', 'town', 'village')
+            if not city:
+                raise AddressError("City/Town/Village not found in the address.")
+
+            # Handle special cases for Berlin, Hamburg, and Bremen
+            if city in ['Berlin', 'Hamburg', 'Bremen']:
+                state = city
+                self.cityEdit.setText(city)
+            else:
+                # Attempt to retrieve the state or equivalent
+                state = self.get_from_address(raw_address, 'state', 'region')
+                if not state:
+                    raise AddressError("State/Region not found in the address.")
+                self.cityEdit.setText(city)
+
+            # Set the state in the combo box
+            self.stateCombo.setCurrentIndex(self.stateList.index(state))
+
+            # Handle postcode and road
+            postcode = raw_address['address'].get('postcode')
+            road = raw_address['address'].get('road')
+            if postcode and road:
+                self.plzEdit.setText(postcode)
+                house_number = raw_address['address'].get('house_number', '')
+                self.addressEdit.setText(f"{road} {house_number}".strip())
+            else:
+                raise AddressError("Incomplete address: postcode or road missing.")
+
+        except AttributeError:
+            self.create_msg_box("Address Not Found", "Address not found. Please try again.", 'warning')
+            return
+        except AddressError as e:
+            self.create_msg_box("Address Error",
+                                f"Error: {str(e)} \n\n"
+                                f"Returned address was:\n\n {raw_address['display_name']}.",
+                                'warning')
+            return
+
+    def clearAll(self):
+        '''
+        Clears all text input fields
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        '''
+        self.nameEdit.setText('')
+        self.addressEdit.setText('')
+        self.cityEdit.setText('')
+        self.plzEdit.setText('')
+        self.dateEdit.setDate(QDate.currentDate())
+        self.stateCombo.setCurrentIndex(0)
+        self.tableEdit.setValue(0)
+        self.participantEdit.setValue(0)
+
+    def onRecalculateButtonClicked(self):
+        '''
+        When the button is clicked, recalculate the statistics for the Stats dataframe.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        '''
+        msgBox = QMessageBox(self)
+        msgBox.setIcon(QMessageBox.Icon.Warning)
+        msgBox.setWindowTitle("Recalculate Statistics?")
+        msgBox.setText(
+            "Proceeding will clear all existing statistics and recalculate them from scratch.\n\n "
+            "Are you sure you want to proceed?\n\n "
+            "Only schools whose address changed since the last calculation are looked up again.")
+        msgBox.setStandardButtons(
+            QMessageBox.StandardButton.Yes |
+            QMessageBox.StandardButton.No
+        )
+        button = msgBox.exec()
+
+        if button == QMessageBox.StandardButton.No:
+            return
+        elif button == QMessageBox.StandardButton.Yes:
+            mismatches = self.verify_statistics()
+            cacheBefore = self.geocodeCache.stats()
+            df_events, df_stats = self.read_data()
+            self.recalculateStatistics(df_events, df_stats)
+            cacheAfter = self.geocodeCache.stats()
+            self.create_msg_box("Complete",
+                                f"Recalculation Complete\n\n"
+                                f"{len(mismatches)} schools differed from the previous statistics\n\n"
+                                f"Geocode cache: {cacheAfter['hits'] - cacheBefore['hits']} hits, "
+                                f"{cacheAfter['misses'] - cacheBefore['misses']} misses")
+            return
+
+    def recalculateStatistics(self, df_events, df_stats, lat=None, lon=None):
+        """
+        Recalculates statistical data based on event information and updates the statistics DataFrame.
+
+        This method processes the events in the provided `df_events` DataFrame to generate and update statistical
+        information in the `df_stats` DataFrame. The statistics include the number of events, total tables,
+        and total participants for each university in the specified city. Coordinates are resolved once per
+        school by resolve_school_coordinates and joined in by compute_statistics.
+
+        Args:
+            df_events (pd.DataFrame): A DataFrame containing event details, including fields such as 'Hochschule',
+                'Adresse', 'Stadt', 'Bundesland', 'PLZ', 'Tische', and 'Teilnehmer'.
+            df_stats (pd.DataFrame): The previous statistics including 'Hochschule', 'Stadt', 'PLZ', 'Latitude',
+                'Longitude', 'EventCount', 'CityEventTotal', 'TotalTables', 'TotalParticipants', and
+                'CityParticipantsTotal'. Their coordinates are carried forward for schools whose address is
+                unchanged; the statistics themselves are rebuilt from scratch.
+            lat (float, optional): Latitude coordinate to be used for the first school instead of a lookup.
+                Defaults to None.
+            lon (float, optional): Longitude coordinate to be used for the first school instead of a lookup.
+                Defaults to None.
+
+        Returns:
+            bool: True if the database was successfully written, otherwise False if an sqlite3.Error occurs while writing.
+
+        Raises:
+            None: All exceptions are handled internally, specifically file writing errors are caught and result in returning False.
+
+        """
+        df_coordinates = self.resolve_school_coordinates(df_events, lat, lon, df_stats)
+        df_stats = compute_statistics(df_events, df_coordinates)
+        return self.write_data(df_events, df_stats)
+
+    def resolve_school_coordinates(self, df_events, lat=None, lon=None, df_known=None):
+        '''
+        Builds the coordinate lookup table for compute_statistics, one row per distinct school, using the address
+        of its first event. Coordinates already known for a (Hochschule, Stadt, PLZ) key are carried forward as
+        long as the fingerprint of the school's address fields is unchanged since the last build, so only new or
+        changed schools are geocoded. If no coordinates are found for the address, the coordinates of the city
+        are used instead.
+
+        Args:
+            df_events (pd.DataFrame): Events dataframe.
+            lat (float, optional): Latitude to use for the first school instead of a lookup. Defaults to None.
+            lon (float, optional): Longitude to use for the first school instead of a lookup. Defaults to None.
+            df_known (pd.DataFrame, optional): Previous Stats dataframe whose coordinates may be reused.
+                Defaults to None.
+
+        Returns:
+            pd.DataFrame: 'Hochschule', 'Stadt', 'Latitude' and 'Longitude', one row per school.
+        '''
+        df_schools = df_events.drop_duplicates(subset=['Hochschule', 'Stadt'])
+        recorded = self.geocodeCache.get_school_coordinates()
+        known = {}
+        if df_known is not None and not df_known.empty:
+            df_known = df_known.dropna(subset=['Latitude', 'Longitude'])
+            for name, city, plz, known_lat, known_lon in zip(df_known['Hochschule'], df_known['Stadt'],
+                                                             df_known['PLZ'], df_known['Latitude'],
+                                                             df_known['Longitude']):
+                if known_lat != '' and known_lon != '':
+                    known[school_key(name, city, plz)] = (float(known_lat), float(known_lon))
+        latitudes = []
+        longitudes = []
+        records = []
+        for name, address, city, state, plz in zip(df_schools['Hochschule'], df_schools['Adresse'],
+                                                   df_schools['Stadt'], df_schools['Bundesland'], df_schools['PLZ']):
+            key = school_key(name, city, plz)
+            fingerprint = address_fingerprint(name, address, city, state, plz)
+            record = recorded.get(key)
+            if lat is None or lon is None:
+                if record is not None and record[0] == fingerprint and record[1] is not None:
+                    lat, lon = record[1], record[2]
+                elif record is None and key in known:
+                    lat, lon = known[key]
+            if lat is None or lon is None:
+                lat, lon = self.get_coordinates(city, state, plz, address)
+                if lat is None or lon is None:
+                    self.create_msg_box("Coordinates not found",
+                                        f"No coordinates were found for {name} at {address}. {city}, {state}, {plz} \n"
+                                        f"using coordinates for city instead.",
+                                        'warning')
+                    lat, lon = self.get_coordinates(city, state, plz)
+            latitudes.append(lat)
+            longitudes.append(lon)
+            if lat is not None and lon is not None:
+                records.append((key, fingerprint, lat, lon))
+            lat = None
+            lon = None
+        self.geocodeCache.put_school_coordinates(records)
+        return pd.DataFrame({'Hochschule': df_schools['Hochschule'].to_numpy(),
+                             'Stadt': df_schools['Stadt'].to_numpy(),
+                             'Latitude': latitudes,
+                             'Longitude': longitudes})
+
+    def onArchiveButtonClicked(self):
+        """
+        Archives the existing data as an excel document in the archive folder, optionally clearing the database.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        msgBox = QMessageBox(self)
+        msgBox.setIcon(QMessageBox.Icon.Warning)
+        msgBox.setWindowTitle("Archive Excel?")
+        msgBox.setText(
+            "Archive and clear to start a new data file\n\n"
+            "Archive and keep to keep the current data file\n\n"
+            "Cancel to keep the current data file without archiving"
+        )
+        archive_and_clear_button = QPushButton("Archive and Clear")
+        archive_and_keep_button = QPushButton("Archive and Keep")
+
+        msgBox.addButton(archive_and_clear_button, QMessageBox.ButtonRole.AcceptRole)
+        msgBox.addButton(archive_and_keep_button, QMessageBox.ButtonRole.AcceptRole)
+        msgBox.addButton(QMessageBox.StandardButton.Cancel)
+
+        msgBox.exec()
+
+        if msgBox.clickedButton() == archive_and_clear_button:
+            self.archive_and_clear()
+        elif msgBox.clickedButton() == archive_and_keep_button:
+            self.archive_and_keep()
+        elif msgBox.clickedButton() == QMessageBox.StandardButton.Cancel:
+            return
+
+    def onExportXlsxButtonClicked(self):
+        """
+        Exports the Events and Stats tables to the ClimatePlotter excel document, which also compacts its journal,
+        and the views to the Views excel document.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        try:
+            if not self.workbook.write(*self.read_data()):
+                raise OSError('could not write the workbook')
+            self.views.export(self.viewsFilePath)
+            self.create_msg_box("Export Complete",
+                                f"Exported to {self.excelFilePath}\n\nand {self.viewsFilePath}")
+        except OSError:
+            self.create_msg_box("Error", "Error in exporting data, is the file open in Excel?", 'warning')
+
+    def onImportXlsxButtonClicked(self):
+        """
+        Replaces the Events and Stats tables with the sheets of a ClimatePlotter excel document chosen by the user.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        fileName, _ = QFileDialog.getOpenFileName(self, "Import Xlsx", os.path.dirname(self.excelFilePath),
+                                                  "Excel files (*.xlsx)")
+        if not fileName:
+            return
+        button = QMessageBox.question(self, "Import Xlsx?",
+                                      f"Replace all events and statistics with the contents of\n\n{fileName}?\n\n"
+                                      "Archive the current data first to keep it.")
+        if button != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            df_events, df_stats = self.read_excel_file(fileName)
+        except ValueError as e:
+            self.create_msg_box("Error", f"Error in importing data:\n\n{e}", 'warning')
+            return
+        if self.write_data(df_events, df_stats):
+            self.drawInitialMap()
+        else:
+            self.create_msg_box("Error", "Error in importing data")
+
+    def archive_and_clear(self):
+        """
+        Called from the onArchiveButtonClicked function. Exports the current data to the archive folder and
+        clears the Events and Stats tables.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        try:
+            self.archiveExcel()
+            df_events = pd.DataFrame(
+                columns=['Datum', 'Hochschule', 'Adresse', 'Stadt', 'Bundesland', 'PLZ', 'Tische', 'Teilnehmer'])
+            df_stats = pd.DataFrame(columns=['Hochschule', 'Stadt', 'PLZ', 'Latitude', 'Longitude',
+                                             'EventCount', 'CityEventTotal', 'TotalTables',
+                                             'TotalParticipants', 'CityParticipantsTotal'])
+            if not self.write_data(df_events, df_stats):
+                raise OSError('could not clear the database')
+        except OSError:
+            self.create_msg_box("Error", "Error in archiving data")
+        return
+
+    def archive_and_keep(self):
+        """
+        Called from the onArchiveButtonClicked function. Exports the current data to the archive folder.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        self.archiveExcel()
+        return
+
+    def archiveExcel(self):
+        """
+        Exports the Events and Stats tables to an excel document in the archive folder.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            OSError: If the archive could not be written.
+
+        """
+        date = pd.Timestamp.now().strftime("%Y-%m-%d_H%HM%MS%S")
+        folder_path = os.path.join(os.path.dirname(__file__), 'Plotter_Output', 'Archive')
+        if not os.path.exists(folder_path):
+            os.makedirs(folder_path)
+        archive = ExcelStore(os.path.join(folder_path, date + "_Archived_ClimatePlotter.xlsx"))
+        if not archive.write(*self.read_data()):
+            raise OSError('could not write the archive')
+        self.create_msg_box("Complete", "Archiving Complete")
+        return
+
+    def initUI(self):
+        """
+        Initialize the UI of the main window
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        self.setGeometry(300, 300, 1024, 700)
+        self.setWindowTitle('Deutschland - Klimapuzzle Plotter')
+        self.setWindowIcon(QIcon('icon/icon.png'))
+        # Create central widget
+        centralWidget = QWidget(self)
+        self.setCentralWidget(centralWidget)
+
+        # Layout
+        mylayout = QHBoxLayout()
+        leftBox = QGridLayout()
+        middleBox = QVBoxLayout()
+        rightBox = QGridLayout()
+
+        '''
+        BulkButtonBox
+        '''
+        self.addButton = QPushButton("Add", self)
+        self.removeButton = QPushButton("Remove", self)
+        self.clearButton = QPushButton("Clear", self)
+
+        '''
+        BulkImportBox
+        '''
+        self.bulkImportList = QListWidget(self)
+        bulkImportGroupBox = QGroupBox("Bulk Import", self)
+        BulkImportBoxLayout = QGridLayout()
+        bulkImportGroupBox.setLayout(BulkImportBoxLayout)
+
+        self.bulkImportButton = QPushButton("Bulk Import", self)
+        self.autoAcceptCheckBox = QCheckBox("Auto-accept confident matches", self)
+        self.autoAcceptCheckBox.setChecked(True)
+
+        BulkImportBoxLayout.addWidget(self.bulkImportList, 0, 0, 3, 1)
+        BulkImportBoxLayout.addWidget(self.addButton, 0, 1)
+        BulkImportBoxLayout.addWidget(self.removeButton, 1, 1)
+        BulkImportBoxLayout.addWidget(self.clearButton, 2, 1)
+        BulkImportBoxLayout.addWidget(self.autoAcceptCheckBox, 3, 0, 1, 2)
+        BulkImportBoxLayout.addWidget(self.bulkImportButton, 4, 0, 1, 2)
+
+        self.addButton.clicked.connect(self.addExcelFiles)
+        self.removeButton.clicked.connect(self.removeExcelFiles)
+        self.clearButton.clicked.connect(self.clearExcelFiles)
+        self.bulkImportButton.clicked.connect(self.bulkImportExcelFiles)
+
+        '''
+        Input Box
+        '''
+        # Add widgets to layout
+        self.nameLabel = QLabel("School/University Name:", self)
+        self.nameEdit = QLineEdit(self)
+
+        self.addressLookupButton = QPushButton("Lookup Address", self)
+        self.addressLookupButton.clicked.connect(self.onLookupAddressButtonClicked)
+
+        self.addressLabel = QLabel("Address:", self)
+        self.addressEdit = QLineEdit(self)
+
+        self.cityLabel = QLabel("City:", self)
+        self.cityEdit = QLineEdit(self)
+
+        self.plzLabel = QLabel("PLZ Code:", self)
+        self.plzEdit = QLineEdit(self)
+
+        self.stateLabel = QLabel("State:", self)
+        self.stateCombo = QComboBox()
+        for state in self.stateList:
+            self.stateCombo.addItem(state)
+
+        self.dateLabel = QLabel("Date (dd.MM.yyyy):", self)
+        self.dateEdit = QDateEdit(self)
+        self.dateEdit.setCalendarPopup(True)
+        self.dateEdit.setDisplayFormat("dd.MM.yyyy")
+        self.dateEdit.setDate(QDate.currentDate())
+        minDate = QDate(2020, 1, 1)
+        maxDate = QDate.currentDate()
+        self.dateEdit.setMinimumDate(minDate)
+        self.dateEdit.setMaximumDate(maxDate)
+
+        self.tableLabel = QLabel("Tische:", self)
+        self.tableEdit = QSpinBox(self)
+        self.tableEdit.setMinimum(0)
+        self.tableEdit.setMaximum(2000)
+        self.tableEdit.setMinimum(0)
+
+        self.participantLabel = QLabel("Teilnehmer:", self)
+        self.participantEdit = QSpinBox(self)
+        self.participantEdit.setMinimum(0)
+        self.participantEdit.setMaximum(9999)
+
+        # New button for updating CSV
+        self.updateCsvButton = QPushButton("Update Excel", self)
+        self.updateCsvButton.clicked.connect(self.onUpdateCsvButtonClicked)
+
+        self.plotButton = QPushButton("Update Plot", self)
+        self.plotButton.clicked.connect(lambda: self.onPlotButtonClicked(doSave=True))
+
+        self.clearAllButton = QPushButton("Clear All", self)
+        self.clearAllButton.clicked.connect(self.clearAll)
+
+        self.recalculateButton = QPushButton("Recalculate Statistics", self)
+        self.recalculateButton.clicked.connect(self.onRecalculateButtonClicked)
+
+        self.verifyButton = QPushButton("Verify Statistics", self)
+        self.verifyButton.clicked.connect(self.onVerifyButtonClicked)
+
+        self.offlineCheckBox = QCheckBox("Offline Map (cached backgrounds only)", self)
+        self.offlineCheckBox.toggled.connect(self.onOfflineToggled)
+
+        self.clusterCheckBox = QCheckBox("Cluster dense markers", self)
+
+        self.choroplethCheckBox = QCheckBox("Shade states by participants", self)
+
+        self.archiveButton = QPushButton("Archive Xlsx", self)
+        self.archiveButton.clicked.connect(self.onArchiveButtonClicked)
+
+        self.exportXlsxButton = QPushButton("Export Xlsx", self)
+        self.exportXlsxButton.clicked.connect(self.onExportXlsxButtonClicked)
+
+        self.importXlsxButton = QPushButton("Import Xlsx", self)
+        self.importXlsxButton.clicked.connect(self.onImportXlsxButtonClicked)
+
+        self.findDuplicatesButton = QPushButton("Find Duplicates", self)
+        self.findDuplicatesButton.clicked.connect(self.onFindDuplicatesButtonClicked)
+
+        self.editEventsButton = QPushButton("Edit Events", self)
+        self.editEventsButton.clicked.connect(self.onEditEventsButtonClicked)
+
+        InputBoxGroupBox = QGroupBox("Manual Input", self)
+        InputBoxLayout = QGridLayout()
+        InputBoxGroupBox.setLayout(InputBoxLayout)
+
+        InputBoxLayout.addWidget(self.nameLabel, 0, 0)
+        InputBoxLayout.addWidget(self.nameEdit, 0, 1)
+        InputBoxLayout.addWidget(self.addressLookupButton, 1, 0, 1, 2)
+        InputBoxLayout.addWidget(self.addressLabel, 2, 0)
+        InputBoxLayout.addWidget(self.addressEdit, 2, 1)
+        InputBoxLayout.addWidget(self.cityLabel, 3, 0)
+        InputBoxLayout.addWidget(self.cityEdit, 3, 1)
+        InputBoxLayout.addWidget(self.plzLabel, 4, 0)
+        InputBoxLayout.addWidget(self.plzEdit, 4, 1)
+        InputBoxLayout.addWidget(self.stateLabel, 5, 0)
+        InputBoxLayout.addWidget(self.stateCombo, 5, 1)
+        InputBoxLayout.addWidget(self.dateLabel, 6, 0)
+        InputBoxLayout.addWidget(self.dateEdit, 6, 1)
+        InputBoxLayout.addWidget(self.tableLabel, 7, 0)
+        InputBoxLayout.addWidget(self.tableEdit, 7, 1)
+        InputBoxLayout.addWidget(self.participantLabel, 8, 0)
+        InputBoxLayout.addWidget(self.participantEdit, 8, 1)
+        InputBoxLayout.addWidget(self.updateCsvButton, 9, 0)
+        InputBoxLayout.addWidget(self.plotButton, 9, 1)
+        InputBoxLayout.addWidget(self.clearAllButton, 10, 0, 1, 2)
+
+        FileControlGroupBox = QGroupBox("File Control", self)
+        FileControlBoxLayout = QVBoxLayout()
+        FileControlGroupBox.setLayout(FileControlBoxLayout)
+        FileControlBoxLayout.addWidget(self.recalculateButton)
+        FileControlBoxLayout.addWidget(self.verifyButton)
+        FileControlBoxLayout.addWidget(self.findDuplicatesButton)
+        FileControlBoxLayout.addWidget(self.editEventsButton)
+        FileControlBoxLayout.addWidget(self.offlineCheckBox)
+        FileControlBoxLayout.addWidget(self.clusterCheckBox)
+        FileControlBoxLayout.addWidget(self.choroplethCheckBox)
+        FileControlBoxLayout.addWidget(self.archiveButton)
+        FileControlBoxLayout.addWidget(self.exportXlsxButton)
+        FileControlBoxLayout.addWidget(self.importXlsxButton)
+
+        '''
+        middleBox
+        '''
+        self.figure = plt.figure()
+        self.canvas = FigureCanvas(self.figure)
+        middleBox.addWidget(self.canvas)  # Add the canvas to the layout
+
+        # Renders run one at a time on their own thread, exports and address lookups on threads of their own
+        self.renderExecutor = ThreadPoolExecutor(max_workers=1)
+        self.exportExecutor = ThreadPoolExecutor(max_workers=1)
+        self.lookupExecutor = ThreadPoolExecutor(max_workers=1)
+        self.compaction = None
+        self.renderRequest = None
+        self.exportWorkers = []
+        self.lookupWorkers = []
+        self.busyBar = QProgressBar(self)
+        self.busyBar.setRange(0, 0)
+        self.busyBar.setMaximumWidth(150)
+        self.busyBar.setVisible(False)
+        self.statusBar().addPermanentWidget(self.busyBar)
+
+        '''
+        rightBox
+        '''
+        self.plotListWidget = QListWidget(self)
+        self.setupPlotListWidget()
+        self.plotListWidget.clicked.connect(self.onplotListWidgetClicked)
+
+        viewInputBox = QGridLayout()
+
+        viewInputGroupBox = QGroupBox("Manual View Input", self)
+        viewInputBoxLayout = QGridLayout()
+        viewInputGroupBox.setLayout(viewInputBoxLayout)
+        self.viewNameLabel = QLabel("View Name:", self)
+        self.viewName = QLineEdit(self)
+        self.viewLatLabel = QLabel("Central Latitude:", self)
+        self.viewLat = QLineEdit(self)
+        self.viewLonLabel = QLabel("Central Longitude:", self)
+        self.viewLon = QLineEdit(self)
+        self.viewLLCLatLabel = QLabel("Lower Left Corner Latitude:", self)
+        self.viewLLCLat = QLineEdit(self)
+        self.viewLLCLonLabel = QLabel("Lower Left Corner Longitude:", self)
+        self.viewLLCLon = QLineEdit(self)
+        self.viewURCLatLabel = QLabel("Upper Right Corner Latitude:", self)
+        self.viewURCLat = QLineEdit(self)
+        self.viewURCLonLabel = QLabel("Upper Right Corner Longitude:", self)
+        self.viewURCLon = QLineEdit(self)
+        self.cityLookupButton = QPushButton("Find City Coordinates", self)
+
+        self.previewTimer = QTimer(self)
+        self.previewTimer.setSingleShot(True)
+        self.previewTimer.setInterval(600)
+        self.previewTimer.timeout.connect(self.onPreviewTimeout)
+        for viewEdit in (self.viewLat, self.viewLon, self.viewLLCLat, self.viewLLCLon, self.viewURCLat,
+                         self.viewURCLon):
+            viewEdit.editingFinished.connect(self.schedulePreview)
+
+        viewInputBoxLayout.addWidget(self.viewNameLabel, 0, 0)
+        viewInputBoxLayout.addWidget(self.viewName, 0, 1)
+        viewInputBoxLayout.addWidget(self.viewLatLabel, 1, 0)
+        viewInputBoxLayout.addWidget(self.viewLat, 1, 1)
+        viewInputBoxLayout.addWidget(self.viewLonLabel, 2, 0)
+        viewInputBoxLayout.addWidget(self.viewLon, 2, 1)
+        viewInputBoxLayout.addWidget(self.viewLLCLatLabel, 3, 0)
+        viewInputBoxLayout.addWidget(self.viewLLCLat, 3, 1)
+        viewInputBoxLayout.addWidget(self.viewLLCLonLabel, 4, 0)
+        viewInputBoxLayout.addWidget(self.viewLLCLon, 4, 1)
+        viewInputBoxLayout.addWidget(self.viewURCLatLabel, 5, 0)
+        viewInputBoxLayout.addWidget(self.viewURCLat, 5, 1)
+        viewInputBoxLayout.addWidget(self.viewURCLonLabel, 6, 0)
+        viewInputBoxLayout.addWidget(self.viewURCLon, 6, 1)
+
+        cityLookupGroupBox = QGroupBox("City Lookup", self)
+        cityLookupBoxLayout = QGridLayout()
+        cityLookupGroupBox.setLayout(cityLookupBoxLayout)
+
+        self.cityNameLabel = QLabel("City Name:", self)
+        self.cityName = QLineEdit(self)
+        self.stateNameLabel = QLabel("State Name:", self)
+        self.stateLookupCombo = QComboBox()
+        for state in self.stateList:
+            self.stateLookupCombo.addItem(state)
+        self.cityLookupButton.clicked.connect(self.onCityLookupButtonClicked)
+        cityLookupBoxLayout.addWidget(self.cityNameLabel, 0, 0)
+        cityLookupBoxLayout.addWidget(self.cityName, 0, 1)
+        cityLookupBoxLayout.addWidget(self.stateNameLabel, 1, 0)
+        cityLookupBoxLayout.addWidget(self.stateLookupCombo, 1, 1)
+        cityLookupBoxLayout.addWidget(self.cityLookupButton, 2, 0, 1, 2)
+
+        self.PreViewAddButton = QPushButton("Preview View", self)
+        self.PreViewAddButton.clicked.connect(self.onPreViewButtonClicked)
+        self.ViewAddButton = QPushButton("Save View", self)
+        self.ViewAddButton.clicked.connect(self.onViewAddButtonClicked)
+        self.ViewRemoveButton = QPushButton("Remove View", self)
+        self.ViewRemoveButton.clicked.connect(self.onViewRemoveButtonClicked)
+
+        viewInputBox.addWidget(cityLookupGroupBox, 0, 0, 5, 2)
+        viewInputBox.addWidget(viewInputGroupBox, 5, 0, 5, 2)
+        viewInputBox.addWidget(self.PreViewAddButton, 10, 0, 1, 2)
+        viewInputBox.addWidget(self.ViewAddButton, 11, 0, 1, 2)
+        viewInputBox.addWidget(self.ViewRemoveButton, 12, 0, 1, 2)
+
+        rightBox.addWidget(self.plotListWidget, 0, 0, 5, 1)
+        rightBox.addLayout(viewInputBox, 6, 0, 3, 1)
+
+        leftBox.addWidget(bulkImportGroupBox, 0, 0, 3, 2)
+        leftBox.addWidget(InputBoxGroupBox, 3, 0, 3, 2)
+        leftBox.addWidget(FileControlGroupBox, 6, 0, 1, 2)
+
+        mylayout.addLayout(leftBox)
+        mylayout.addLayout(middleBox)
+        mylayout.addLayout(rightBox)
+
+        centralWidget.setLayout(mylayout)
+
+        # Draw the initial map
+        self.drawInitialMap()
+
+    def create_msg_box(self, title, text, type='info'):
+        """
+        Creates popup style message boxes.
+
+        Args:
+            title (str): Title text for header for the pop up window
+            text (str): Body text for the pop up window
+            type (str): Class of pop up. Accepts 'info', 'warning', or 'critical'
+
+        Returns:
+            None
+
+        """
+        msgBox = QMessageBox(self)
+        if type == 'info':
+            type = QMessageBox.Icon.Information
+        elif type == 'warning':
+            type = QMessageBox.Icon.Warning
+        elif type == 'critical':
+            type = QMessageBox.Icon.Critical
+        msgBox.setIcon(QMessageBox.Icon.Information)
+        msgBox.setWindowTitle(title)
+        msgBox.setText(text)
+        msgBox.setStandardButtons(QMessageBox.StandardButton.Ok)
+        msgBox.exec()
+
+    def onUpdateCsvButtonClicked(self):
+        """
+        Handles the event when the 'Update CSV' button is clicked.
+
+        This method validates the input fields, converts relevant fields to integers,
+        and checks that they are greater than zero. An event that is already stored is only added again
+        after the user confirms it. It then retrieves the coordinates
+        based on the provided address details and updates the corresponding Excel file
+        with the new data, updating the statistics incrementally. If the data is successfully saved,
+        the user is notified. If the input validation fails, or the Excel file cannot
+        be updated, an appropriate error message is displayed.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None: All exceptions are handled internally. A ValueError is caught and an error message
+            is displayed if any of the input fields are invalid, empty, or if tables and participants
+            are not greater than zero.
+
+        UI Feedback:
+            - Displays a success message if the data is saved successfully.
+            - Displays an error message if input validation fails or if the data cannot be saved.
+
+        """
+        date = self.dateEdit.text()
+        name = self.nameEdit.text()
+        address = self.addressEdit.text()
+        city = self.cityEdit.text()
+        plzCode = self.plzEdit.text()
+        state = self.stateCombo.currentText()
+        tables = self.tableEdit.text()
+        participants = self.participantEdit.text()
+
+        try:
+            # Validate that all required fields are filled
+            if not date or not name or not address or not city or not plzCode or not state or not tables or not participants:
+                raise ValueError("All fields must be filled in.")
+
+            # Convert tables and participants to integers and check if they are greater than zero
+            tables_int = int(tables)
+            participants_int = int(participants)
+
+            if tables_int <= 0 or participants_int <= 0:
+                raise ValueError("Tables and participants must be greater than zero.")
+
+            event = {'Datum': date, 'Hochschule': name, 'Stadt': city, 'Tische': tables_int,
+                     'Teilnehmer': participants_int}
+            if self.data.contains_event(event):
+                button = QMessageBox.question(self, "Duplicate Event",
+                                              f"An event of {name} in {city} on {date} with the same tables and "
+                                              f"participants is already stored.\n\nAdd it again?")
+                if button != QMessageBox.StandardButton.Yes:
+                    return
+
+            # Get coordinates, add the event and write it to the database
+            latitude, longitude = self.get_coordinates(city, state, plzCode, address)
+            self.update_excel(
+                self.excelFilePath,
+                date,
+                name,
+                address,
+                city,
+                state,
+                plzCode,
+                latitude,
+                longitude,
+                tables_int,
+                participants_int
+            )
+
+            if not self.flush_data():
+                self.create_msg_box('Input Failed!',
+                                    'Data not saved.\n\nPlease check that the database is writable and try again.',
+                                    'warning')
+            else:
+                self.create_msg_box('Input Successful!',
+                                    'Data saved successfully!\n\nClick on "Update Plot" to see the changes.')
+                # Clear inputs
+                self.clearAll()
+
+        except ValueError as e:
+            # Display an error message if any validation fails
+            self.create_msg_box('Input Error', f'{str(e)}\n\nData not saved.', 'warning')
+
+    def getPlotItem(self):
+        """
+       Retrieves the view currently selected in the plot list widget from the view registry.
+
+       Args:
+           None
+
+       Returns:
+           ViewRecord: The selected view, or None if there is no view of that name.
+       """
+        return self.views.get(self.plotListWidget.currentItem().text())
+
+    def onPlotButtonClicked(self, doSave=False):
+        """
+        Handles the event of the Plot Update button being clicked.
+
+        Reads the events and stats out of the ClimatePlotter excel document, retrieves the desired view from
+        the views widget, then sends the information to the render thread.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        df_events, df_stats = self.read_data()
+        plotItem = self.getPlotItem()
+        self.submit_render(df_stats, *plotItem.bbox, plotItem.name, doSave=doSave)
+
+    def setupPlotListWidget(self):
+        """
+        Initialize the UI of the plot view widget on the right hand side of the program.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        self.plotListWidget.clear()
+        self.plotListWidget.addItems(self.views.names())
+        self.plotListWidget.setCurrentRow(0)
+
+    def onplotListWidgetClicked(self):
+        """
+        Handles the event of an item in the Views list being clicked upon.
+
+        Gets the data of the selected view, updates the text fields to match and draws the view in the
+        background. Clicking another view before it is drawn cancels the previous one.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        entry = self.getPlotItem()
+        self.viewName.setText(entry.name)
+        self.viewLat.setText(str(entry.lat_0))
+        self.viewLon.setText(str(entry.lon_0))
+        self.viewLLCLat.setText(str(entry.llcrnrlat))
+        self.viewLLCLon.setText(str(entry.llcrnrlon))
+        self.viewURCLat.setText(str(entry.urcrnrlat))
+        self.viewURCLon.setText(str(entry.urcrnrlon))
+        self.progressive_preview(entry.lat_0, entry.lon_0, *entry.bbox, entry.name)
+
+    def ClearViewText(self):
+        """
+        Clears the text fields associated with the Views.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        self.viewName.clear()
+        self.viewLat.clear()
+        self.viewLon.clear()
+        self.viewLLCLat.clear()
+        self.viewLLCLon.clear()
+        self.viewURCLat.clear()
+        self.viewURCLon.clear()
+
+    def onPreViewButtonClicked(self):
+        """
+        Handles the event when the 'Pre-View' button is clicked.
+
+        This method validates and converts the input fields required for plotting. It checks that all necessary
+        fields (latitude, longitude, lower-left corner, upper-right corner coordinates, and view name) are filled
+        and correctly formatted as floats. If any validation fails, an error message is displayed. If all inputs
+        are valid, it proceeds to plot the map using the provided data.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None: All exceptions are handled internally. A ValueError is caught and an error message is displayed
+            if any input conversion fails or if the view name is empty.
+
+        UI Feedback:
+            - Displays an error message if input validation fails, indicating the specific issue.
+        """
+        try:
+            # Convert input text to floats
+            lat = float(self.viewLat.text())
+            lon = float(self.viewLon.text())
+            llc_lat = float(self.viewLLCLat.text())
+            llc_lon = float(self.viewLLCLon.text())
+            urc_lat = float(self.viewURCLat.text())
+            urc_lon = float(self.viewURCLon.text())
+            view_name = self.viewName.text()
+
+            # Check if any field is empty after conversion
+            if view_name == '':
+                raise ValueError("View name cannot be empty.")
+
+            # If all conversions succeed, proceed with plotting
+            self.progressive_preview(lat, lon, llc_lat, llc_lon, urc_lat, urc_lon, view_name)
+
+        except ValueError as e:
+            # Display an error message if there's a problem with conversion or an empty field
+            self.create_msg_box('Input Error', f'Invalid input: {str(e)}\n\nPlease correct the input and try again.',
+                                'warning')
+
+    def progressive_preview(self, lat, lon, llc_lat, llc_lon, urc_lat, urc_lon, view_name):
+        """
+        Renders a preview progressively. The final resolution is chosen from the extent of the view and the width
+        of the canvas. If the Basemap for that resolution is not cached yet, the view is first drawn at crude
+        resolution and then redrawn at the final resolution. Both renders run on the render thread, and a newer
+        preview or plot cancels the refinement.
+
+        Args:
+            lat (float): Latitude coordinate of plot center.
+            lon (float): Longitude coordinate of plot center.
+            llc_lat (float): Latitude - Lower left corner of view window
+            llc_lon (float): Longitude - Lower left corner of view window
+            urc_lat (float): Latitude - Upper right corner of view window
+            urc_lon (float): Longitude - Upper right corner of view window
+            view_name (str): Name of the view.
+
+        Returns:
+            None
+        """
+        resolution = choose_resolution(llc_lat, llc_lon, urc_lat, urc_lon, self.canvas.width())
+        df_events, df_stats = self.read_data()
+
+        def plot(plot_resolution, on_done=None):
+            self.submit_render(df_stats, llc_lat, llc_lon, urc_lat, urc_lon, view_name, plot_resolution,
+                               on_done=on_done)
+
+        if self.basemapCache.contains(llc_lat, llc_lon, urc_lat, urc_lon, resolution) or resolution == 'c':
+            plot(resolution)
+            return
+        plot('c', on_done=lambda: plot(resolution))
+
+    def schedulePreview(self):
+        """
+        Restarts the preview debounce timer after a view field was edited, so the preview follows the edits
+        without rendering on every change.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.previewTimer.start()
+
+    def onPreviewTimeout(self):
+        """
+        Renders a progressive preview of the view fields once editing has paused. Incomplete or invalid input is
+        ignored silently, since the user is still typing.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        try:
+            values = [float(edit.text()) for edit in (self.viewLat, self.viewLon, self.viewLLCLat, self.viewLLCLon,
+                                                      self.viewURCLat, self.viewURCLon)]
+        except ValueError:
+            return
+        if values[2] >= values[4] or values[3] >= values[5]:
+            return
+        self.progressive_preview(*values, self.viewName.text() or 'Preview')
+
+    def onCityLookupButtonClicked(self):
+        """
+        Handles the event when the 'City Lookup' button is clicked.
+
+        This method performs a lookup for the city and state combination entered by the user. It retrieves the
+        corresponding address information in the background using `fetch_address`, and `fill_city_fields` populates
+        the relevant fields (view name, latitude, longitude, and bounding box coordinates) in the UI. If no address is found, an
+        error message is displayed. If the address is found, the method automatically triggers a preview of the
+        view by calling `onPreViewButtonClicked`.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None: All exceptions are handled internally. An `AddressError` is caught and an error message is displayed
+            if no address is found or if there is an issue with the address lookup.
+
+        UI Feedback:
+            - Populates the UI fields with the retrieved address information if successful.
+            - Displays an error message if the address lookup fails.
+        """
+        self.start_address_lookup(self.cityName.text() + ', ' + self.stateLookupCombo.currentText(),
+                                  self.fill_city_fields)
+
+    def fill_city_fields(self, raw_address):
+        """
+        Fills the view fields from a city found by onCityLookupButtonClicked and previews the view.
+
+        Args:
+            raw_address (dict): geopy.location.Location.raw returned by Nominatim.
+
+        Returns:
+            None
+        """
+        try:
+            self.viewName.setText(raw_address['name'])
+            self.viewLat.setText(str(raw_address['lat']))
+            self.viewLon.setText(str(raw_address['lon']))
+            self.viewLLCLat.setText(str(raw_address['boundingbox'][0]))
+            self.viewLLCLon.setText(str(raw_address['boundingbox'][2]))
+            self.viewURCLat.setText(str(raw_address['boundingbox'][1]))
+            self.viewURCLon.setText(str(raw_address['boundingbox'][3]))
+            self.onPreViewButtonClicked()
+            # return
+        except AddressError as e:
+            self.create_msg_box("Address Error",
+                                f"Error: {str(e)} \n\n"
+                                f"Check that you have selected the correct state where the city is.",
+                                'warning')
+            return
+
+
+    def onViewAddButtonClicked(self):
+        """
+        Handles the event when the 'Add View' button is clicked.
+
+        This method validates the input fields for adding or updating a view configuration. It checks that all
+        necessary fields (latitude, longitude, lower-left corner, upper-right corner coordinates, and view name)
+        are filled. If any field is empty, an error message is displayed. If all inputs are valid, the method
+        checks if the view name already exists in the view registry:
+
+        - If the view exists, the existing entry is updated with the new coordinates.
+        - If the view does not exist, a new entry is added to the registry.
+
+        The registry saves the views to the database if they changed, and the view list widget is refreshed to
+        reflect the changes.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None: All exceptions are handled internally. An error message is displayed if any input field is empty
+            or a coordinate is not a number.
+
+        UI Feedback:
+            - Displays a success message if the view is successfully added or updated.
+            - Displays an error message if any input field is empty or a coordinate is not a number.
+        """
+        lat = self.viewLat.text()
+        lon = self.viewLon.text()
+        llc_lat = self.viewLLCLat.text()
+        llc_lon = self.viewLLCLon.text()
+        urc_lat = self.viewURCLat.text()
+        urc_lon = self.viewURCLon.text()
+        view_name = self.viewName.text()
+        if lat == '' or lon == '' or llc_lat == '' or llc_lon == '' or urc_lat == '' or urc_lon == '' or view_name == '':
+            self.create_msg_box('Input Empty!', 'Fill in all the fields!\n\nData not saved.', 'warning')
+        else:
+            try:
+                view = ViewRecord(view_name, lat, lon, llc_lon, llc_lat, urc_lon, urc_lat)
+            except ValueError as e:
+                self.create_msg_box('Input Error',
+                                    f'Invalid input: {str(e)}\n\nPlease correct the input and try again.', 'warning')
+                return
+            view_exists = view_name in self.views
+            self.views.set(view)
+            if view_exists:
+                self.setupPlotListWidget()
+                self.ClearViewText()
+                self.create_msg_box('Input Successful!',
+                                    'View updated successfully')
+            else:
+                self.setupPlotListWidget()
+                self.ClearViewText()
+                self.create_msg_box('Input Successful!',
+                                    'View saved successfully')
+
+    def onViewRemoveButtonClicked(self):
+        """
+        Handles the event when the 'Remove View' button is clicked.
+
+        This method removes the selected view from the view registry, except for default views such as
+        'Deutschland' and any views listed in `stateList`. If an attempt is made to remove a default view, an
+        error message is displayed, and the removal is aborted. If the selected view is successfully removed,
+        the registry saves the views to the database, and the plot list widget is refreshed. The input fields
+        are cleared, and a success message is displayed.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None: All exceptions are handled internally. An error message is displayed if the user tries to remove
+            a default view.
+
+        UI Feedback:
+            - Displays a success message if the view is removed successfully.
+            - Displays an error message if the user attempts to remove a default view.
+        """
+        entry = self.plotListWidget.currentItem().text()
+        if entry == 'Deutschland' or entry in self.stateList:
+            self.create_msg_box('Error',
+                                'Cannot remove default views',
+                                'warning')
+            return
+        else:
+            self.views.remove(entry)
+            self.setupPlotListWidget()
+            self.ClearViewText()
+            self.create_msg_box('Success',
+                                'View removed successfully')
+
+
+def run_app():
+    matplotlib.use('QtAgg')
+    app = QApplication([])
+    mainWin = LectureMapApp()
+    mainWin.show()
+    sys.exit(app.exec())
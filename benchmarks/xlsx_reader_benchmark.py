@@ -0,0 +1,98 @@
+'''
+Compares the xlsx reader engines of ClimatePlotter3.read_xlsx on synthetic Events workbooks.
+
+Usage:
+    python benchmarks/xlsx_reader_benchmark.py
+    python benchmarks/xlsx_reader_benchmark.py --rows 1000 200000 --repeat 5
+
+The workbooks are generated once per row count into the temporary directory and reused by later runs. Every
+engine has to return the same dataframe as pandas' default engine.
+'''
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import openpyxl
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import ClimatePlotter3 as cp  # noqa: E402
+
+
+def make_workbook(file_path, rows, seed=0):
+    '''
+    Writes an Events sheet with the given number of rows of plausible values.
+
+    Args:
+        file_path (str): Path of the workbook to write.
+        rows (int): Number of events.
+        seed (int): Seed of the random values.
+
+    Returns:
+        None
+    '''
+    rng = random.Random(seed)
+    cities = [(f'Stadt {i}', cp.STATE_LIST[i % len(cp.STATE_LIST)], 10000 + 37 * i) for i in range(500)]
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Events')
+    sheet.append(cp.EVENT_COLUMNS)
+    for i in range(rows):
+        city, state, plz = rng.choice(cities)
+        sheet.append([f'{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(2020, 2025)}',
+                      f'Hochschule {rng.randint(0, 2000)}', f'Straße {rng.randint(1, 200)}', city, state, plz,
+                      rng.randint(1, 20), rng.randint(5, 200)])
+    workbook.save(file_path)
+
+
+def engines():
+    '''
+    Lists the engines that can run here.
+
+    Args:
+        None
+
+    Returns:
+        list of str: Engine names accepted by read_xlsx.
+    '''
+    names = ['default', 'openpyxl-stream']
+    if cp.XLSX_ENGINE == 'calamine':
+        names.append('calamine')
+    return names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the xlsx reader engines on synthetic workbooks.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000, 200000],
+                        help='Row counts of the generated workbooks.')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per engine, the fastest is reported.')
+    parser.add_argument('--dir', default=os.path.join(tempfile.gettempdir(), 'climateplotter_xlsx_benchmark'),
+                        help='Directory for the generated workbooks.')
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.dir, exist_ok=True)
+    print(f'{"rows":>8} {"engine":<16} {"seconds":>9} {"rows/s":>11} {"speedup":>8}')
+    for rows in args.rows:
+        file_path = os.path.join(args.dir, f'events_{rows}.xlsx')
+        if not os.path.exists(file_path):
+            make_workbook(file_path, rows)
+        reference = None
+        baseline = None
+        for engine in engines():
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                df = cp.read_xlsx(file_path, {'Events': cp.EVENT_SCHEMA}, engine)['Events']
+                timings.append(time.perf_counter() - start)
+            if reference is None:
+                reference = df
+            elif not df.equals(reference):
+                raise SystemExit(f'{engine} returned a different dataframe for {rows} rows')
+            best = min(timings)
+            baseline = baseline or best
+            print(f'{rows:>8} {engine:<16} {best:>9.3f} {rows / best:>11,.0f} {baseline / best:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
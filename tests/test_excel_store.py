@@ -0,0 +1,98 @@
+import json
+
+import pandas as pd
+import pytest
+
+import ClimatePlotter3 as cp
+
+
+def make_event(number):
+    return pd.Series(['01.01.2024', f'Schule {number}', 'Hauptstraße 1', 'Karlsruhe', 'Baden-Württemberg', 76133,
+                      1, number], index=cp.EVENT_COLUMNS)
+
+
+def names(store):
+    return store.read()[0]['Hochschule'].tolist()
+
+
+def journal_entries(store):
+    with open(store.journal_path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = cp.ExcelStore(str(tmp_path / 'ClimatePlotter.xlsx'))
+    assert store.write(pd.DataFrame(columns=cp.EVENT_COLUMNS), pd.DataFrame(columns=cp.STATS_COLUMNS))
+    return store
+
+
+def test_journal_is_replayed_in_sequence(store):
+    for number in range(3):
+        store.insert_event(make_event(number))
+    assert [entry['seq'] for entry in journal_entries(store)] == [2, 3, 4]
+    assert names(store) == ['Schule 0', 'Schule 1', 'Schule 2']
+
+
+def test_sequence_continues_in_a_new_instance(store):
+    store.insert_event(make_event(0))
+    reopened = cp.ExcelStore(store.file_path)
+    reopened.insert_event(make_event(1))
+    assert [entry['seq'] for entry in journal_entries(reopened)] == [2, 3]
+    assert names(reopened) == ['Schule 0', 'Schule 1']
+
+
+def test_truncated_line_is_skipped(store):
+    store.insert_event(make_event(0))
+    with open(store.journal_path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "insert", "event": {"Datum": "01.01')
+    assert names(store) == ['Schule 0']
+    store.insert_event(make_event(1))
+    assert names(store) == ['Schule 0', 'Schule 1']
+
+
+def test_positional_update_and_delete_are_replayed(store):
+    for number in range(3):
+        store.insert_event(make_event(number))
+    store.update_event(1, make_event(7))
+    store.delete_event(0)
+    assert names(store) == ['Schule 7', 'Schule 2']
+    assert store.compact()
+    assert names(cp.ExcelStore(store.file_path)) == ['Schule 7', 'Schule 2']
+
+
+def test_no_double_apply_after_crash_before_journal_removal(store, monkeypatch):
+    store.insert_event(make_event(0))
+    store.insert_event(make_event(1))
+    # The workbook is replaced, then the process dies before the journal is emptied
+    monkeypatch.setattr(store, '_drop_journal', lambda sequence: None)
+    assert store.compact()
+    assert len(journal_entries(store)) == 2
+    assert cp.xlsx_identifier(store.file_path) == 'journal-seq:3'
+    reopened = cp.ExcelStore(store.file_path)
+    assert names(reopened) == ['Schule 0', 'Schule 1']
+    reopened.delete_event(0)
+    assert names(reopened) == ['Schule 1']
+
+
+def test_changes_journaled_during_compaction_are_kept(store, monkeypatch):
+    store.insert_event(make_event(0))
+    write_snapshot = store._write_snapshot
+
+    def write_and_append(*args):
+        store.insert_event(make_event(1))
+        return write_snapshot(*args)
+
+    monkeypatch.setattr(store, '_write_snapshot', write_and_append)
+    assert store.compact()
+    assert [entry['seq'] for entry in journal_entries(store)] == [3]
+    assert names(store) == ['Schule 0', 'Schule 1']
+
+
+def test_stats_rows_are_replaced_per_city(store):
+    stats = pd.DataFrame([['Schule 0', 'Karlsruhe', 76133, 49.0, 8.4, 1, 1, 1, 5, 5]], columns=cp.STATS_COLUMNS)
+    store.replace_city_stats('Karlsruhe', stats)
+    store.replace_city_stats('Karlsruhe', stats.assign(TotalParticipants=9))
+    df_stats = store.read()[1]
+    assert len(df_stats) == 1
+    assert df_stats['TotalParticipants'].tolist() == [9]
@@ -0,0 +1,53 @@
+import pandas as pd
+
+import ClimatePlotter3 as cp
+
+
+def make_frame(*rows):
+    return pd.DataFrame(list(rows), columns=list(cp.INPUT_SCHEMA))
+
+
+VALID = ['01.02.2024', 'Hochschule Karlsruhe', 'Moltkestraße 30', 'Karlsruhe', 'Baden-Württemberg', 76133, 3, 11]
+
+
+def test_valid_row_is_normalized():
+    valid, errors = cp.validate_input_frame(make_frame(VALID))
+    assert errors == []
+    row = valid.iloc[0]
+    assert row['Datum'] == pd.Timestamp(2024, 2, 1)
+    assert row['PLZ'] == '76133'
+    assert (row['Tische'], row['Teilnehmer']) == (3, 11)
+
+
+def test_lost_leading_zero_and_state_case_are_restored():
+    row = VALID[:4] + ['sachsen', 1067] + VALID[6:]
+    valid, errors = cp.validate_input_frame(make_frame(row))
+    assert errors == []
+    assert valid.iloc[0]['PLZ'] == '01067'
+    assert valid.iloc[0]['Bundesland'] == 'Sachsen'
+
+
+def test_invalid_rows_are_reported_by_line_and_column():
+    rows = [VALID,
+            VALID[:1] + [''] + VALID[2:],
+            ['31.02.2024'] + VALID[1:],
+            VALID[:5] + [761] + VALID[6:],
+            VALID[:6] + [2.5, 0],
+            VALID[:4] + ['Elsass'] + VALID[5:]]
+    valid, errors = cp.validate_input_frame(make_frame(*rows))
+    assert list(valid.index) == [0]
+    assert errors == [(2, 'Hochschule', 'is empty'),
+                      (3, 'Datum', 'is not a date'),
+                      (4, 'PLZ', 'is not a 5 digit post code'),
+                      (5, 'Tische', 'is not a positive integer'),
+                      (5, 'Teilnehmer', 'is not a positive integer'),
+                      (6, 'Bundesland', 'is not a German state')]
+
+
+def test_event_key_ignores_date_type_case_and_count_type():
+    event = dict(zip(cp.EVENT_COLUMNS, VALID))
+    same = dict(event, Datum=pd.Timestamp(2024, 2, 1), Hochschule='  hochschule   KARLSRUHE', Tische=3.0,
+                Teilnehmer='11')
+    assert cp.event_key(same) == cp.event_key(event)
+    assert cp.event_key(dict(event, Teilnehmer=12)) != cp.event_key(event)
+    assert cp.event_key(dict(event, Datum='02.02.2024')) != cp.event_key(event)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import ClimatePlotter3 as cp
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(47.3, 55.0, 2000)
+    lons = rng.uniform(5.9, 15.0, 2000)
+    lats[::97] = np.nan
+    return lats, lons
+
+
+@pytest.mark.parametrize('box', [(47.0, 5.0, 56.0, 16.0), (48.9, 8.3, 49.1, 8.5), (50.0, 10.0, 50.0, 10.0),
+                                 (30.0, 0.0, 40.0, 4.0), (52.03, 9.97, 53.51, 12.44)])
+def test_query_box_matches_brute_force(points, box):
+    lats, lons = points
+    llc_lat, llc_lon, urc_lat, urc_lon = box
+    expected = np.flatnonzero((lats >= llc_lat) & (lats <= urc_lat) & (lons >= llc_lon) & (lons <= urc_lon))
+    for cell_size in (0.05, 0.1, 1.0):
+        assert np.array_equal(cp.GridIndex(lats, lons, cell_size).query_box(*box), expected)
+
+
+def test_query_box_on_empty_index():
+    assert len(cp.GridIndex([], []).query_box(47.0, 5.0, 56.0, 16.0)) == 0
+
+
+def make_stats(points):
+    lats, lons = points
+    participants = np.arange(len(lats)) % 40 + 1
+    return pd.DataFrame({'Latitude': lats, 'Longitude': lons, 'TotalParticipants': participants})
+
+
+@pytest.mark.parametrize('zoom', [0, 5, 7, 9, 12, 22])
+def test_cluster_level_conserves_schools_and_participants(points, zoom):
+    df_stats = make_stats(points)
+    located = df_stats.dropna(subset=['Latitude'])
+    clusters = cp.ClusterLayer(df_stats).level(zoom)
+    assert clusters['Count'].sum() == len(located)
+    assert clusters['TotalParticipants'].sum() == located['TotalParticipants'].sum()
+    assert clusters['Latitude'].between(47.3, 55.0).all() and clusters['Longitude'].between(5.9, 15.0).all()
+
+
+def test_cluster_level_merges_as_the_map_zooms_out(points):
+    layer = cp.ClusterLayer(make_stats(points))
+    sizes = [len(layer.level(zoom)) for zoom in (22, 9, 5, 0)]
+    assert sizes == sorted(sizes, reverse=True)
+    assert sizes[0] == np.isfinite(points[0]).sum()
+    assert sizes[-1] == 1
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+import ClimatePlotter3 as cp
+from wms_server import LocalWmsServer
+
+pytest.importorskip('owslib')
+
+BBOX = (650000.0, 6000000.0, 1700000.0, 7400000.0)
+SIZE = (40, 30)
+
+
+@pytest.fixture
+def server():
+    server = LocalWmsServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+def getmap_count(server):
+    return sum(1 for query in server.requests if query.get('request', '').lower() == 'getmap')
+
+
+def test_repeat_request_is_served_from_cache(server, tmp_path):
+    cache = cp.WmsImageCache(server.url, str(tmp_path))
+    image = cache.get_image('web_light', BBOX, SIZE, 3857)
+    assert image.shape[:2] == (SIZE[1], SIZE[0])
+    again = cp.WmsImageCache(server.url, str(tmp_path)).get_image('web_light', BBOX, SIZE, 3857)
+    assert (again == image).all()
+    assert getmap_count(server) == 1
+
+
+def test_offline_miss_draws_no_background(server, tmp_path):
+    cache = cp.WmsImageCache(server.url, str(tmp_path), offline=True)
+    assert cache.get_image('web_light', BBOX, SIZE, 3857) is None
+    assert server.requests == []
+
+
+def test_undecodable_response_is_not_cached(server, tmp_path):
+    server.truncate = True
+    cache = cp.WmsImageCache(server.url, str(tmp_path))
+    assert cache.get_image('web_light', BBOX, SIZE, 3857) is None
+    assert not any(name.endswith('.png') for name in os.listdir(tmp_path))
+
+
+def test_corrupt_cache_entry_is_removed(server, tmp_path):
+    cache = cp.WmsImageCache(server.url, str(tmp_path))
+    cache.get_image('web_light', BBOX, SIZE, 3857)
+    [name] = [name for name in os.listdir(tmp_path) if name.endswith('.png')]
+    with open(tmp_path / name, 'r+b') as file:
+        file.truncate(20)
+    offline = cp.WmsImageCache(server.url, str(tmp_path), offline=True)
+    assert offline.get_image('web_light', BBOX, SIZE, 3857) is None
+    assert os.listdir(tmp_path) == []
+    assert cache.get_image('web_light', BBOX, SIZE, 3857) is not None
+    assert getmap_count(server) == 2
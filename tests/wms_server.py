@@ -0,0 +1,114 @@
+'''
+Local stand-in for the TopPlus WMS server used by the WmsImageCache tests.
+'''
+import io
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import matplotlib.image
+import numpy as np
+
+
+class LocalWmsServer:
+    '''
+    Minimal local stand-in for a WMS server.
+
+    Serves a WMS 1.1.1 GetCapabilities document listing the given layers and answers GetMap requests with a
+    solid colour PNG of the requested size. Requests are counted so tests can check whether the cache was used.
+
+    Attributes:
+        layers (list of str): Layer names offered by the server.
+        requests (list of dict): Query parameters of every request received.
+        truncate (bool): If True, GetMap answers with the first half of the PNG only.
+        url (str): GetCapabilities URL of the running server.
+    '''
+    def __init__(self, layers=('web_light',), color=(0.9, 0.9, 0.85)):
+        self.layers = list(layers)
+        self.color = color
+        self.requests = []
+        self.truncate = False
+        self._httpd = None
+
+    def start(self):
+        '''
+        Starts the server on a free local port in a background thread.
+
+        Args:
+            None
+
+        Returns:
+            str: GetCapabilities URL of the server.
+        '''
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                query = {key.lower(): values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                server.requests.append(query)
+                if query.get('request', '').lower() == 'getmap':
+                    width, height = (int(value) for value in (query['width'], query['height']))
+                    buffer = io.BytesIO()
+                    matplotlib.image.imsave(buffer, np.ones((height, width, 3)) * server.color, format='png')
+                    body, content_type = buffer.getvalue(), 'image/png'
+                    if server.truncate:
+                        body = body[:len(body) // 2]
+                else:
+                    body, content_type = server.capabilities().encode(), 'application/vnd.ogc.wms_xml'
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self.url
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self._httpd.server_port}/wms?request=GetCapabilities&service=wms'
+
+    def capabilities(self):
+        '''
+        Builds the GetCapabilities document.
+
+        Args:
+            None
+
+        Returns:
+            str: WMS 1.1.1 capabilities XML.
+        '''
+        href = f'http://127.0.0.1:{self._httpd.server_port}/wms?'
+        layers = ''.join(f'<Layer queryable="0"><Name>{layer}</Name><Title>{layer}</Title>'
+                         f'<SRS>EPSG:3857</SRS></Layer>' for layer in self.layers)
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                '<WMT_MS_Capabilities version="1.1.1" xmlns:xlink="http://www.w3.org/1999/xlink">'
+                '<Service><Name>OGC:WMS</Name><Title>Local WMS</Title></Service>'
+                '<Capability><Request>'
+                '<GetCapabilities><Format>application/vnd.ogc.wms_xml</Format><DCPType><HTTP><Get>'
+                f'<OnlineResource xlink:type="simple" xlink:href="{href}"/></Get></HTTP></DCPType>'
+                '</GetCapabilities>'
+                '<GetMap><Format>image/png</Format><DCPType><HTTP><Get>'
+                f'<OnlineResource xlink:type="simple" xlink:href="{href}"/></Get></HTTP></DCPType></GetMap>'
+                '</Request><Exception><Format>application/vnd.ogc.se_xml</Format></Exception>'
+                f'<Layer><Title>Local WMS</Title><SRS>EPSG:3857</SRS>{layers}</Layer>'
+                '</Capability></WMT_MS_Capabilities>')
+
+    def stop(self):
+        '''
+        Stops the server.
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
@@ -0,0 +1,65 @@
+'''
+Builds the offline PLZ gazetteer shapefiles/PLZ_Gazetteer.npz from the GeoNames postal code export for Germany
+(DE.zip, CC BY 4.0, https://download.geonames.org/export/zip/).
+
+Usage:
+    python tools/build_gazetteer.py --sha256 <hex digest of DE.zip>
+    python tools/build_gazetteer.py --source DE.zip --sha256 <hex digest of DE.zip>
+
+GeoNames regenerates the export regularly, so there is no digest that stays valid. Pin the SHA-256 of the copy you
+reviewed; the archive is only built if the download or local file matches it.
+'''
+import argparse
+import hashlib
+import io
+import os
+import sys
+import urllib.request
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from ClimatePlotter3 import PlzGazetteer  # noqa: E402
+
+SOURCE_URL = 'https://download.geonames.org/export/zip/DE.zip'
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shapefiles', 'PLZ_Gazetteer.npz')
+
+
+def read_source(source, timeout):
+    '''
+    Reads the export from a local file or downloads it.
+
+    Args:
+        source (str or None): Path to a local DE.zip, or None to download it from SOURCE_URL.
+        timeout (float): Download timeout in seconds.
+
+    Returns:
+        bytes: Contents of DE.zip.
+    '''
+    if source:
+        with open(source, 'rb') as file:
+            return file.read()
+    with urllib.request.urlopen(SOURCE_URL, timeout=timeout) as response:
+        return response.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sha256', required=True, help='Expected SHA-256 hex digest of DE.zip.')
+    parser.add_argument('--source', help='Local DE.zip to build from instead of downloading it.')
+    parser.add_argument('--output', default=OUTPUT_PATH, help='Path of the archive to write.')
+    parser.add_argument('--timeout', type=float, default=60.0, help='Download timeout in seconds.')
+    args = parser.parse_args(argv)
+
+    data = read_source(args.source, args.timeout)
+    digest = hashlib.sha256(data).hexdigest()
+    if digest != args.sha256.strip().lower():
+        print(f"SHA-256 mismatch: expected {args.sha256}, got {digest}", file=sys.stderr)
+        return 1
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        PlzGazetteer.build_from_geonames(io.BytesIO(archive.read('DE.txt')), args.output)
+    print(f"Wrote {os.path.normpath(args.output)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())